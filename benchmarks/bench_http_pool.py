@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compares sending requests with urllib.request.urlopen() and with the pooled persistent connections.
+Run from the repository root:
+$ python -m benchmarks.bench_http_pool
+"""
+
+import argparse
+import time
+from urllib import request
+
+from benchmarks.collector import StubCollector
+from src.utils.http_pool import ConnectionPool, default_headers
+
+
+def bench_urlopen(url: str, count: int):
+    for _ in range(count):
+        request.urlopen(request.Request(url, data=b'payload', headers=default_headers), timeout=3.0)  # nosec
+
+
+def bench_pool(url: str, count: int):
+    pool = ConnectionPool()
+    for _ in range(count):
+        pool.request(url, b'payload', default_headers, 3.0)
+    pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=1000, help='Number of requests to send.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latency of the collector in seconds.')
+    args = parser.parse_args()
+
+    with StubCollector(args.latency) as collector:
+        for name, func in [('urlopen', bench_urlopen), ('pool', bench_pool)]:
+            collector.reset()
+            start_time = time.perf_counter()
+            func(collector.url + '/collect', args.requests)
+            elapsed = time.perf_counter() - start_time
+            print('{:8} {:8.1f} us/request, {} connections'.format(name, elapsed / args.requests * 1e6,
+                                                                   collector.connections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the time of importing the telemetry package with "python -X importtime" in fresh interpreters and checks
+that the modules which are needed only to send the data are not imported.
+Run from the repository root:
+$ python -m benchmarks.bench_import
+"""
+
+import argparse
+import statistics
+import subprocess  # nosec
+import sys
+
+# the modules which should be imported only when the telemetry is initialized or the data is sent
+deferred_modules = ['backend.backend_ga', 'backend.backend_ga4', 'utils.sender', 'utils.http_pool',
+                    'utils.sender_process', 'utils.stats_processor', 'concurrent.futures', 'http.client',
+                    'urllib.request', 'multiprocessing', 'json', 'uuid']
+
+
+def measure_import(package: str):
+    """
+    Imports the package in the new interpreter.
+    :return: the tuple of the cumulative import time of the package in microseconds and the dictionary mapping the
+    imported modules to their cumulative import times
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(package)],  # nosec
+                            capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules.get(package, 0), modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--package', default='src', help='Name of the telemetry package to import.')
+    parser.add_argument('--runs', type=int, default=20, help='Number of interpreters to start.')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Fail if the median import time exceeds this value in milliseconds.')
+    args = parser.parse_args()
+
+    times = []
+    modules = {}
+    for _ in range(args.runs):
+        import_time, modules = measure_import(args.package)
+        times.append(import_time)
+    median = statistics.median(times) / 1000
+    print('import {}: median {:.2f} ms, min {:.2f} ms, {} modules'.format(args.package, median, min(times) / 1000,
+                                                                       len(modules)))
+    for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        print('{:10.2f} ms  {}'.format(cumulative / 1000, name))
+
+    failed = False
+    imported = [name for name in deferred_modules
+                if name in modules or '{}.{}'.format(args.package, name) in modules]
+    if imported:
+        print('Modules imported eagerly: {}'.format(', '.join(imported)))
+        failed = True
+    if args.max_ms is not None and median > args.max_ms:
+        print('Median import time {:.2f} ms exceeds {:.2f} ms'.format(median, args.max_ms))
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
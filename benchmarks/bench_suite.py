@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the hot paths of the telemetry against the local stub collector:
+- import time of the package
+- initialization latency with cold and warm state files
+- send_event() latency seen by the caller
+- throughput of TelemetrySender
+- memory per queued message of GA4 and GA backends
+- force_shutdown() latency when the collector hangs
+
+The results are printed and stored as JSON. If the baseline is given, the results are compared with it and the
+script fails if any metric regressed by more than the tolerance.
+Run from the repository root:
+$ python -m benchmarks.bench_suite --output results.json
+$ python -m benchmarks.bench_suite --baseline results.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess  # nosec
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from benchmarks.bench_import import measure_import
+from benchmarks.collector import StubCollector
+
+# the metrics which are better when they are higher, the other metrics are better when they are lower
+higher_is_better = {'sender_throughput_msgs_per_s'}
+
+init_script = """
+import time
+start = time.perf_counter()
+from {package} import Telemetry
+imported = time.perf_counter()
+tm = Telemetry('bench', '1.0', 'G-BENCH', backend='ga4', enable_opt_in_dialog=False)
+initialized = time.perf_counter()
+tm.force_shutdown(0)
+print(initialized - imported)
+"""
+
+
+def make_home(directory: str):
+    """
+    Creates the home directory with the consent file accepting the telemetry.
+    """
+    os.makedirs(os.path.join(directory, 'intel'), exist_ok=True)
+    with open(os.path.join(directory, 'intel', 'openvino_telemetry'), 'w') as file:
+        file.write('1')
+
+
+def home_env(directory: str):
+    env = dict(os.environ)
+    env['HOME'] = directory
+    env['LOCALAPPDATA'] = directory
+    return env
+
+
+def percentile(values: list, ratio: float):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def bench_import(package: str, runs: int):
+    return {'import_ms': statistics.median(measure_import(package)[0] for _ in range(runs)) / 1000}
+
+
+def bench_init(package: str, runs: int):
+    """
+    Runs the initialization in new interpreters with the state files created from scratch and with the existing ones.
+    """
+    cold, warm = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as home:
+            make_home(home)
+            for results in (cold, warm):
+                output = subprocess.run([sys.executable, '-c', init_script.format(package=package)],  # nosec
+                                        env=home_env(home), capture_output=True, text=True, check=True).stdout
+                results.append(float(output.split()[-1]) * 1000)
+    return {'init_cold_ms': statistics.median(cold), 'init_warm_ms': statistics.median(warm)}
+
+
+def bench_send_event(telemetry, count: int):
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        telemetry.send_event('bench', 'send_event', str(i % 10))
+        latencies.append((time.perf_counter() - start) * 1e6)
+    telemetry.flush(30)
+    return {'send_event_p50_us': percentile(latencies, 0.5), 'send_event_p99_us': percentile(latencies, 0.99)}
+
+
+def bench_throughput(package: str, backend, count: int):
+    TelemetrySender = importlib.import_module(package + '.utils.sender').TelemetrySender
+
+    sender = TelemetrySender(max_queue_size=count)
+    start = time.perf_counter()
+    for i in range(count):
+        sender.send(backend, backend.build_event_message('bench', 'throughput', str(i)))
+    sender.flush(600)
+    elapsed = time.perf_counter() - start
+    sender.force_shutdown(0)
+    return {'sender_throughput_msgs_per_s': sender.delivered / elapsed}
+
+
+class BlockedBackend:
+    id = 'blocked'
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def send(self, message):
+        self.event.wait()
+
+
+def bench_memory(package: str, backend, count: int, metric: str = 'memory_per_message_bytes'):
+    TelemetrySender = importlib.import_module(package + '.utils.sender').TelemetrySender
+
+    blocked_backend = BlockedBackend()
+    sender = TelemetrySender(max_workers=1, max_queue_size=count + 1)
+    try:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            sender.send(blocked_backend, backend.build_event_message('bench', 'memory', str(i)))
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        blocked_backend.event.set()
+    sender.force_shutdown(0)
+    return {metric: (after - before) / count}
+
+
+def bench_shutdown(telemetry, count: int, timeout: float):
+    for i in range(count):
+        telemetry.send_event('bench', 'shutdown', str(i))
+    start = time.perf_counter()
+    telemetry.force_shutdown(timeout)
+    return {'force_shutdown_ms': (time.perf_counter() - start) * 1000}
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """
+    Prints the results together with the baseline.
+    :return: the list of the regressed metrics
+    """
+    regressed = []
+    for name, value in results.items():
+        if name not in baseline:
+            print('{:30} {:14.2f}'.format(name, value))
+            continue
+        base = baseline[name]
+        change = (value - base) / base if base else 0.0
+        worse = -change if name in higher_is_better else change
+        mark = ''
+        if worse > tolerance:
+            regressed.append(name)
+            mark = 'REGRESSION'
+        print('{:30} {:14.2f} {:14.2f} {:+8.1%} {}'.format(name, value, base, change, mark))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--package', default='src', help='Name of the telemetry package to import.')
+    parser.add_argument('--runs', type=int, default=5, help='Number of interpreters started per measurement.')
+    parser.add_argument('--events', type=int, default=2000, help='Number of events sent per measurement.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Latency of the collector in seconds.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failed by the collector.')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='Fraction of requests the collector hangs on.')
+    parser.add_argument('--shutdown-timeout', type=float, default=0.5, help='Timeout passed to force_shutdown().')
+    parser.add_argument('--output', help='Path to the JSON file to store the results to.')
+    parser.add_argument('--baseline', help='Path to the JSON file with the results to compare with.')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Relative regression of any metric which fails the comparison.')
+    args = parser.parse_args()
+
+    results = {}
+    results.update(bench_import(args.package, args.runs))
+    results.update(bench_init(args.package, args.runs))
+
+    with tempfile.TemporaryDirectory() as home:
+        make_home(home)
+        os.environ.update(home_env(home))
+        # the in-process measurements use the same package as the measurements in the new interpreters
+        Telemetry = importlib.import_module(args.package).Telemetry
+        BackendRegistry = importlib.import_module(args.package + '.backend.backend').BackendRegistry
+
+        with StubCollector(args.latency, args.error_rate, args.hang_rate, hang_time=5.0) as collector:
+            # the endpoint is passed to the backend like by the users, so the query string is composed as usual
+            telemetry = Telemetry('bench', '1.0', 'G-BENCH', backend='ga4', enable_opt_in_dialog=False,
+                                  backend_url=collector.url + '/mp/collect')
+            results.update(bench_send_event(telemetry, args.events))
+            results.update(bench_throughput(args.package, telemetry.backend, args.events))
+            results.update(bench_memory(args.package, telemetry.backend, args.events))
+            ga_backend = BackendRegistry.get_backend('ga')('UA-BENCH', 'bench', '1.0')
+            results.update(bench_memory(args.package, ga_backend, args.events, 'memory_per_message_bytes_ga'))
+        with StubCollector(hang_rate=1.0, hang_time=5.0) as collector:
+            # the telemetry is the singleton, so it is initialized again with the endpoint of the hanging collector
+            telemetry.init('bench', '1.0', 'G-BENCH', backend='ga4', enable_opt_in_dialog=False,
+                           backend_url=collector.url + '/mp/collect')
+            results.update(bench_shutdown(telemetry, 20, args.shutdown_timeout))
+
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressed = compare(results, json.load(file)['results'], args.tolerance)
+    else:
+        compare(results, {}, args.tolerance)
+
+    if args.output:
+        config = {name: value for name, value in vars(args).items() if name not in ('output', 'baseline')}
+        with open(args.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'config': config,
+                       'results': results}, file, indent=4)
+    if regressed:
+        print('Regressed metrics: {}'.format(', '.join(regressed)))
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
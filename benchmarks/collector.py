@@ -0,0 +1,93 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Local HTTP stand-in for the telemetry collectors, used by the benchmarks.
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.received_bytes += len(body)
+            roll = self.server.random.random()
+        if roll < self.server.hang_rate:
+            # the response is never sent in time, the client should give up by the timeout
+            time.sleep(self.server.hang_time)
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if roll < self.server.hang_rate + self.server.error_rate:
+            self.send_response(500)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubCollector:
+    """
+    HTTP server accepting POST requests on any path in a background thread.
+
+    :param latency: the time in seconds the server waits before the response.
+    :param error_rate: the fraction of requests answered with the 500 status.
+    :param hang_rate: the fraction of requests which are not answered for hang_time seconds.
+    :param hang_time: the time in seconds the server holds the hanging requests.
+    :param seed: the seed choosing the failing requests.
+    """
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, hang_rate: float = 0.0,
+                 hang_time: float = 60.0, seed: int = 0):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), CollectorHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.latency = latency
+        self.server.error_rate = error_rate
+        self.server.hang_rate = hang_rate
+        self.server.hang_time = hang_time
+        self.server.random = random.Random(seed)
+        self.reset()
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def reset(self):
+        with self.server.lock:
+            self.server.connections = 0
+            self.server.requests = 0
+            self.server.received_bytes = 0
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
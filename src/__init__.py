@@ -3,8 +3,10 @@
 
 
 __all__ = [
-    'Telemetry'
+    'Telemetry',
+    'QueuePolicy'
 ]
 from .main import Telemetry
+from .utils.queue_policy import QueuePolicy
 
 __version__ = Telemetry.get_version()
@@ -1,5 +1,15 @@
 # Copyright (C) 2018-2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from .backend_ga import *
-from .backend_ga4 import *
+# The backend modules are imported on the first use, see BackendRegistry.get_backend()
+_backend_modules = {
+    'GABackend': '.backend_ga',
+    'GA4Backend': '.backend_ga4',
+}
+
+
+def __getattr__(name):
+    if name in _backend_modules:
+        import importlib
+        return getattr(importlib.import_module(_backend_modules[name], __name__), name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
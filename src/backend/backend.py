@@ -2,27 +2,93 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import abc
+import importlib
+import logging as log
+import os
+from urllib import parse
 
-from ..utils.message import Message
+from ..utils.message import Message, MessageType
 
 
 class BackendRegistry:
     """
-    The class that stores information about all registered telemetry backends
+    The class that stores information about all registered telemetry backends. The built-in backends are registered
+    by name and their modules are imported on the first request of the backend.
     """
     r = {}
+    lazy_backends = {
+        'ga': '.backend_ga',
+        'ga4': '.backend_ga4',
+        'file': '.backend_file',
+        'otlp': '.backend_otlp',
+    }
 
     @classmethod
     def register_backend(cls, id: str, backend):
         cls.r[id] = backend
 
+    @classmethod
+    def register_lazy_backend(cls, id: str, module_name: str):
+        """
+        Registers the backend which is defined in the module imported on the first request of the backend.
+        :param id: the id of the backend
+        :param module_name: the name of the module defining the backend, relative names are resolved against
+        the backend package
+        :return: None
+        """
+        cls.lazy_backends[id] = module_name
+
+    @classmethod
+    def backend_ids(cls):
+        """
+        Returns the ids of the registered backends including the ones whose modules are not imported yet.
+        """
+        return sorted(set(cls.r) | set(cls.lazy_backends))
+
     @classmethod
     def get_backend(cls, id: str):
+        if id not in cls.r and id in cls.lazy_backends:
+            # the backend class is registered by the metaclass when the module is imported
+            importlib.import_module(cls.lazy_backends[id], __package__)
         if id not in cls.r:
             raise RuntimeError('The backend with id "{}" is not registered'.format(id))
         return cls.r.get(id)
 
 
+def is_valid_url(url: str):
+    """
+    Checks if the url can be used as the endpoint of the backend.
+    :param url: the url to check
+    :return: True if the url is the absolute HTTP or HTTPS url, otherwise False
+    """
+    try:
+        parsed_url = parse.urlsplit(url)
+        return parsed_url.scheme.lower() in ('http', 'https') and bool(parsed_url.hostname)
+    except Exception as err:
+        return False
+
+
+def resolve_backend_url(default_url: str, backend_url: str = None, env_var: str = None):
+    """
+    Chooses the endpoint of the backend. The url passed explicitly takes precedence over the url set by the
+    environment variable, the default url is used if neither of them is set or valid.
+    :param default_url: the default endpoint of the backend
+    :param backend_url: the url passed to the backend explicitly
+    :param env_var: the name of the environment variable overriding the endpoint
+    :return: the url to send the messages to
+    """
+    candidates = [(backend_url, 'backend_url argument')]
+    if env_var is not None:
+        candidates.append((os.environ.get(env_var), '{} environment variable'.format(env_var)))
+    for url, source in candidates:
+        if not url:
+            continue
+        if is_valid_url(url):
+            return url
+        log.warning('Incorrect backend URL "{}" is set by the {}, it is ignored.'.format(url, source))
+    return default_url
+
+
 class TelemetryBackendMetaClass(abc.ABCMeta):
     def __init__(cls, clsname, bases, methods):
         super().__init__(clsname, bases, methods)
@@ -32,6 +98,8 @@ class TelemetryBackendMetaClass(abc.ABCMeta):
 
 class TelemetryBackend(metaclass=TelemetryBackendMetaClass):
     id = None
+    # the number of messages passed to send_batch() at once unless the batch size is set explicitly
+    default_batch_size = 1
 
     @abc.abstractmethod
     def __init__(self, tid: str, app_name: str, app_version: str):
@@ -47,9 +115,81 @@ class TelemetryBackend(metaclass=TelemetryBackendMetaClass):
         """
         Sends the message to the backend.
         :param message: The Message object to send
+        :return: False if the message is not delivered
+        """
+
+    def send_batch(self, messages: list):
+        """
+        Sends several messages to the backend. Backends which are able to pack several messages into one request
+        should override this method, by default the messages are sent one by one.
+        :param messages: The list of Message objects to send
+        :return: the list of messages which are not delivered
+        """
+        return [message for message in messages if self.send(message) is False]
+
+    def message_format(self):
+        """
+        Returns the hashable description of the format of the messages built by the backend. The backends with equal
+        descriptions accept the messages built by each other, so the message sent to several backends is built once.
+        By default, the messages are not shared.
+        """
+        return None
+
+    def flush(self):
+        """
+        Writes out the messages buffered by the backend. Backends which buffer the messages should override this
+        method, by default there is nothing to write.
+        :return: False if the buffered messages are not written
+        """
+        return True
+
+    def buffered_count(self):
+        """
+        Returns the number of messages accepted by the backend, which are buffered and not written out yet.
+        """
+        return 0
+
+    def remove_stored_data(self):
+        """
+        Removes the messages which the backend stores locally, it is called on opt-out together with
+        remove_cid_file(). Backends which store the messages should override this method, by default there is
+        nothing to remove.
         :return: None
         """
 
+    async def send_async(self, message: Message, pool):
+        """
+        Sends the message to the backend from the asyncio event loop. Backends which are able to send messages with
+        the non-blocking AsyncConnectionPool should override this method, by default the message is sent by send()
+        in the default executor of the event loop.
+        :param message: The Message object to send
+        :param pool: AsyncConnectionPool object to send requests with
+        :return: False if the message is not delivered
+        """
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, self.send, message)
+
+    def serialize_message(self, message: Message):
+        """
+        Converts the message to the JSON serializable object to store it on the disk.
+        :param message: The Message object to convert
+        :return: JSON serializable object
+        """
+        if isinstance(message, Message):
+            return {'type': message.type.name, 'attrs': message.attrs}
+        return message
+
+    def deserialize_message(self, data, timestamp: float = None):
+        """
+        Restores the message stored on the disk.
+        :param data: the object returned by serialize_message()
+        :param timestamp: the time the message was originally sent at
+        :return: the Message object
+        """
+        if isinstance(data, dict) and 'type' in data and 'attrs' in data:
+            return Message(MessageType[data['type']], data['attrs'])
+        return data
+
     @abc.abstractmethod
     def build_event_message(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
                             **kwargs):
@@ -93,6 +233,14 @@ class TelemetryBackend(metaclass=TelemetryBackendMetaClass):
         Should generate new Client ID file.
         """
 
+    def load_cid(self, state):
+        """
+        Initializes the client ID using the telemetry state. Backends keeping the client ID in the state should
+        override this method, by default the client ID file is generated.
+        :param state: the TelemetryState object
+        """
+        self.generate_new_cid_file()
+
     @abc.abstractmethod
     def cid_file_initialized(self):
         """
@@ -0,0 +1,306 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+import weakref
+from urllib import parse
+
+from .backend import TelemetryBackend
+from ..utils.cid import get_or_generate_cid, remove_cid_file
+from ..utils.environment import get_environment
+from ..utils.file_lock import FileLock
+from ..utils.opt_in_checker import OptInChecker
+
+
+class FileBackend(TelemetryBackend):
+    """
+    The backend writing the messages as JSON lines to the local files, so they can be collected on the machines
+    without the network access and shipped later. The lines are buffered in memory and appended to the file when the
+    buffer is full, by the timer flush_interval seconds after the first line is buffered, on Telemetry.flush() and at
+    exit. If the lines can not be written, the lines buffered before are kept to be written next time and the
+    messages passed to the current send_batch() call are returned as undelivered, so the buffer does not grow. The
+    file is renamed to <name>.1.jsonl when it exceeds max_file_size, the previous files are shifted and at most
+    max_files files are kept. The files and the buffered lines are removed on opt-out.
+
+    :param backend_url: the directory to write the files to, given as the path or the file:// url. By default, the
+    directory is set by the OPENVINO_TELEMETRY_FILE_DIR environment variable or is created next to the consent file.
+    """
+    id = 'file'
+    cid_filename = 'openvino_file_cid'
+    directory_env_var = 'OPENVINO_TELEMETRY_FILE_DIR'
+    default_subdirectory = 'openvino_telemetry_events'
+    file_prefix = 'openvino_telemetry_events'
+    buffer_size = 64 * 1024
+    flush_interval = 5.0
+    max_file_size = 10 * 1024 * 1024
+    max_files = 5
+
+    def __init__(self, tid: str = None, app_name: str = None, app_version: str = None, backend_url: str = None):
+        super(FileBackend, self).__init__(tid, app_name, app_version)
+        self.tid = tid
+        self.app_name = app_name
+        self.app_version = app_version
+        self.cid = None
+        self.session_id = None
+        self.stats = {}
+        self.directory = self._resolve_directory(backend_url)
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._buffer_since = None
+        self._timer = None
+        self._lock = threading.Lock()
+        _file_backends.add(self)
+
+    @staticmethod
+    def _resolve_directory(backend_url: str = None):
+        if backend_url is not None and backend_url.lower().startswith('file:'):
+            return parse.unquote(parse.urlsplit(backend_url).path)
+        return backend_url or os.environ.get(FileBackend.directory_env_var) or None
+
+    def events_directory(self):
+        """
+        Returns the directory the files are written to or None if it is unknown.
+        """
+        if self.directory is not None:
+            return self.directory
+        base_dir = OptInChecker.consent_file_base_dir()
+        subdirectory = OptInChecker.consent_file_subdirectory()
+        if base_dir is None or subdirectory is None:
+            return None
+        return os.path.join(base_dir, subdirectory, self.default_subdirectory)
+
+    def events_file(self, index: int = 0):
+        """
+        Returns the path of the current file if index is 0, otherwise the path of the rotated file with this index.
+        """
+        name = self.file_prefix + ('.{}.jsonl'.format(index) if index else '.jsonl')
+        return os.path.join(self.events_directory(), name)
+
+    def send(self, message: dict):
+        if message is None:
+            return True
+        return not self.send_batch([message])
+
+    def send_batch(self, messages: list):
+        lines = []
+        for message in messages:
+            if message is None:
+                continue
+            try:
+                lines.append(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+            except Exception as err:
+                pass  # nosec
+        if not lines:
+            return []
+        with self._lock:
+            buffered, buffered_count = self._buffer, len(self._buffer)
+            buffered_bytes, buffered_since = self._buffer_bytes, self._buffer_since
+            if self._buffer_since is None:
+                self._buffer_since = time.monotonic()
+            self._buffer.extend(lines)
+            self._buffer_bytes += sum(len(line) for line in lines)
+            if self._buffer_bytes < self.buffer_size and \
+                    time.monotonic() - self._buffer_since < self.flush_interval:
+                self._schedule_flush()
+                return []
+            if self._write(self._take_buffer()):
+                return []
+            # the lines accepted before are written next time, the new messages are reported as undelivered
+            del buffered[buffered_count:]
+            self._buffer, self._buffer_bytes, self._buffer_since = buffered, buffered_bytes, buffered_since
+            self._schedule_flush()
+        return [message for message in messages if message is not None]
+
+    def flush(self):
+        with self._lock:
+            if not self._buffer:
+                return True
+            buffered, buffered_bytes, buffered_since = self._buffer, self._buffer_bytes, self._buffer_since
+            if self._write(self._take_buffer()):
+                return True
+            self._buffer, self._buffer_bytes, self._buffer_since = buffered, buffered_bytes, buffered_since
+            self._schedule_flush()
+        return False
+
+    def _schedule_flush(self):
+        """
+        Starts the timer writing the buffered lines after flush_interval, so the lines of the process which does not
+        send anything else are not kept until exit. Should be called under the lock.
+        """
+        if self._buffer and self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def buffered_count(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def _take_buffer(self):
+        data = b''.join(self._buffer)
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._buffer_since = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return data
+
+    def _write(self, data: bytes):
+        """
+        Appends the data to the current file, the file is rotated if the data does not fit into it.
+        Should be called under the lock.
+        :return: True if the data is written, otherwise False
+        """
+        directory = self.events_directory()
+        if directory is None:
+            return False
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # the other processes may write to the same files
+            with FileLock(os.path.join(directory, self.file_prefix + '.lock')) as locked:
+                if not locked:
+                    return False
+                path = self.events_file()
+                if os.path.exists(path) and 0 < os.path.getsize(path) and \
+                        os.path.getsize(path) + len(data) > self.max_file_size:
+                    self._rotate()
+                with open(path, 'ab') as file:
+                    file.write(data)
+        except Exception as err:
+            return False
+        return True
+
+    def _rotate(self):
+        oldest = self.events_file(self.max_files - 1)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+        for index in range(self.max_files - 2, -1, -1):
+            path = self.events_file(index)
+            if os.path.exists(path):
+                os.replace(path, self.events_file(index + 1))
+
+    def remove_stored_data(self):
+        """
+        Drops the lines buffered by the file backends of this process writing to the same directory and removes the
+        written files. The directory is removed if nothing else is left in it.
+        """
+        directory = self.events_directory()
+        if directory is None:
+            return
+        for backend in list(_file_backends):
+            if backend.events_directory() == directory:
+                with backend._lock:
+                    backend._take_buffer()
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            if name.startswith(self.file_prefix):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except Exception as err:
+                    pass  # nosec
+        try:
+            os.rmdir(directory)
+        except Exception as err:
+            pass  # nosec
+
+    def _reset_after_fork(self):
+        # the lines buffered by the parent process are written by the parent process, the timer thread is not copied
+        self._timer = None
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._buffer_since = None
+
+    def build_event_message(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
+                            app_name=None, app_version=None, **kwargs):
+        if self.session_id is None:
+            self.generate_new_session_id()
+        return {
+            "timestamp": time.time(),
+            "client_id": self.cid if self.cid is not None else "0",
+            "session_id": self.session_id,
+            "tid": self.tid,
+            "app_name": app_name if app_name is not None else self.app_name,
+            "app_version": app_version if app_version is not None else self.app_version,
+            "os": get_environment().os,
+            "category": event_category,
+            "action": event_action,
+            "label": event_label,
+            "value": event_value,
+            **self.stats
+        }
+
+    def build_session_start_message(self, category: str, **kwargs):
+        self.generate_new_session_id()
+        return self.build_event_message(category, "session", "start", 1)
+
+    def build_session_end_message(self, category: str, **kwargs):
+        return self.build_event_message(category, "session", "end", 1)
+
+    def build_error_message(self, category: str, error_msg: str, **kwargs):
+        return self.build_event_message(category, "error_", error_msg, 1)
+
+    def build_stack_trace_message(self, category: str, error_msg: str, **kwargs):
+        return self.build_event_message(category, "stack_trace", error_msg, 1)
+
+    def generate_new_cid_file(self, state=None):
+        self.cid = get_or_generate_cid(self.cid_filename, lambda: str(uuid.uuid4()), is_valid_cid, None, state)
+
+    def load_cid(self, state):
+        self.generate_new_cid_file(state)
+
+    def cid_file_initialized(self):
+        return self.cid is not None
+
+    def generate_new_session_id(self):
+        self.session_id = str(uuid.uuid4())
+
+    def remove_cid_file(self):
+        self.cid = None
+        remove_cid_file(self.cid_filename)
+
+    def message_format(self):
+        return (self.id, self.tid, self.app_name, self.app_version)
+
+    def set_stats(self, data: dict):
+        self.stats = data
+
+
+def is_valid_cid(cid: str):
+    try:
+        uuid.UUID(cid, version=4)
+    except ValueError:
+        return False
+    return True
+
+
+# the file backends existing in the process, their buffers are written at exit and dropped in the child process
+# after fork
+_file_backends = weakref.WeakSet()
+
+
+def _flush_file_backends():
+    for backend in list(_file_backends):
+        backend.flush()
+
+
+def _reset_file_backends_after_fork():
+    for backend in list(_file_backends):
+        backend._reset_after_fork()
+
+
+atexit.register(_flush_file_backends)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_file_backends_after_fork)
@@ -0,0 +1,132 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+
+import json
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock
+
+from .backend import BackendRegistry
+from ..utils.opt_in_checker import OptInChecker
+
+
+def read_lines(file_name: str):
+    with open(file_name, 'r') as file:
+        return [json.loads(line) for line in file]
+
+
+class FileBackendTest(unittest.TestCase):
+    def test_buffered_write(self):
+        """
+        Checks that the messages are kept in memory until the buffer is flushed.
+        """
+        with TemporaryDirectory() as directory:
+            backend = BackendRegistry.get_backend('file')("test_backend", "app", "1.0", backend_url=directory)
+            for i in range(10):
+                self.assertTrue(backend.send(backend.build_event_message("cat", "action", str(i), i)))
+            self.assertFalse(os.path.exists(backend.events_file()))
+
+            self.assertTrue(backend.flush())
+            lines = read_lines(backend.events_file())
+            self.assertEqual([line["label"] for line in lines], [str(i) for i in range(10)])
+            self.assertEqual(lines[0]["app_name"], "app")
+            self.assertEqual(lines[0]["session_id"], lines[9]["session_id"])
+
+    def test_buffer_is_written_by_timer(self):
+        """
+        Checks that the buffered lines are written after flush_interval without other messages or flush().
+        """
+        with TemporaryDirectory() as directory:
+            backend = BackendRegistry.get_backend('file')("test_backend", "app", "1.0", backend_url=directory)
+            backend.flush_interval = 0.1
+            self.assertEqual(backend.send_batch([backend.build_event_message("cat", "action", "label", 1)]), [])
+            start_time = time.time()
+            while backend.buffered_count() and time.time() - start_time < 5:
+                time.sleep(0.01)
+            self.assertEqual([line["label"] for line in read_lines(backend.events_file())], ["label"])
+
+    def test_full_buffer_is_written(self):
+        """
+        Checks that the buffer is written when it exceeds buffer_size.
+        """
+        with TemporaryDirectory() as directory:
+            backend = BackendRegistry.get_backend('file')("test_backend", "app", "1.0",
+                                                          backend_url="file://" + directory)
+            backend.buffer_size = 1000
+            messages = [backend.build_event_message("cat", "action", str(i), i) for i in range(20)]
+            self.assertEqual(backend.send_batch(messages), [])
+            self.assertEqual(len(read_lines(backend.events_file())), 20)
+
+    def test_failed_write_keeps_buffer(self):
+        """
+        Checks that the buffered lines are kept if the file can not be written and only the messages of the current
+        call are reported as undelivered.
+        """
+        with TemporaryDirectory() as directory:
+            blocker = os.path.join(directory, "blocker")
+            open(blocker, 'w').close()
+            backend = BackendRegistry.get_backend('file')("test_backend", "app", "1.0",
+                                                          backend_url=os.path.join(blocker, "events"))
+            backend.buffer_size = 2000
+            buffered = [backend.build_event_message("cat", "action", str(i), i) for i in range(5)]
+            self.assertEqual(backend.send_batch(buffered), [])
+            messages = [backend.build_event_message("cat", "action", str(i), i) for i in range(5, 30)]
+            self.assertEqual(backend.send_batch(messages), messages)
+            self.assertEqual(backend.buffered_count(), 5)
+            self.assertFalse(backend.flush())
+            self.assertEqual(backend.buffered_count(), 5)
+
+            backend.directory = directory
+            self.assertTrue(backend.flush())
+            self.assertEqual([line["label"] for line in read_lines(backend.events_file())], [str(i) for i in range(5)])
+            self.assertEqual(backend.buffered_count(), 0)
+
+    def test_rotation(self):
+        """
+        Checks that the files are rotated by size and at most max_files files are kept.
+        """
+        with TemporaryDirectory() as directory:
+            backend = BackendRegistry.get_backend('file')("test_backend", "app", "1.0", backend_url=directory)
+            backend.buffer_size = 0
+            backend.max_file_size = 1000
+            backend.max_files = 3
+            for i in range(100):
+                backend.send(backend.build_event_message("cat", "action", str(i), i))
+
+            files = sorted(name for name in os.listdir(directory) if name.endswith('.jsonl'))
+            self.assertEqual(files, [backend.file_prefix + suffix for suffix in ('.1.jsonl', '.2.jsonl', '.jsonl')])
+            for index in range(3):
+                self.assertLessEqual(os.path.getsize(backend.events_file(index)), 1000)
+            # the newest messages are in the current file
+            self.assertEqual(read_lines(backend.events_file())[-1]["label"], "99")
+            older = read_lines(backend.events_file(2))
+            newer = read_lines(backend.events_file(1))
+            self.assertEqual(int(older[-1]["label"]) + 1, int(newer[0]["label"]))
+
+    def test_cid(self):
+        """
+        Checks generation and removing of the client ID file.
+        """
+        with TemporaryDirectory() as directory:
+            OptInChecker.consent_file_base_dir = MagicMock(return_value=directory)
+            OptInChecker.consent_file_subdirectory = MagicMock(return_value="subdir")
+            backend = BackendRegistry.get_backend('file')("test_backend", "app", "1.0")
+            cid_path = os.path.join(directory, "subdir", backend.cid_filename)
+            self.assertFalse(backend.cid_file_initialized())
+
+            backend.generate_new_cid_file()
+            self.assertTrue(os.path.exists(cid_path))
+            self.assertEqual(backend.build_event_message("cat", "action", "label")["client_id"], backend.cid)
+
+            backend.remove_cid_file()
+            self.assertFalse(os.path.exists(cid_path))
+            self.assertFalse(backend.cid_file_initialized())
+
+            # the default directory is next to the consent file
+            backend.send(backend.build_event_message("cat", "action", "label"))
+            backend.flush()
+            self.assertTrue(os.path.exists(os.path.join(directory, "subdir", backend.default_subdirectory,
+                                                        backend.file_prefix + ".jsonl")))
@@ -2,22 +2,28 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging as log
+import time
 import uuid
-from urllib import request, parse
+from urllib import parse
 
-from .backend import TelemetryBackend
+from .backend import TelemetryBackend, resolve_backend_url
 from ..utils.cid import get_or_generate_cid, remove_cid_file
-from ..utils.message import Message, MessageType
+from ..utils.message import Message, MessageType, freeze
+from ..utils.http_pool import send_request
 
 
 class GABackend(TelemetryBackend):
     backend_url = 'https://www.google-analytics.com/collect'
+    # the environment variable overriding the endpoint, for example, with the self-hosted collector
+    backend_url_env_var = 'OPENVINO_TELEMETRY_GA_URL'
     id = 'ga'
     cid_filename = 'openvino_ga_cid'
+    timeout = 3.0
 
-    def __init__(self, tid: str = None, app_name: str = None, app_version: str = None):
+    def __init__(self, tid: str = None, app_name: str = None, app_version: str = None, backend_url: str = None):
         super(GABackend, self).__init__(tid, app_name, app_version)
         self.tid = tid
+        self.backend_url = resolve_backend_url(GABackend.backend_url, backend_url, self.backend_url_env_var)
         self.cid = None
         self.app_name = app_name
         self.app_version = app_version
@@ -28,93 +34,124 @@ class GABackend(TelemetryBackend):
             'av': self.app_version,
             'ua': 'Opera/9.80 (Windows NT 6.0) Presto/2.12.388 Version/12.14'  # dummy identifier of the browser
         }
+        self._defaults = None
 
     def send(self, message: Message):
+        attrs = message.attrs
         if self.cid is None:
-            message.attrs['cid'] = str(uuid.uuid4())
+            attrs['cid'] = str(uuid.uuid4())
         try:
-            data = parse.urlencode(message.attrs).encode()
+            data = parse.urlencode(attrs).encode()
 
-            if self.backend_url.lower().startswith('http'):
-                req = request.Request(self.backend_url, data=data)
-            else:
+            if not self.backend_url.lower().startswith('http'):
                 log.info("Incorrect backend URL.")
-                return
+                return False
 
-            request.urlopen(req) #nosec
+            return send_request(self.backend_url, data, self.timeout)
         except Exception as err:
-            pass  # nosec
+            return False
+
+    async def send_async(self, message: Message, pool):
+        from ..utils.async_http_pool import send_request_async
+
+        attrs = message.attrs
+        if self.cid is None:
+            attrs['cid'] = str(uuid.uuid4())
+        try:
+            data = parse.urlencode(attrs).encode()
+
+            if not self.backend_url.lower().startswith('http'):
+                log.info("Incorrect backend URL.")
+                return False
+
+            return await send_request_async(pool, self.backend_url, data, self.timeout)
+        except Exception as err:
+            return False
+
+    def deserialize_message(self, data, timestamp: float = None):
+        message = super(GABackend, self).deserialize_message(data, timestamp)
+        if timestamp is not None:
+            # queue time, the offset in milliseconds between the moment the hit occurred and the moment it is sent
+            message = message.replace(qt=max(0, int((time.time() - timestamp) * 1000)))
+        return message
 
     def build_event_message(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
                             **kwargs):
-        data = self.default_message_attrs.copy()
-        data.update({
+        return Message(MessageType.EVENT, {
             't': 'event',
             'ec': event_category,
             'ea': event_action,
             'el': event_label,
             'ev': event_value,
-        })
-        return Message(MessageType.EVENT, data)
+        }, self._get_defaults())
 
     def build_session_start_message(self, category: str, **kwargs):
-        data = self.default_message_attrs.copy()
-        data.update({
+        return Message(MessageType.SESSION_START, {
             'sc': 'start',
             't': 'event',
             'ec': category,
             'ea': 'session',
             'el': 'start',
             'ev': 1,
-        })
-        return Message(MessageType.SESSION_START, data)
+        }, self._get_defaults())
 
     def build_session_end_message(self, category: str, **kwargs):
-        data = self.default_message_attrs.copy()
-        data.update({
+        return Message(MessageType.SESSION_END, {
             'sc': 'end',
             't': 'event',
             'ec': category,
             'ea': 'session',
             'el': 'end',
             'ev': 1,
-        })
-        return Message(MessageType.SESSION_END, data)
+        }, self._get_defaults())
 
     def build_error_message(self, category: str, error_msg: str, **kwargs):
-        data = self.default_message_attrs.copy()
-        data.update({
+        return Message(MessageType.ERROR, {
             't': 'event',
             'ec': category,
             'ea': 'error',
             'el': error_msg,
             'ev': 1,
-        })
-        return Message(MessageType.ERROR, data)
+        }, self._get_defaults())
 
     def build_stack_trace_message(self, category: str, error_msg: str, **kwargs):
-        data = self.default_message_attrs.copy()
-        data.update({
+        return Message(MessageType.STACK_TRACE, {
             't': 'event',
             'ec': category,
             'ea': 'stack_trace',
             'el': error_msg,
             'ev': 1,
-        })
-        return Message(MessageType.STACK_TRACE, data)
+        }, self._get_defaults())
+
+    def _get_defaults(self):
+        """
+        Returns the frozen default attributes shared by the messages, they are frozen again after the client ID is
+        changed.
+        """
+        if self._defaults is None:
+            self._defaults = freeze(self.default_message_attrs)
+        return self._defaults
 
     def remove_cid_file(self):
         self.cid = None
         self.default_message_attrs['cid'] = None
+        self._defaults = None
         remove_cid_file(self.cid_filename)
 
-    def generate_new_cid_file(self):
-        self.cid = get_or_generate_cid(self.cid_filename, lambda: str(uuid.uuid4()), is_valid_cid)
+    def generate_new_cid_file(self, state=None):
+        self.cid = get_or_generate_cid(self.cid_filename, lambda: str(uuid.uuid4()), is_valid_cid, state=state)
         self.default_message_attrs['cid'] = self.cid
+        self._defaults = None
+
+    def load_cid(self, state):
+        self.generate_new_cid_file(state)
 
     def cid_file_initialized(self):
         return self.cid is not None
 
+    def message_format(self):
+        return (self.id, self.tid, self.app_name, self.app_version)
+
     def set_stats(self, data: dict):
         pass
 
@@ -2,95 +2,291 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import json
+from collections.abc import Mapping
+from json.encoder import encode_basestring_ascii
 import uuid
+from urllib import parse
 import logging as log
 
 from copy import copy
-from urllib import request
-import os
 
-from .backend import TelemetryBackend
+from .backend import TelemetryBackend, resolve_backend_url
 from ..utils.cid import get_or_generate_cid, remove_cid_file
+from ..utils.environment import get_environment
 from ..utils.params import telemetry_params
-from platform import system
+from ..utils.http_pool import send_request
+from ..utils.message import Message, MessageType, freeze
+from ..utils.sender_process import get_sender_process
 
 
-def _send_func(request_data):
-    try:
-        request.urlopen(request_data)  # nosec
-    except Exception as err:
-        pass  # nosec
+_encoder = json.JSONEncoder(separators=(',', ':'))
 
 
-def is_docker():
-    def file_has_text(text, filename):
-        try:
-            with open(filename, encoding='utf-8') as lines:
-                for line in lines:
-                    if text in line:
-                        return True
-            return False
-        except:
-            return False
+def _encode(value):
+    # the strings and the integers are the most common fields of the event, they are encoded without the encoder
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    if type(value) is int:
+        return int.__repr__(value)
+    return _encoder.encode(value)
+
+
+class PayloadTemplate:
+    """
+    The part of the GA4 payload which is the same for all events of the backend: the client ID and the event
+    parameters except for the category, the label and the count. The invariant part is serialized once, so encoding of
+    the event serializes only its own fields.
+
+    :param client_id: the client ID of the payload
+    :param params: the invariant event parameters
+    """
+    event_keys = ('event_category', 'event_label', 'event_count')
+
+    def __init__(self, client_id: str, params: dict):
+        self.client_id = client_id
+        # the parameters are shared by the messages built with the template
+        self.params = freeze(params)
+        self.prefix = '{"client_id":' + _encode(client_id) + ',"non_personalized_ads":false,"events":['
+        # the serialized parameters without the opening brace are appended to the event fields
+        self.params_suffix = ',' + _encode(params)[1:] if params else '}'
+
+    def encode(self, events: list):
+        """
+        Encodes the payload with the events.
+        :param events: the list of (name, category, label, count) tuples
+        :return: the encoded payload
+        """
+        encoded_events = ['{"name":' + _encode(name) + ',"params":{"event_category":' + _encode(category) +
+                          ',"event_label":' + _encode(label) + ',"event_count":' + _encode(count) +
+                          self.params_suffix + '}' for name, category, label, count in events]
+        return (self.prefix + ','.join(encoded_events) + ']}').encode()
+
+
+class GA4Message(Message, Mapping):
+    """
+    The event built by GA4Backend with the payload template. The message keeps only the fields of the event and
+    references the template with the client ID and the parameters shared by all events, so the queued messages do not
+    duplicate them. The message is the read-only mapping equal to the GA4 payload of the event.
+    """
+    __slots__ = ('template', 'name')
+
+    def __init__(self, template: PayloadTemplate, name: str, category: str, label: str, count: int):
+        object.__setattr__(self, 'type', MessageType.EVENT)
+        object.__setattr__(self, 'defaults', template.params)
+        object.__setattr__(self, 'deltas', {"event_category": category, "event_label": label, "event_count": count})
+        object.__setattr__(self, 'template', template)
+        object.__setattr__(self, 'name', name)
 
-    return os.path.exists('/.dockerenv') or \
-           file_has_text('docker', '/proc/self/cgroup') or \
-           file_has_text('docker', '/proc/self/mountinfo')
+    @property
+    def events_fields(self):
+        deltas = self.deltas
+        return [(self.name, deltas["event_category"], deltas["event_label"], deltas["event_count"])]
+
+    def event(self):
+        return {"name": self.name, "params": {**self.deltas, **self.defaults}}
+
+    def payload(self):
+        """
+        Returns the new dictionary with the GA4 payload of the event.
+        """
+        return {"client_id": self.template.client_id, "non_personalized_ads": False, "events": [self.event()]}
+
+    def __getitem__(self, key):
+        return self.payload()[key]
+
+    def __iter__(self):
+        return iter(("client_id", "non_personalized_ads", "events"))
+
+    def __len__(self):
+        return 3
+
+    def __eq__(self, other):
+        if isinstance(other, GA4Message):
+            other = other.payload()
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.payload() == other
+
+    __hash__ = object.__hash__
+
+
+class GA4Batch(dict):
+    """
+    The payload merged from the events built with the same template, it is encoded with the template.
+    """
+    __slots__ = ('template', 'events_fields')
+
+    def __reduce__(self):
+        # the copies of the message are plain payloads
+        return dict, (dict(self),)
 
 
 class GA4Backend(TelemetryBackend):
     id = 'ga4'
+    default_backend_url = 'https://www.google-analytics.com/mp/collect'
+    # the environment variable overriding the endpoint, for example, with the self-hosted collector
+    backend_url_env_var = 'OPENVINO_TELEMETRY_GA4_URL'
     cid_filename = 'openvino_ga_cid'
     old_cid_filename = 'openvino_ga_uid'
     timeout = 3.0
+    # Measurement Protocol accepts at most 25 events per request
+    max_events_per_request = 25
 
-    def __init__(self, tid: str = None, app_name: str = None, app_version: str = None):
+    def __init__(self, tid: str = None, app_name: str = None, app_version: str = None, backend_url: str = None):
         super(GA4Backend, self).__init__(tid, app_name, app_version)
         self.measurement_id = tid
         self.app_name = app_name
         self.app_version = app_version
-        self.session_id = None
-        self.cid = None
-        self.backend_url = "https://www.google-analytics.com/mp/collect?measurement_id={}&api_secret={}".format(
-            self.measurement_id, telemetry_params["api_key"])
+        self._template = None
+        self._session_id = None
+        self._cid = None
+        # the measurement ID and the API secret are passed to the custom endpoint in the same way as to GA4
+        url = resolve_backend_url(self.default_backend_url, backend_url, self.backend_url_env_var)
+        query = parse.urlencode({'measurement_id': self.measurement_id, 'api_secret': telemetry_params["api_key"]})
+        self.backend_url = url + ('&' if parse.urlsplit(url).query else '?') + query
         self.default_message_attrs = {
             'app_name': self.app_name,
             'app_version': self.app_version,
-            'os': system(),
+            'os': get_environment().os,
         }
         self.stats = {}
 
+    @property
+    def cid(self):
+        return self._cid
+
+    @cid.setter
+    def cid(self, value: str):
+        self._cid = value
+        self._template = None
+
+    @property
+    def session_id(self):
+        return self._session_id
+
+    @session_id.setter
+    def session_id(self, value: str):
+        self._session_id = value
+        self._template = None
+
+    def encode_message(self, message: dict):
+        """
+        Encodes the message to the request body. The messages built with the payload template are encoded with it.
+        """
+        if isinstance(message, (GA4Message, GA4Batch)):
+            try:
+                return message.template.encode(message.events_fields)
+            except Exception as err:
+                pass  # nosec
+        return json.dumps(message).encode()
+
     def send(self, message: dict):
         if message is None:
-            return
+            return True
         try:
-            data = json.dumps(message).encode()
+            data = self.encode_message(message)
 
-            if self.backend_url.lower().startswith('http'):
-                req = request.Request(self.backend_url, data=data)
-            else:
+            if not self.backend_url.lower().startswith('http'):
                 log.info("Incorrect backend URL.")
-                return
-            if system() == 'Windows':
-                _send_func(req)
+                return False
+            if get_environment().os == 'Windows':
+                return send_request(self.backend_url, data)
             else:
                 # request.urlopen() may hang on Linux if there's no internet connection,
-                # so we need to run it in a subprocess and terminate after timeout.
+                # so we need to run it in a helper process, which is terminated after timeout.
+                # The helper process is reused by the following requests and restarted only after termination.
 
                 # Usage of subprocesses on Windows cause unexpected behavior, when script
                 # executes multiple times during subprocess initializing. For this reason
                 # subprocess are not recommended on Windows.
-                import multiprocessing
-                process = multiprocessing.Process(target=_send_func, args=(req,))
-                process.daemon = True
-                process.start()
+                return get_sender_process().request(self.backend_url, data, self.timeout)
+
+        except Exception as err:
+            return False
+
+    async def send_async(self, message: dict, pool):
+        from ..utils.async_http_pool import send_request_async
 
-                process.join(self.timeout)
-                if process.is_alive():
-                    process.terminate()
+        if message is None:
+            return True
+        try:
+            data = self.encode_message(message)
 
+            if not self.backend_url.lower().startswith('http'):
+                log.info("Incorrect backend URL.")
+                return False
+            # the deadline of the non-blocking request replaces the helper process used by send()
+            return await send_request_async(pool, self.backend_url, data, self.timeout)
         except Exception as err:
-            pass  # nosec
+            return False
+
+    def send_batch(self, messages: list):
+        undelivered = []
+        for message, sources in self._merge_messages(messages):
+            if not self.send(message):
+                undelivered.extend(sources)
+        return undelivered
+
+    def merge_messages(self, messages: list):
+        """
+        Packs events of the messages with the same client ID into the smallest number of messages, each of them
+        holds no more than max_events_per_request events.
+        :param messages: the list of messages built by this backend
+        :return: the list of merged messages
+        """
+        return [message for message, _ in self._merge_messages(messages)]
+
+    def _merge_messages(self, messages: list):
+        """
+        Merges the messages, see merge_messages().
+        :return: the list of tuples of the merged message and the list of the source messages it is built from
+        """
+        events_by_client = {}
+        for message in messages:
+            if message is None:
+                continue
+            if isinstance(message, GA4Message):
+                events_by_client.setdefault(message.template.client_id, []).append((message.event(), message))
+                continue
+            client_events = events_by_client.setdefault(message["client_id"], [])
+            client_events.extend((event, message) for event in message["events"])
+
+        merged = []
+        for client_id, events in events_by_client.items():
+            for i in range(0, len(events), self.max_events_per_request):
+                chunk = events[i:i + self.max_events_per_request]
+                sources = []
+                for _, source in chunk:
+                    if not sources or sources[-1] is not source:
+                        sources.append(source)
+                payload = {
+                    "client_id": client_id,
+                    "non_personalized_ads": False,
+                    "events": [event for event, _ in chunk]
+                }
+                template = getattr(sources[0], 'template', None)
+                if template is not None and all(getattr(source, 'template', None) is template for source in sources):
+                    # the messages built with the same template are merged without losing it, unless the events of
+                    # a message are split between the requests
+                    events_fields = [fields for source in sources for fields in source.events_fields]
+                    if len(events_fields) == len(chunk):
+                        payload = GA4Batch(payload)
+                        payload.template = template
+                        payload.events_fields = events_fields
+                merged.append((payload, sources))
+        return merged
+
+    def serialize_message(self, message):
+        if isinstance(message, GA4Message):
+            return message.payload()
+        return message
+
+    def deserialize_message(self, data, timestamp: float = None):
+        if timestamp is not None and isinstance(data, dict):
+            # keep the time the events originally occurred at
+            for event in data.get("events", []):
+                event.setdefault("timestamp_micros", int(timestamp * 1000000))
+        return data
 
     def build_event_message(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
                             app_name=None, app_version=None,
@@ -101,14 +297,17 @@ class GA4Backend(TelemetryBackend):
         if self.session_id is None:
             self.generate_new_session_id()
 
+        if app_name is None and app_version is None:
+            template = self._get_template(client_id)
+            if template is not None:
+                return GA4Message(template, event_action, event_category, event_label, event_value)
+
         default_args = copy(self.default_message_attrs)
-        default_args['docker'] = 'False'
+        default_args['docker'] = str(get_environment().docker)
         if app_name is not None:
             default_args['app_name'] = app_name
         if app_version is not None:
             default_args['app_version'] = app_version
-        if is_docker():
-            default_args['docker'] = 'True'
 
         payload = {
             "client_id": client_id,
@@ -129,6 +328,22 @@ class GA4Backend(TelemetryBackend):
         }
         return payload
 
+    def _get_template(self, client_id: str):
+        """
+        Returns the payload template for the current client ID, session ID and statistics, the template is built on
+        the first call after any of them is changed.
+        :return: the template or None if the invariant parameters override the fields of the event
+        """
+        template = self._template
+        if template is None:
+            default_args = copy(self.default_message_attrs)
+            default_args['docker'] = str(get_environment().docker)
+            params = {"session_id": self.session_id, **default_args, **self.stats}
+            if any(key in params for key in PayloadTemplate.event_keys):
+                return None
+            template = self._template = PayloadTemplate(client_id, params)
+        return template
+
     def build_session_start_message(self, category: str, **kwargs):
         self.generate_new_session_id()
         return self.build_event_message(category, "session", "start", 1)
@@ -142,9 +357,12 @@ class GA4Backend(TelemetryBackend):
     def build_stack_trace_message(self, category: str, error_msg: str, **kwargs):
         return self.build_event_message(category, "stack_trace", error_msg, 1)
 
-    def generate_new_cid_file(self):
+    def generate_new_cid_file(self, state=None):
         self.cid = get_or_generate_cid(self.cid_filename, lambda: str(uuid.uuid4()), is_valid_cid,
-                                       self.old_cid_filename)
+                                       self.old_cid_filename, state)
+
+    def load_cid(self, state):
+        self.generate_new_cid_file(state)
 
     def cid_file_initialized(self):
         return self.cid is not None
@@ -157,8 +375,13 @@ class GA4Backend(TelemetryBackend):
         remove_cid_file(self.cid_filename)
         remove_cid_file(self.old_cid_filename)
 
+    def message_format(self):
+        # the measurement ID is passed in the url, so the messages are shared by the backends with different IDs
+        return (self.id, self.app_name, self.app_version)
+
     def set_stats(self, data: dict):
         self.stats = data
+        self._template = None
 
 
 def is_valid_cid(cid: str):
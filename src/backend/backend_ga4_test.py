@@ -2,11 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import json
 import os
 import unittest
 import uuid
 from tempfile import TemporaryDirectory
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from .backend import BackendRegistry
 from .backend_ga4 import is_valid_cid
@@ -103,7 +104,89 @@ class GA4Test(unittest.TestCase):
                 self.assertTrue(cid_value == new_cid)
 
     def test_is_docker(self):
-        from .backend_ga4 import is_docker
+        from ..utils.environment import is_docker
         run_from_docker = "DOCKER_RUN" in os.environ and os.environ["DOCKER_RUN"].lower() == "true"
 
         self.assertTrue(run_from_docker == is_docker())
+
+    def test_merge_messages(self):
+        """
+        Checks that events with the same client ID are packed into the minimal number of messages.
+        """
+        backend = BackendRegistry.get_backend('ga4')("test_backend", "NONE")
+        backend.cid = "cid1"
+        messages = [backend.build_event_message("cat", "action", str(i), i) for i in range(30)]
+        backend.cid = "cid2"
+        messages.append(backend.build_event_message("cat", "action", "label", 1))
+
+        merged = backend.merge_messages(messages)
+        self.assertEqual([(m["client_id"], len(m["events"])) for m in merged],
+                         [("cid1", 25), ("cid1", 5), ("cid2", 1)])
+        self.assertEqual([e["params"]["event_count"] for e in merged[0]["events"] + merged[1]["events"]],
+                         list(range(30)))
+
+    def test_send_batch_returns_undelivered_messages(self):
+        """
+        Checks that send_batch() returns the source messages of the requests which failed.
+        """
+        backend = BackendRegistry.get_backend('ga4')("test_backend", "NONE")
+        backend.cid = "cid1"
+        messages = [backend.build_event_message("cat", "action", str(i), i) for i in range(30)]
+        backend.send = MagicMock(side_effect=[True, False])
+        self.assertEqual(backend.send_batch(messages), messages[25:])
+
+    def test_deserialized_message_keeps_timestamp(self):
+        """
+        Checks that the message restored from the spool keeps the original time of the event.
+        """
+        backend = BackendRegistry.get_backend('ga4')("test_backend", "NONE")
+        message = backend.build_event_message("cat", "action", "label", 1)
+        data = json.loads(json.dumps(backend.serialize_message(message)))
+        restored = backend.deserialize_message(data, 1700000000.5)
+        self.assertEqual(restored["events"][0]["timestamp_micros"], 1700000000500000)
+        self.assertEqual(restored["events"][0]["params"], message["events"][0]["params"])
+
+    def test_custom_backend_url(self):
+        """
+        Checks that the endpoint is overridden by the argument and by the environment variable, and that the
+        incorrect urls are ignored.
+        """
+        backend_class = BackendRegistry.get_backend('ga4')
+        query = "?measurement_id=test_backend&api_secret="
+        with patch.dict(os.environ, {backend_class.backend_url_env_var: "http://env.local:8080/collect"}):
+            backend = backend_class("test_backend", "NONE", backend_url="https://collector.local/mp/collect")
+            self.assertTrue(backend.backend_url.startswith("https://collector.local/mp/collect" + query))
+            backend = backend_class("test_backend", "NONE", backend_url="ftp://collector.local/")
+            self.assertTrue(backend.backend_url.startswith("http://env.local:8080/collect" + query))
+            backend = backend_class("test_backend", "NONE", backend_url="http://collector.local/collect?key=1")
+            self.assertTrue(backend.backend_url.startswith("http://collector.local/collect?key=1&measurement_id="))
+        with patch.dict(os.environ, {backend_class.backend_url_env_var: "collector.local"}):
+            backend = backend_class("test_backend", "NONE")
+            self.assertTrue(backend.backend_url.startswith(backend_class.default_backend_url + query))
+
+    def test_payload_template(self):
+        """
+        Checks that the message encoded with the payload template is equal to the message and that the template is
+        rebuilt when the client ID, the session ID or the statistics are changed.
+        """
+        backend = BackendRegistry.get_backend('ga4')("test_backend", "NONE")
+        backend.cid = "cid1"
+        backend.set_stats({"usage_count": 3, "usage_group": "1-100_usages"})
+        message = backend.build_event_message("cat", "action", "label \"\u00e9\"", 2)
+        self.assertEqual(json.loads(backend.encode_message(message)), message)
+        self.assertIs(backend.build_event_message("cat", "action", "label").template, message.template)
+
+        for change in (lambda: setattr(backend, "cid", "cid2"), backend.generate_new_session_id,
+                       lambda: backend.set_stats({"usage_count": 4})):
+            change()
+            new_message = backend.build_event_message("cat", "action", "label", 1)
+            self.assertIsNot(new_message.template, message.template)
+            self.assertEqual(json.loads(backend.encode_message(new_message)), new_message)
+            message = new_message
+        self.assertEqual(message["client_id"], "cid2")
+        self.assertEqual(message["events"][0]["params"]["usage_count"], 4)
+
+        # the merged messages are encoded with the template
+        merged = backend.merge_messages([backend.build_event_message("cat", "action", str(i), i) for i in range(30)])
+        self.assertEqual([len(message.events_fields) for message in merged], [25, 5])
+        self.assertEqual(json.loads(backend.encode_message(merged[0])), merged[0])
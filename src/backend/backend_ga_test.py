@@ -4,7 +4,7 @@
 
 import os
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from .backend import BackendRegistry
 from ..utils.opt_in_checker import OptInChecker
@@ -56,3 +56,16 @@ class GATest(unittest.TestCase):
         self.assertFalse(os.path.exists(self.cid_path))
         self.assertFalse(self.backend.cid_file_initialized())
         self.clean_test_dir()
+
+    def test_custom_backend_url(self):
+        """
+        Checks that the endpoint is overridden by the argument and by the environment variable.
+        """
+        backend_class = BackendRegistry.get_backend('ga')
+        default_url = backend_class.backend_url
+        with patch.dict(os.environ, {backend_class.backend_url_env_var: "http://env.local/collect"}):
+            self.assertEqual(backend_class("test_backend", "NONE").backend_url, "http://env.local/collect")
+            backend = backend_class("test_backend", "NONE", backend_url="https://collector.local/collect")
+            self.assertEqual(backend.backend_url, "https://collector.local/collect")
+        self.assertEqual(backend_class("test_backend", "NONE", backend_url="collect").backend_url, default_url)
+        self.assertEqual(backend_class.backend_url, default_url)
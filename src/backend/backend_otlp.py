@@ -0,0 +1,267 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import json
+import os
+import random
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+from urllib import parse
+
+from .backend import TelemetryBackend, is_valid_url, resolve_backend_url
+from ..utils.cid import get_or_generate_cid, remove_cid_file
+from ..utils.environment import get_environment
+from ..utils.http_pool import post_request
+
+# severity numbers of the OTLP log records
+SEVERITY_INFO = 9
+SEVERITY_ERROR = 17
+
+
+def otlp_value(value):
+    """
+    Converts the value to the OTLP AnyValue in JSON encoding.
+    """
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64-bit integers are encoded as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_attributes(attrs: dict):
+    """
+    Converts the dictionary to the list of OTLP KeyValue objects in JSON encoding.
+    """
+    return [{"key": key, "value": otlp_value(value)} for key, value in attrs.items() if value is not None]
+
+
+def parse_retry_after(value: str):
+    """
+    Parses the value of Retry-After header given either as the number of seconds or as the HTTP date.
+    :return: the delay in seconds or None if the value is absent or incorrect
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception as err:
+        return None
+
+
+class OTLPBackend(TelemetryBackend):
+    """
+    The backend exporting the messages as log records to the OpenTelemetry collector with OTLP/HTTP in JSON encoding.
+    The messages passed to send_batch() are exported with one gzip compressed request per max_records_per_export
+    records. The export is repeated if the collector is unavailable or throttles the requests. The delay is taken from
+    the Retry-After header of the response, otherwise it grows exponentially with jitter. The export is abandoned
+    after max_retries attempts or when the retries take longer than max_retry_time seconds.
+
+    The endpoint is set by backend_url, by the OTEL_EXPORTER_OTLP_LOGS_ENDPOINT environment variable or by the
+    OTEL_EXPORTER_OTLP_ENDPOINT environment variable extended with /v1/logs. The headers are added from the
+    OTEL_EXPORTER_OTLP_HEADERS environment variable in the key1=value1,key2=value2 format.
+    """
+    id = 'otlp'
+    cid_filename = 'openvino_otlp_cid'
+    default_backend_url = 'http://localhost:4318/v1/logs'
+    backend_url_env_var = 'OTEL_EXPORTER_OTLP_LOGS_ENDPOINT'
+    base_url_env_var = 'OTEL_EXPORTER_OTLP_ENDPOINT'
+    headers_env_var = 'OTEL_EXPORTER_OTLP_HEADERS'
+    scope_name = 'openvino_telemetry'
+    default_batch_size = 512
+    max_records_per_export = 512
+    # the statuses which are retried according to the OTLP specification
+    retryable_statuses = (429, 502, 503, 504)
+    max_retries = 5
+    max_retry_time = 10.0
+    initial_backoff = 0.5
+    max_backoff = 5.0
+    timeout = 3.0
+
+    def __init__(self, tid: str = None, app_name: str = None, app_version: str = None, backend_url: str = None):
+        super(OTLPBackend, self).__init__(tid, app_name, app_version)
+        self.tid = tid
+        self.app_name = app_name
+        self.app_version = app_version
+        self.cid = None
+        self.session_id = None
+        self.stats = {}
+        base_url = os.environ.get(self.base_url_env_var)
+        default_url = base_url.rstrip('/') + '/v1/logs' if base_url and is_valid_url(base_url) \
+            else self.default_backend_url
+        self.backend_url = resolve_backend_url(default_url, backend_url, self.backend_url_env_var)
+        self.headers = {
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip',
+        }
+        for item in os.environ.get(self.headers_env_var, '').split(','):
+            key, _, value = item.partition('=')
+            if key.strip() and value.strip():
+                self.headers[parse.unquote(key.strip())] = parse.unquote(value.strip())
+        self.resource = {
+            "attributes": otlp_attributes({
+                'service.name': self.app_name,
+                'service.version': self.app_version,
+                'os.type': get_environment().os,
+                'openvino.tid': self.tid,
+            })
+        }
+
+    def send(self, message: dict):
+        if message is None:
+            return True
+        return not self.send_batch([message])
+
+    def send_batch(self, messages: list):
+        records = [message for message in messages if message is not None]
+        undelivered = []
+        for i in range(0, len(records), self.max_records_per_export):
+            chunk = records[i:i + self.max_records_per_export]
+            if not self.export(chunk):
+                undelivered.extend(chunk)
+        return undelivered
+
+    def build_request(self, records: list):
+        """
+        Builds the gzip compressed body of the export request.
+        :param records: the list of the log records built by this backend
+        :return: the body of the request
+        """
+        payload = {
+            "resourceLogs": [{
+                "resource": self.resource,
+                "scopeLogs": [{
+                    "scope": {"name": self.scope_name},
+                    "logRecords": records
+                }]
+            }]
+        }
+        return gzip.compress(json.dumps(payload, separators=(',', ':')).encode(), compresslevel=6, mtime=0)
+
+    def export(self, records: list):
+        """
+        Exports the log records with one request, the request is repeated if the error is retryable.
+        :param records: the list of the log records built by this backend
+        :return: True if the records are accepted by the collector, otherwise False
+        """
+        if not self.backend_url.lower().startswith('http'):
+            return False
+        try:
+            data = self.build_request(records)
+        except Exception as err:
+            return False
+        deadline = time.monotonic() + self.max_retry_time
+        for attempt in range(self.max_retries + 1):
+            try:
+                status, headers = post_request(self.backend_url, data, self.headers, self.timeout)
+            except Exception as err:
+                status, headers = None, None
+            if status is not None:
+                if 200 <= status < 300:
+                    return True
+                if status not in self.retryable_statuses:
+                    return False
+            delay = parse_retry_after(headers.get('Retry-After')) if headers is not None else None
+            if delay is None:
+                delay = min(self.max_backoff, self.initial_backoff * 2 ** attempt) * random.uniform(0.5, 1.0)  # nosec
+            if attempt == self.max_retries or time.monotonic() + delay > deadline:
+                return False
+            self._wait(delay)
+        return False
+
+    def _wait(self, delay: float):
+        time.sleep(delay)
+
+    def build_log_record(self, severity: int, body: str, attrs: dict, app_name=None, app_version=None):
+        if self.session_id is None:
+            self.generate_new_session_id()
+        now = str(time.time_ns())
+        attrs = {
+            **attrs,
+            'session.id': self.session_id,
+            'openvino.client_id': self.cid if self.cid is not None else "0",
+            'service.name': app_name,
+            'service.version': app_version,
+            **self.stats
+        }
+        return {
+            "timeUnixNano": now,
+            "observedTimeUnixNano": now,
+            "severityNumber": severity,
+            "severityText": "ERROR" if severity >= SEVERITY_ERROR else "INFO",
+            "body": {"stringValue": str(body)},
+            "attributes": otlp_attributes(attrs)
+        }
+
+    def deserialize_message(self, data, timestamp: float = None):
+        if timestamp is not None and isinstance(data, dict):
+            # keep the time the event originally occurred at
+            data.setdefault("timeUnixNano", str(int(timestamp * 1e9)))
+        return data
+
+    def build_event_message(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
+                            app_name=None, app_version=None, **kwargs):
+        return self.build_log_record(SEVERITY_INFO, event_label, {
+            'event.name': event_action,
+            'event.category': event_category,
+            'event.value': event_value,
+        }, app_name, app_version)
+
+    def build_session_start_message(self, category: str, **kwargs):
+        self.generate_new_session_id()
+        return self.build_event_message(category, "session", "start", 1)
+
+    def build_session_end_message(self, category: str, **kwargs):
+        return self.build_event_message(category, "session", "end", 1)
+
+    def build_error_message(self, category: str, error_msg: str, **kwargs):
+        return self.build_log_record(SEVERITY_ERROR, error_msg, {
+            'event.name': "error_",
+            'event.category': category,
+        })
+
+    def build_stack_trace_message(self, category: str, error_msg: str, **kwargs):
+        return self.build_log_record(SEVERITY_ERROR, error_msg, {
+            'event.name': "stack_trace",
+            'event.category': category,
+        })
+
+    def generate_new_cid_file(self, state=None):
+        self.cid = get_or_generate_cid(self.cid_filename, lambda: str(uuid.uuid4()), is_valid_cid, None, state)
+
+    def load_cid(self, state):
+        self.generate_new_cid_file(state)
+
+    def cid_file_initialized(self):
+        return self.cid is not None
+
+    def generate_new_session_id(self):
+        self.session_id = str(uuid.uuid4())
+
+    def remove_cid_file(self):
+        self.cid = None
+        remove_cid_file(self.cid_filename)
+
+    def message_format(self):
+        # the resource is added on export, so the log records are shared by the backends with different endpoints
+        return (self.id, self.app_name, self.app_version)
+
+    def set_stats(self, data: dict):
+        self.stats = data
+
+
+def is_valid_cid(cid: str):
+    try:
+        uuid.UUID(cid, version=4)
+    except ValueError:
+        return False
+    return True
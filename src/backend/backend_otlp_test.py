@@ -0,0 +1,129 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import gzip
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+from .backend import BackendRegistry
+from .backend_otlp import parse_retry_after
+
+
+class ReceiverHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in for the OTLP/HTTP receiver of the collector, answers with the statuses from the server.statuses list.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.lock:
+            status, retry_after = self.server.statuses.pop(0) if self.server.statuses else (200, None)
+            self.server.requests.append((dict(self.headers), body))
+        self.send_response(status)
+        if retry_after is not None:
+            self.send_header('Retry-After', retry_after)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OTLPTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ReceiverHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.statuses = []
+        self.server.requests = []
+        self.url = 'http://127.0.0.1:{}/v1/logs'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.backend = BackendRegistry.get_backend('otlp')("test_backend", "app", "1.0", backend_url=self.url)
+        self.backend._wait = MagicMock()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def exported_records(self, index: int = 0):
+        headers, body = self.server.requests[index]
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        resource_logs = json.loads(gzip.decompress(body))["resourceLogs"][0]
+        return resource_logs["scopeLogs"][0]["logRecords"]
+
+    def test_batch_export(self):
+        """
+        Checks that the batch is exported with one request per max_records_per_export records.
+        """
+        self.backend.max_records_per_export = 40
+        messages = [self.backend.build_event_message("cat", "action", str(i), i) for i in range(100)]
+        messages.append(self.backend.build_error_message("cat", "error"))
+        self.assertEqual(self.backend.send_batch(messages), [])
+        self.assertEqual(len(self.server.requests), 3)
+        records = self.exported_records(0) + self.exported_records(1) + self.exported_records(2)
+        self.assertEqual([record["body"]["stringValue"] for record in records[:100]], [str(i) for i in range(100)])
+
+        attributes = {item["key"]: item["value"] for item in records[5]["attributes"]}
+        self.assertEqual(attributes["event.name"], {"stringValue": "action"})
+        self.assertEqual(attributes["event.category"], {"stringValue": "cat"})
+        self.assertEqual(attributes["event.value"], {"intValue": "5"})
+        self.assertEqual(attributes["session.id"], {"stringValue": self.backend.session_id})
+        self.assertEqual(records[5]["severityText"], "INFO")
+        self.assertEqual(records[100]["severityText"], "ERROR")
+
+    def test_retry_after(self):
+        """
+        Checks that the throttled export is repeated after the delay given by the collector.
+        """
+        self.server.statuses = [(429, '7'), (503, None)]
+        self.assertTrue(self.backend.send(self.backend.build_event_message("cat", "action", "label")))
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.backend._wait.call_args_list[0][0][0], 7.0)
+        # the delay of the response without Retry-After is chosen by the exponential backoff
+        self.assertLessEqual(self.backend._wait.call_args_list[1][0][0], self.backend.initial_backoff * 2)
+
+    def test_retries_are_bounded(self):
+        """
+        Checks that the messages are reported as undelivered after max_retries retries, when the delay exceeds
+        max_retry_time and when the error is not retryable.
+        """
+        messages = [self.backend.build_event_message("cat", "action", "label")]
+        self.server.statuses = [(503, None)] * 10
+        self.assertEqual(self.backend.send_batch(messages), messages)
+        self.assertEqual(len(self.server.requests), self.backend.max_retries + 1)
+
+        self.server.statuses = [(429, '3600')]
+        self.assertEqual(self.backend.send_batch(messages), messages)
+        self.assertEqual(len(self.server.requests), self.backend.max_retries + 2)
+
+        self.server.statuses = [(400, None)]
+        self.assertFalse(self.backend.send(messages[0]))
+        self.assertEqual(len(self.server.requests), self.backend.max_retries + 3)
+
+    def test_endpoint_from_environment(self):
+        """
+        Checks that the endpoint is taken from the OTLP environment variables.
+        """
+        backend_class = BackendRegistry.get_backend('otlp')
+        with patch.dict(os.environ, {'OTEL_EXPORTER_OTLP_ENDPOINT': 'http://collector:4318/',
+                                     'OTEL_EXPORTER_OTLP_HEADERS': 'api-key=secret%3D,x-tenant = a'}):
+            backend = backend_class("test_backend", "app", "1.0")
+            self.assertEqual(backend.backend_url, 'http://collector:4318/v1/logs')
+            self.assertEqual(backend.headers['api-key'], 'secret=')
+            self.assertEqual(backend.headers['x-tenant'], 'a')
+            with patch.dict(os.environ, {'OTEL_EXPORTER_OTLP_LOGS_ENDPOINT': 'https://logs.local/ingest'}):
+                self.assertEqual(backend_class("test_backend", "app", "1.0").backend_url, 'https://logs.local/ingest')
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
@@ -1,15 +1,15 @@
 # Copyright (C) 2018-2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import atexit
 import logging as log
 import os
 import sys
 from enum import Enum
 
 from .backend.backend import BackendRegistry
-from .utils.sender import TelemetrySender
-from .utils.opt_in_checker import OptInChecker, ConsentCheckResult, DialogResult
-from .utils.stats_processor import StatsProcessor
+from .utils.opt_in_checker import OptInChecker, ConsentCheckResult, ConsentWatcher, DialogResult
+from .utils.queue_policy import MAX_QUEUE_SIZE, QueuePolicy
 
 
 class OptInStatus(Enum):
@@ -37,17 +37,50 @@ class Telemetry(metaclass=SingletonMetaClass):
         :param app_name: The name of the application.
         :param app_version: The version of the application.
         :param tid: The ID of telemetry base.
-        :param backend: Telemetry backend name.
+        :param backend: Telemetry backend name or the list of names. The messages are sent to all listed backends,
+        every backend has its own queue, so a slow backend does not delay the others.
         :param enable_opt_in_dialog: boolean flag to turn on or turn off opt-in dialog.
         If enable_opt_in_dialog=True opt-in dialog is shown during first usage of openvino tools,
         no telemetry is sent until user accepts telemetry with dialog.
         If enable_opt_in_dialog=False, telemetry is sent without opt-in dialog, unless user explicitly turned it off
         with opt_in_out script.
         :param disable_in_ci: Turn off telemetry for CI jobs.
+        :param batch_size: the maximum number of messages sent by the backend at once. If batch_size is greater
+        than 1, messages are accumulated and sent in batches when batch_size messages are collected, batch_timeout
+        seconds pass or the telemetry is shut down. By default, the batch size preferred by the backend is used.
+        :param batch_timeout: the maximum time in seconds a message waits for the batch to be filled.
+        :param enable_spool: store messages which could not be delivered to the file and send them during the next
+        initialization of the telemetry.
+        :param queue_policy: QueuePolicy defining which messages are dropped when the queue of messages is full.
+        :param max_queue_size: the maximum number of messages waiting to be sent.
+        :param max_queue_bytes: the maximum total size in bytes of messages waiting to be sent, not limited if None.
+        :param aggregate_events: sum values of the events with the same category, action and label locally and send
+        one event per label every aggregation_window seconds and on flush() or force_shutdown().
+        :param aggregation_window: the time in seconds the events are aggregated for.
+        :param rate_limits: the dictionary mapping the category to the (rate, burst) tuple limiting the events,
+        errors and stack traces of the category to rate messages per second with at most burst messages at once.
+        The limit of the '*' category is applied to the categories which are not listed.
+        :param sample_rates: the dictionary mapping the category to the ratio from 0 to 1 of the events, errors and
+        stack traces of the category which are sent. The ratio of the '*' category is applied to the categories which
+        are not listed.
+        :param consent_check_interval: the maximum time in seconds after which the change of the consent file made
+        by another process, for example, by opt_in_out --opt_out, stops sending of the telemetry.
+        :param defer_stats_write: do not write the state file during the initialization. The usage count is
+        incremented in memory and written on flush(), force_shutdown() or at exit, it is added to the usage count
+        written by other processes in the meantime.
+        :param fork_session_category: if set, the child process started with fork() starts a new session with this
+        category before its first message is sent. The messages queued in the parent process are sent only by the
+        parent process.
+        :param backend_url: the endpoint the backend sends the messages to instead of the default one, for example,
+        the self-hosted collector, or the dictionary mapping the backend names to their endpoints, which is required
+        if several backends are used. The endpoint can also be set by the OPENVINO_TELEMETRY_GA_URL and
+        OPENVINO_TELEMETRY_GA4_URL environment variables for the 'ga' and 'ga4' backends.
+        :param timer_window: the time in seconds the durations measured by timer() are collected for before their
+        summaries are sent.
     """
 
     def __init__(self, app_name: str = None, app_version: str = None, tid: str = None,
-                 backend: [str, None] = 'ga', enable_opt_in_dialog=True, disable_in_ci=False):
+                 backend: [str, list, None] = 'ga', enable_opt_in_dialog=True, disable_in_ci=False, **kwargs):
         # The case when instance is already configured
         if app_name is None:
             if not hasattr(self, 'sender') or self.sender is None:
@@ -55,12 +88,55 @@ class Telemetry(metaclass=SingletonMetaClass):
                                    'application name, version and TID.')
             return
 
-        self.init(app_name, app_version, tid, backend, enable_opt_in_dialog, disable_in_ci, True)
+        self.init(app_name, app_version, tid, backend, enable_opt_in_dialog, disable_in_ci, True, **kwargs)
+
+    @property
+    def consent(self):
+        """
+        Returns True if the telemetry is allowed to be sent. The consent given during the initialization is revoked
+        if the consent file is changed to decline the telemetry afterwards.
+        """
+        if not self._consent:
+            return False
+        if self._consent_watcher is None:
+            opt_in_checker = OptInChecker()
+            base_dir = opt_in_checker.consent_file_base_dir()
+            subdirectory = opt_in_checker.consent_file_subdirectory()
+            if base_dir is None or subdirectory is None:
+                return True
+            self._consent_watcher = ConsentWatcher(opt_in_checker.consent_file(base_dir, subdirectory),
+                                                   self.consent_check_interval, ConsentCheckResult.ACCEPTED)
+        return self._consent_watcher.result() != ConsentCheckResult.DECLINED
+
+    @consent.setter
+    def consent(self, value: bool):
+        self._consent = value
+        self._consent_watcher = None
 
     def init(self, app_name: str = None, app_version: str = None, tid: str = None,
-             backend: [str, None] = 'ga', enable_opt_in_dialog=True, disable_in_ci=False, increment_stats=False):
+             backend: [str, list, None] = 'ga', enable_opt_in_dialog=True, disable_in_ci=False, increment_stats=False,
+             batch_size: int = None, batch_timeout: float = 1.0, enable_spool=False,
+             queue_policy: QueuePolicy = QueuePolicy.DROP_NEWEST, max_queue_size: int = MAX_QUEUE_SIZE,
+             max_queue_bytes: int = None, aggregate_events=False, aggregation_window: float = 60.0,
+             rate_limits: dict = None, sample_rates: dict = None, consent_check_interval: float = 1.0,
+             defer_stats_write=False, fork_session_category: str = None, backend_url: [str, dict] = None,
+             timer_window: float = 60.0):
+        backend_names = backend if isinstance(backend, (list, tuple)) else [backend]
+        if backend_url is not None and not isinstance(backend_url, dict) and len(backend_names) > 1:
+            raise ValueError('The backend_url should be the dictionary mapping the backend names to their endpoints '
+                             'if several backends are used.')
+        self.consent_check_interval = consent_check_interval
+        self.fork_session_category = fork_session_category
+        self._fork_session_pending = False
+        # the state of the previous initialization is written before it is replaced
+        self.save_state()
+        from .utils.state import TelemetryState
+
         opt_in_checker = OptInChecker()
-        opt_in_check_result = opt_in_checker.check(enable_opt_in_dialog, disable_in_ci)
+        # the opt-in status, the client ID and the statistics are read from the single state file
+        state = TelemetryState()
+        state.load()
+        opt_in_check_result = opt_in_checker.check(enable_opt_in_dialog, disable_in_ci, state.consent)
         if enable_opt_in_dialog:
             self.consent = opt_in_check_result == ConsentCheckResult.ACCEPTED
         else:
@@ -70,17 +146,69 @@ class Telemetry(metaclass=SingletonMetaClass):
         if tid is None:
             log.warning("Telemetry will not be sent as TID is not specified.")
 
+        # the modules which are not needed to import the package are loaded on the first initialization
+        from .utils.aggregator import EventAggregator
+        from .utils.rate_limiter import RateLimiter
+        from .utils.sender import TelemetrySender
+        from .utils.spool import EventSpool
+        from .utils.timer import DurationAggregator
+
         self.tid = tid
-        self.backend = BackendRegistry.get_backend(backend)(self.tid, app_name, app_version)
-        self.sender = TelemetrySender()
+        self.backends = []
+        for backend_name in backend_names:
+            url = backend_url.get(backend_name) if isinstance(backend_url, dict) else backend_url
+            # the endpoint is passed only if it is set, so the custom backends are not required to accept it
+            backend_kwargs = {'backend_url': url} if url is not None else {}
+            self.backends.append(BackendRegistry.get_backend(backend_name)(self.tid, app_name, app_version,
+                                                                           **backend_kwargs))
+        # the first backend is used where a single backend is expected, for example, by the opt-in dialog
+        self.backend = self.backends[0]
+        spool = EventSpool() if enable_spool and self.consent else None
+        batch_sizes = None
+        if batch_size is None:
+            batch_size = 1
+            batch_sizes = {backend: getattr(backend, 'default_batch_size', 1) for backend in self.backends}
+        self.sender = TelemetrySender(batch_size=batch_size, batch_timeout=batch_timeout, spool=spool,
+                                      queue_policy=queue_policy, max_queue_size=max_queue_size,
+                                      max_queue_bytes=max_queue_bytes, batch_sizes=batch_sizes)
+        self.async_sender = None
+        self.replay_dropped = 0
+        self.aggregator = EventAggregator(self._send_aggregated_event, aggregation_window) \
+            if aggregate_events else None
+        self.rate_limiter = RateLimiter(rate_limits, sample_rates) if rate_limits or sample_rates else None
+        self.durations = DurationAggregator(self._send_duration_summary, timer_window)
+
+        if not getattr(self, '_reset_after_fork_registered', False) and hasattr(os, 'register_at_fork'):
+            # the sender, the aggregators, the rate limiter, the backends and the helpers used to send the requests
+            # reset themselves in the child process. The handlers are called in the order of registration, so the
+            # modules are imported before the handler of the telemetry is registered. The handler of the telemetry
+            # does not send anything anyway, because the modules imported later may still hold the locks of the
+            # parent process.
+            import concurrent.futures.thread  # noqa: F401
+            from .utils import environment, http_pool, sender_process  # noqa: F401
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+            self._reset_after_fork_registered = True
 
-        if self.consent and not self.backend.cid_file_initialized():
-            self.backend.generate_new_cid_file()
+        if self.consent:
+            for backend in self.backends:
+                if not backend.cid_file_initialized():
+                    backend.load_cid(state)
 
         if self.consent:
-            data = self.get_stats(increment_stats)
+            data = self.get_stats(increment_stats, state)
             if data is not None and isinstance(data, dict):
-                self.backend.set_stats(data)
+                for backend in self.backends:
+                    backend.set_stats(data)
+            if defer_stats_write:
+                self._pending_state = state
+                if not getattr(self, '_save_state_at_exit', False):
+                    atexit.register(self.save_state)
+                    self._save_state_at_exit = True
+            else:
+                state.save()
+
+        if spool is not None:
+            self.replay_spool(spool)
 
         if not enable_opt_in_dialog and self.consent:
             # Try to create directory for client ID if it does not exist
@@ -89,8 +217,9 @@ class Telemetry(metaclass=SingletonMetaClass):
                 return
 
             # Generate client ID if it does not exist
-            if not self.backend.cid_file_initialized():
-                self.backend.generate_new_cid_file()
+            for backend in self.backends:
+                if not backend.cid_file_initialized():
+                    backend.generate_new_cid_file()
             return
 
         # Consent file may be absent, for example, during the first run of Openvino tool.
@@ -113,7 +242,8 @@ class Telemetry(metaclass=SingletonMetaClass):
                         # If the dialog result is "accepted" we generate new client ID file and update openvino_telemetry
                         # file with "1" value. Telemetry data will be collected in this case.
                         self.consent = True
-                        self.backend.generate_new_cid_file()
+                        for backend in self.backends:
+                            backend.generate_new_cid_file()
                         self.send_opt_in_event(OptInStatus.ACCEPTED)
 
                         # Here we send telemetry with "accepted" dialog result
@@ -165,14 +295,106 @@ class Telemetry(metaclass=SingletonMetaClass):
                     return True
         return False
 
+    def replay_spool(self, spool, batch_size: int = 100):
+        """
+        Sends the messages stored in the spool during the previous runs. The messages keep the time they were
+        originally sent at. The messages of other backends are returned to the spool. The messages of several
+        backends with the same id are sent to the first of them.
+
+        :param spool: the spool with undelivered messages
+        :param batch_size: the number of messages read from the spool at once
+        :return: the number of stored messages which are dropped, because they can not be read
+        """
+        backends = {}
+        for backend in self.backends:
+            backends.setdefault(backend.id, backend)
+        foreign_records = []
+        damaged = spool.damaged
+        dropped = 0
+        for records in spool.drain(batch_size):
+            for record in records:
+                try:
+                    backend = backends.get(record["backend"])
+                    if backend is None:
+                        foreign_records.append(record)
+                        continue
+                    message = backend.deserialize_message(record["data"], record["ts"])
+                except Exception as err:
+                    dropped += 1
+                    continue
+                self.sender.send(backend, message, record["ts"])
+        spool.append(foreign_records)
+        dropped += spool.damaged - damaged
+        if dropped:
+            log.info("{} stored telemetry messages can not be read and are dropped.".format(dropped))
+        self.replay_dropped += dropped
+        return dropped
+
+    def flush(self, timeout: float = 1.0):
+        """
+        Waits until the sent messages are delivered or the timeout is expired.
+
+        :param timeout: maximum timeout time
+        :return: FlushResult with the numbers of delivered, pending and abandoned messages
+        """
+        if self.aggregator is not None:
+            self.aggregator.flush()
+        self.durations.flush()
+        self.save_state()
+        result = self.sender.flush(timeout)
+        return self._flush_backends(result)
+
     def force_shutdown(self, timeout: float = 1.0):
         """
-        Stops currently running threads which may be hanging because of no Internet connection.
+        Waits for the sent messages for at most timeout seconds and stops currently running threads which may be
+        hanging because of no Internet connection.
 
         :param timeout: maximum timeout time
+        :return: FlushResult with the numbers of delivered, pending and abandoned messages
+        """
+        if self.aggregator is not None:
+            self.aggregator.flush()
+        self.durations.flush()
+        self.save_state()
+        result = self.sender.force_shutdown(timeout)
+        return self._flush_backends(result)
+
+    def _flush_backends(self, result):
+        """
+        Writes out the messages buffered by the backends, the messages which are not written are counted as pending.
+        """
+        for backend in self.backends:
+            if not backend.flush():
+                result = result._replace(pending=result.pending + backend.buffered_count())
+        return result
+
+    def _reset_after_fork(self):
+        """
+        Resets the state copied from the parent process in the child process after fork.
+        """
+        from .utils.sender_process import is_helper_process
+
+        # the helper process started with fork only sends the requests of the parent process
+        if is_helper_process():
+            return
+        # the deferred usage count is written by the parent process
+        self._pending_state = None
+        self.async_sender = None
+        self._consent_watcher = None
+        # the session is started by the first message of the child process, because the threads can not be started
+        # safely until all at-fork handlers are called
+        self._fork_session_pending = self.fork_session_category is not None
+
+    def save_state(self):
+        """
+        Writes the state deferred with defer_stats_write=True. The state is not written if the consent was revoked
+        since the initialization.
         :return: None
         """
-        self.sender.force_shutdown(timeout)
+        state = getattr(self, '_pending_state', None)
+        self._pending_state = None
+        if state is not None and self.consent:
+            state.save()
 
     def send_event(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
                    app_name=None, app_version=None, force_send=False, **kwargs):
@@ -189,10 +411,139 @@ class Telemetry(metaclass=SingletonMetaClass):
         :param kwargs: additional parameters
         :return: None
         """
+        if self.consent and not force_send and not self._allowed(event_category):
+            return
+        if self.aggregator is not None and self.consent and not force_send:
+            self.aggregator.add(event_category, event_action, event_label, event_value, app_name, app_version)
+            return
         if self.consent or force_send:
-            self.sender.send(self.backend, self.backend.build_event_message(event_category, event_action, event_label,
-                                                                            event_value, app_name, app_version,
-                                                                            **kwargs))
+            self._send_message(lambda backend: backend.build_event_message(event_category, event_action, event_label,
+                                                                           event_value, app_name, app_version,
+                                                                           **kwargs))
+
+    def _send_aggregated_event(self, event_category: str, event_action: str, event_label: str, event_value: int,
+                               app_name=None, app_version=None):
+        if self.consent:
+            self._send_message(lambda backend: backend.build_event_message(event_category, event_action, event_label,
+                                                                           event_value, app_name, app_version))
+
+    def timer(self, category: str, name: str):
+        """
+        Returns the timer measuring the duration of the operation, which is used as the context manager or as the
+        decorator. The durations are collected locally in the histograms per category and name, and one event with
+        the summary is sent per category and name every timer_window seconds and on flush() or force_shutdown().
+        The event has the category, the name as the action, the label like
+        "count=3,min_ms=1.2,p50_ms=1.5,p90_ms=2,p99_ms=2,max_ms=2.1" and the number of measurements as the value.
+
+        Usage:
+            with telemetry.timer("model", "compile"):
+                ...
+
+            @telemetry.timer("model", "convert")
+            def convert():
+                ...
+
+        :param category: category of the measured operation
+        :param name: name of the measured operation
+        :return: Timer object
+        """
+        from .utils.timer import Timer
+
+        return Timer(self._record_duration, category, name)
+
+    def _record_duration(self, category: str, name: str, duration: float):
+        if self.consent:
+            self.durations.add(category, name, duration)
+
+    def _send_duration_summary(self, category: str, name: str, summary: dict):
+        from .utils.timer import format_summary
+
+        # the summary stands for all measurements of the window, so it is limited by the rate, but not sampled
+        if self.consent and self._allowed(category, sample=False):
+            label = format_summary(summary)
+            self._send_message(lambda backend: backend.build_event_message(category, name, label, summary["count"]))
+
+    def _send_message(self, build: callable, sender=None):
+        """
+        Builds the message for every backend and sends it. The message is built once for the backends which accept
+        the messages of the same format.
+
+        :param build: the function building the message for the given backend
+        :param sender: the sender to send the message with, the sender of the telemetry by default
+        :return: None
+        """
+        if getattr(self, '_fork_session_pending', False):
+            self._fork_session_pending = False
+            self.start_session(self.fork_session_category)
+        sender = sender or self.sender
+        if len(self.backends) == 1:
+            sender.send(self.backend, build(self.backend))
+            return
+        messages = {}
+        for backend in self.backends:
+            message_format = backend.message_format()
+            if message_format is None:
+                message = build(backend)
+            elif message_format in messages:
+                message = messages[message_format]
+            else:
+                message = messages[message_format] = build(backend)
+            sender.send(backend, message)
+
+    async def send_event_async(self, event_category: str, event_action: str, event_label: str, event_value: int = 1,
+                               app_name=None, app_version=None, force_send=False, **kwargs):
+        """
+        Send single event from the asyncio event loop. The event is sent by the task of the running event loop
+        without threads or child processes, the method returns without waiting for the event to be delivered.
+        If aggregate_events is set, the event is summed up with the events sent by send_event() and the sum is sent
+        by the aggregator instead.
+
+        :param event_category: category of the event
+        :param event_action: action of the event
+        :param event_label: the label associated with the action
+        :param event_value: the integer value corresponding to this label
+        :param app_name: application name
+        :param app_version: application version
+        :param force_send: forces to send event ignoring the consent value
+        :param kwargs: additional parameters
+        :return: None
+        """
+        if self.consent and not force_send and not self._allowed(event_category):
+            return
+        if self.aggregator is not None and self.consent and not force_send:
+            self.aggregator.add(event_category, event_action, event_label, event_value, app_name, app_version)
+            return
+        if self.consent or force_send:
+            self._send_message(lambda backend: backend.build_event_message(event_category, event_action, event_label,
+                                                                           event_value, app_name, app_version,
+                                                                           **kwargs),
+                               self._get_async_sender())
+
+    async def flush_async(self, timeout: float = 1.0):
+        """
+        Waits until the events sent with send_event_async() are delivered or the timeout is expired.
+
+        :param timeout: maximum timeout time
+        :return: FlushResult with the numbers of delivered, pending and abandoned events
+        """
+        return await self._get_async_sender().flush(timeout)
+
+    async def aclose(self, timeout: float = 1.0):
+        """
+        Waits for the events sent with send_event_async() for at most timeout seconds, cancels the rest and closes
+        the connections.
+
+        :param timeout: maximum timeout time
+        :return: None
+        """
+        if self.async_sender is not None:
+            await self.async_sender.close(timeout)
+
+    def _get_async_sender(self):
+        if self.async_sender is None:
+            from .utils.async_sender import AsyncTelemetrySender
+            self.async_sender = AsyncTelemetrySender(spool=self.sender.spool)
+        return self.async_sender
 
     def start_session(self, category: str, **kwargs):
         """
@@ -203,7 +554,7 @@ class Telemetry(metaclass=SingletonMetaClass):
         :return: None
         """
         if self.consent:
-            self.sender.send(self.backend, self.backend.build_session_start_message(category, **kwargs))
+            self._send_message(lambda backend: backend.build_session_start_message(category, **kwargs))
 
     def end_session(self, category: str, **kwargs):
         """
@@ -214,15 +565,48 @@ class Telemetry(metaclass=SingletonMetaClass):
         :return: None
         """
         if self.consent:
-            self.sender.send(self.backend, self.backend.build_session_end_message(category, **kwargs))
+            self._send_message(lambda backend: backend.build_session_end_message(category, **kwargs))
 
     def send_error(self, category: str, error_msg: str, **kwargs):
-        if self.consent:
-            self.sender.send(self.backend, self.backend.build_error_message(category, error_msg, **kwargs))
+        if self.consent and self._allowed(category):
+            self._send_message(lambda backend: backend.build_error_message(category, error_msg, **kwargs))
 
     def send_stack_trace(self, category: str, stack_trace: str, **kwargs):
-        if self.consent:
-            self.sender.send(self.backend, self.backend.build_stack_trace_message(category, stack_trace, **kwargs))
+        if self.consent and self._allowed(category):
+            self._send_message(lambda backend: backend.build_stack_trace_message(category, stack_trace, **kwargs))
+
+    def _allowed(self, category: str, sample: bool = True):
+        """
+        Checks the rate limit and, if sample is True, the sampling ratio of the category.
+        """
+        return self.rate_limiter is None or self.rate_limiter.allow(category, sample)
+
+    def get_rate_limit_stats(self):
+        """
+        Returns the numbers of messages per category which were not sent because of the rate limits and sampling.
+
+        :return: the dictionary with "rate_limited" and "sampled_out" dictionaries mapping categories to the numbers
+        of messages
+        """
+        if self.rate_limiter is None:
+            return {"rate_limited": {}, "sampled_out": {}}
+        return self.rate_limiter.get_stats()
+
+    def get_internal_stats(self):
+        """
+        Returns the counters of the telemetry itself, which help to choose the sizes of the queues and the numbers of
+        the workers. The counters are accumulated since the last initialization.
+
+        :return: the dictionary returned by TelemetrySender.get_stats() extended with the "sender_process"
+        dictionary with the numbers of started and terminated helper processes and of the requests timed out in them
+        and with the number of "replay_dropped" messages stored during the previous runs, which could not be read
+        """
+        from .utils.sender_process import get_sender_process
+
+        stats = self.sender.get_stats()
+        stats["sender_process"] = get_sender_process().get_stats()
+        stats["replay_dropped"] = self.replay_dropped
+        return stats
 
     @staticmethod
     def _update_opt_in_status(tid: str, new_opt_in_status: bool):
@@ -262,16 +646,31 @@ class Telemetry(metaclass=SingletonMetaClass):
         # In order to prevent sending of duplicate events, after multiple run of opt_in_out --opt_in/--opt_out
         # we send opt_in event only if consent value is changed
         if new_opt_in_status:
-            telemetry.backend.generate_new_cid_file()
+            for backend in telemetry.backends:
+                backend.generate_new_cid_file()
             if prev_status != OptInStatus.ACCEPTED:
                 telemetry.send_opt_in_event(OptInStatus.ACCEPTED, prev_status)
             print("You have successfully opted in to send the telemetry data.")
         else:
             if prev_status != OptInStatus.DECLINED:
                 telemetry.send_opt_in_event(OptInStatus.DECLINED, prev_status, force_send=True)
-            telemetry.backend.remove_cid_file()
+            for backend in telemetry.backends:
+                backend.remove_cid_file()
+                backend.remove_stored_data()
+            # the backends which are not used by this process may have stored the client IDs and the messages too
+            for backend_id in BackendRegistry.backend_ids():
+                try:
+                    backend = BackendRegistry.get_backend(backend_id)(tid, app_name, app_version)
+                    backend.remove_cid_file()
+                    backend.remove_stored_data()
+                except Exception as err:
+                    pass  # nosec
+            from .utils.spool import EventSpool
+            from .utils.state import TelemetryState
             from .utils.stats_processor import StatsProcessor
             StatsProcessor().remove_stats_file()
+            TelemetryState().remove_state_file()
+            EventSpool().remove_spool_file()
             print("You have successfully opted out to send the telemetry data.")
 
     def send_opt_in_event(self, new_state: OptInStatus, prev_state: OptInStatus = OptInStatus.UNDEFINED,
@@ -291,25 +690,26 @@ class Telemetry(metaclass=SingletonMetaClass):
             label = "{{prev_state:{}, new_state: {}}}".format(prev_state.value, new_state.value)
             self.send_event("opt_in", new_state.value, label, force_send=force_send)
 
-    def get_stats(self, update_usage_num: bool):
-        stats = StatsProcessor()
-        file_exists, data = stats.get_stats()
-        if not file_exists:
-            created = stats.create_new_stats_file()
-            data = {}
-            if not created:
+    def get_stats(self, update_usage_num: bool, state=None):
+        own_state = state is None
+        if own_state:
+            from .utils.state import TelemetryState
+
+            state = TelemetryState()
+            if not state.load():
                 return None
-        if "usage_count" in data:
-            usage_count = data["usage_count"]
-            if usage_count is None or not isinstance(usage_count, int) or usage_count <= 0:
-                log.warning("Invalid usage count.")
-                return data
-            if usage_count < sys.maxsize and update_usage_num:
-                usage_count += 1
-        else:
-            usage_count = 1
-        data["usage_count"] = usage_count
-        stats.update_stats(data)
+        # the statistics are written together with the state, the usage count is incremented additively
+        _, data = state.get_stats()
+        usage_count = data.get("usage_count", 0)
+        data = self._update_usage_count(data, update_usage_num)
+        if isinstance(usage_count, int) and usage_count >= 0:
+            state.add_usage_count(data["usage_count"] - usage_count)
+        if own_state and not state.save():
+            return None
+        data = dict(data)
+        usage_count = data["usage_count"]
+        if not isinstance(usage_count, int) or usage_count <= 0:
+            return data
         if usage_count == 1:
             data["usage_group"] = "first_usage"
         elif usage_count <= 100:
@@ -323,6 +723,23 @@ class Telemetry(metaclass=SingletonMetaClass):
 
         return data
 
+    @staticmethod
+    def _update_usage_count(data: dict, update_usage_num: bool):
+        """
+        Returns the statistics with the incremented usage count.
+        """
+        if "usage_count" in data:
+            usage_count = data["usage_count"]
+            if usage_count is None or not isinstance(usage_count, int) or usage_count <= 0:
+                log.warning("Invalid usage count.")
+                return data
+            if usage_count < sys.maxsize and update_usage_num:
+                usage_count += 1
+        else:
+            usage_count = 1
+        data["usage_count"] = usage_count
+        return data
+
     @staticmethod
     def opt_in(tid: str):
         """
@@ -1,9 +1,15 @@
 # Copyright (C) 2018-2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
+import json
 import os
+import subprocess  # nosec
+import sys
+import threading
 import unittest
 import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from platform import system
 from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock, call, patch
@@ -19,6 +25,116 @@ def save_to_file(file_name: str, cid: str):
         file.write(cid)
 
 
+class LazyImportTest(unittest.TestCase):
+    def test_import_does_not_load_backends(self):
+        """
+        Checks that importing the package does not import the backends and the modules needed only to send the data.
+        """
+        package = Telemetry.__module__.rsplit('.', 1)[0]
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        deferred_modules = ['backend.backend_ga', 'backend.backend_ga4', 'utils.sender', 'utils.http_pool',
+                            'utils.sender_process']
+        script = "import sys; import {0}; print(','.join(m for m in sys.modules if m.startswith('{0}.')))"
+        result = subprocess.run([sys.executable, '-c', script.format(package)], cwd=package_dir,  # nosec
+                                capture_output=True, text=True, check=True)
+        imported = result.stdout.strip().split(',')
+        for name in deferred_modules:
+            self.assertNotIn('{}.{}'.format(package, name), imported)
+        self.assertIn('{}.main'.format(package), imported)
+
+
+fork_script = """
+import os, sys, time
+from {package} import Telemetry
+tm = Telemetry('app', '1.0', 'tid', backend='file', enable_opt_in_dialog=False, backend_url={events_dir!r},
+               fork_session_category='fork')
+tm.send_event('parent', 'before_fork', 'a')
+pid = os.fork()
+if pid == 0:
+    tm.send_event('child', 'after_fork', 'b')
+    tm.flush(5)
+    os._exit(0 if tm.sender.delivered == 2 else 1)
+deadline = time.monotonic() + 30
+while True:
+    finished, status = os.waitpid(pid, os.WNOHANG)
+    if finished:
+        break
+    if time.monotonic() > deadline:
+        os.kill(pid, 9)
+        sys.exit(2)
+    time.sleep(0.05)
+tm.flush(5)
+sys.exit(os.waitstatus_to_exitcode(status))
+"""
+
+
+ga4_fork_session_script = """
+from {package} import Telemetry
+tm = Telemetry('app', '1.0', 'tid', backend='ga4', enable_opt_in_dialog=False, backend_url={url!r},
+               fork_session_category='fork')
+tm.send_event('parent', 'send', 'a')
+tm.flush(10)
+stats = tm.get_internal_stats()
+print(stats['delivered'], stats['failed'], stats['sender_process']['timeouts'])
+"""
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'fork() is not available')
+class ForkTest(unittest.TestCase):
+    def test_fork_session(self):
+        """
+        Checks that the child process forked after a message is sent starts the session with its first message
+        without deadlocks. The child hanging for 30 seconds is killed and fails the test.
+        """
+        package = Telemetry.__module__.rsplit('.', 1)[0]
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with TemporaryDirectory() as home:
+            events_dir = os.path.join(home, "events")
+            env = dict(os.environ, HOME=home, LOCALAPPDATA=home)
+            result = subprocess.run([sys.executable, '-c', fork_script.format(package=package, events_dir=events_dir)],
+                                    cwd=package_dir, env=env, timeout=60)  # nosec
+            self.assertEqual(result.returncode, 0)
+            with open(os.path.join(events_dir, "openvino_telemetry_events.jsonl"), 'r') as file:
+                lines = [(line["category"], line["action"], line["label"]) for line in map(json.loads, file)]
+            self.assertEqual(sorted(lines), [("child", "after_fork", "b"), ("fork", "session", "start"),
+                                             ("parent", "before_fork", "a")])
+
+    @unittest.skipIf(system() == 'Windows', "Helper process is not used on Windows")
+    def test_ga4_send_with_fork_session(self):
+        """
+        Checks that the helper process started with fork to send the GA4 request does not run the at-fork handler of
+        the telemetry and the request is delivered.
+        """
+        package = Telemetry.__module__.rsplit('.', 1)[0]
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CollectorHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = 'http://127.0.0.1:{}/mp/collect'.format(server.server_address[1])
+        try:
+            with TemporaryDirectory() as home:
+                env = dict(os.environ, HOME=home, LOCALAPPDATA=home)
+                script = ga4_fork_session_script.format(package=package, url=url)
+                result = subprocess.run([sys.executable, '-c', script], cwd=package_dir, env=env,  # nosec
+                                        capture_output=True, text=True, timeout=60)
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ['1', '0', '0'])
+
+
 class TelemetryTest(unittest.TestCase):
     data = [
         ('demo.py', False),
@@ -185,6 +301,225 @@ class GeneralTelemetryTest(unittest.TestCase):
                 GA4Backend.send.assert_has_calls([])
                 GA4Backend.send.reset_mock()
 
+    def test_consent_revoked_by_opt_out(self):
+        from .backend.backend_ga4 import GA4Backend
+
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                GA4Backend.send = MagicMock()
+                save_to_file(os.path.join(test_subdir, self.backend.cid_filename), str(uuid.uuid4()))
+                save_to_file(OptInChecker().consent_file(), "1")
+
+                tm = Telemetry()
+                tm.init("app", "version", "tid", backend='ga4', consent_check_interval=0)
+                tm.send_event("a", "b", "c", 3)
+                tm.flush()
+                self.assertEqual(GA4Backend.send.call_count, 1)
+
+                # opt-out from another process
+                save_to_file(OptInChecker().consent_file(), "0")
+                tm.send_event("a", "b", "c", 3)
+                tm.flush()
+                self.assertFalse(tm.consent)
+                self.assertEqual(GA4Backend.send.call_count, 1)
+                GA4Backend.send.reset_mock()
+
+    def test_async_events_are_aggregated(self):
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                save_to_file(OptInChecker().consent_file(), "1")
+                events_dir = os.path.join(test_dir, "events")
+
+                tm = Telemetry()
+                tm.init("app", "version", "tid", backend='file', backend_url=events_dir, enable_opt_in_dialog=False,
+                        aggregate_events=True)
+
+                async def send_events():
+                    for _ in range(2):
+                        await tm.send_event_async("a", "b", "c", 2)
+
+                asyncio.run(send_events())
+                tm.send_event("a", "b", "c", 1)
+                tm.flush(10)
+                # the events sent from the event loop and from the threads are summed up in the same way
+                with open(tm.backend.events_file(), 'r') as file:
+                    lines = [json.loads(line) for line in file]
+                self.assertEqual([(line["label"], line["value"]) for line in lines], [("c", 5)])
+
+    def test_replay_counts_dropped_messages(self):
+        from .utils.spool import EventSpool
+
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                save_to_file(OptInChecker().consent_file(), "1")
+                events_dir = os.path.join(test_dir, "events")
+
+                tm = Telemetry()
+                tm.init("app", "version", "tid", backend='file', backend_url=events_dir, enable_opt_in_dialog=False)
+                spool = EventSpool()
+                message = tm.backend.build_event_message("a", "b", "c")
+                # the damaged line and the record without the time can not be replayed
+                spool.append([{"ts": 1.0, "backend": "file", "data": message}, {"backend": "file", "data": {}}])
+                with open(spool.spool_file(), 'ab') as file:
+                    file.write(b'{"ts": 2.0, "back\n')
+
+                self.assertEqual(tm.replay_spool(spool), 2)
+                self.assertEqual(tm.get_internal_stats()["replay_dropped"], 2)
+                tm.flush(10)
+                with open(tm.backend.events_file(), 'r') as file:
+                    self.assertEqual([json.loads(line)["label"] for line in file], ["c"])
+
+    def test_opt_out_removes_local_data(self):
+        from .backend.backend_ga4 import GA4Backend
+
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                save_to_file(OptInChecker().consent_file(), "1")
+
+                with patch.object(GA4Backend, 'send', return_value=True):
+                    tm = Telemetry()
+                    tm.init("app", "version", "tid", backend=['ga4', 'file'], enable_opt_in_dialog=False)
+                    file_backend = tm.backends[1]
+                    tm.send_event("a", "b", "written")
+                    tm.flush(10)
+                    tm.send_event("a", "b", "buffered")
+                    tm.sender.flush(10)
+                    events_dir = file_backend.events_directory()
+                    self.assertTrue(os.path.exists(file_backend.events_file()))
+                    self.assertEqual(file_backend.buffered_count(), 1)
+                    # the client ID of the backend which is not used by the process is removed too
+                    BackendRegistry.get_backend('otlp')("tid", "app", "version").generate_new_cid_file()
+                    otlp_cid_file = os.path.join(test_subdir, BackendRegistry.get_backend('otlp').cid_filename)
+                    self.assertTrue(os.path.exists(otlp_cid_file))
+
+                    save_to_file(os.path.join(test_subdir, "stats.lock"), "")
+                    self.assertTrue(os.path.exists(os.path.join(test_subdir, "openvino_telemetry_state.lock")))
+
+                    Telemetry.opt_out("tid")
+
+                # the client IDs, the written and the buffered messages of all backends are removed
+                for backend_id in ['ga', 'ga4', 'file', 'otlp']:
+                    cid_file = os.path.join(test_subdir, BackendRegistry.get_backend(backend_id).cid_filename)
+                    self.assertFalse(os.path.exists(cid_file), cid_file)
+                self.assertFalse(os.path.exists(events_dir))
+                # the state, the legacy statistics and their lock files are removed too
+                self.assertEqual(sorted(os.listdir(test_subdir)), ["openvino_telemetry"])
+                self.assertEqual(file_backend.buffered_count(), 0)
+                self.assertTrue(file_backend.flush())
+                self.assertFalse(os.path.exists(events_dir))
+
+    def test_deferred_stats_write(self):
+        from .backend.backend_ga4 import GA4Backend
+        from .utils.state import TelemetryState
+
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                GA4Backend.send = MagicMock()
+                save_to_file(os.path.join(test_subdir, self.backend.cid_filename), str(uuid.uuid4()))
+                save_to_file(OptInChecker().consent_file(), "1")
+                state_file = TelemetryState().state_file()
+
+                tm = Telemetry()
+                tm.init("app", "version", "tid", backend='ga4', increment_stats=True, defer_stats_write=True)
+                self.assertFalse(os.path.exists(state_file))
+                self.assertEqual(tm.backend.stats["usage_count"], 1)
+                tm.flush()
+                self.assertTrue(os.path.exists(state_file))
+
+                tm.init("app", "version", "tid", backend='ga4', increment_stats=True, defer_stats_write=True)
+                self.assertEqual(tm.backend.stats["usage_count"], 2)
+                tm.flush()
+                state = TelemetryState()
+                state.load()
+                self.assertEqual(state.get_stats(), (True, {"usage_count": 2}))
+
+                # the deferred state is not written after opt-out
+                tm.init("app", "version", "tid", backend='ga4', increment_stats=True, defer_stats_write=True,
+                        consent_check_interval=0)
+                save_to_file(OptInChecker().consent_file(), "0")
+                os.remove(state_file)
+                tm.save_state()
+                self.assertFalse(os.path.exists(state_file))
+                GA4Backend.send.reset_mock()
+
+    def test_multiple_backends(self):
+        from .backend.backend_ga4 import GA4Backend
+
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                save_to_file(OptInChecker().consent_file(), "1")
+                events_dir = os.path.join(test_dir, "events")
+
+                with patch.object(GA4Backend, 'send') as send:
+                    tm = Telemetry()
+                    tm.init("app", "version", "tid", backend=['ga4', 'ga4', 'file'],
+                            backend_url={'file': events_dir})
+                    self.assertEqual([backend.id for backend in tm.backends], ['ga4', 'ga4', 'file'])
+                    # the single endpoint is ambiguous for several backends
+                    with self.assertRaises(ValueError):
+                        Telemetry().init("app", "version", "tid", backend=['ga4', 'file'], backend_url=events_dir)
+                    self.assertEqual([backend.id for backend in tm.backends], ['ga4', 'ga4', 'file'])
+                    self.assertTrue(all(backend.cid_file_initialized() for backend in tm.backends))
+
+                    tm.send_event("a", "b", "c", 3)
+                    tm.flush(10)
+                    # the message of the same format is built once
+                    self.assertEqual(send.call_count, 2)
+                    self.assertIs(send.call_args_list[0][0][0], send.call_args_list[1][0][0])
+                    self.assertEqual(send.call_args_list[0][0][0]["events"][0]["params"]["event_label"], "c")
+
+                    stats = tm.get_internal_stats()
+                    self.assertEqual((stats["queued"], stats["delivered"], stats["queue_size"]), (3, 3, 0))
+                    self.assertEqual(stats["send_latency"]["count"], 3)
+                    self.assertIn("timeouts", stats["sender_process"])
+
+                file_backend = tm.backends[2]
+                self.assertEqual(file_backend.directory, events_dir)
+                with open(file_backend.events_file(), 'r') as file:
+                    self.assertEqual(json.loads(file.readline())["label"], "c")
+
+    def test_timer(self):
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            with TemporaryDirectory(prefix=test_dir + os.sep) as test_subdir:
+
+                self.init_backend(test_dir, test_subdir)
+                save_to_file(OptInChecker().consent_file(), "1")
+                events_dir = os.path.join(test_dir, "events")
+
+                tm = Telemetry()
+                # the summaries are not sampled
+                tm.init("app", "version", "tid", backend='file', backend_url=events_dir, sample_rates={'*': 0})
+
+                @tm.timer("model", "convert")
+                def convert():
+                    pass
+
+                for _ in range(2):
+                    convert()
+                with tm.timer("model", "convert"):
+                    pass
+                tm.flush(10)
+
+                # one summary is sent instead of the event per measurement
+                with open(tm.backend.events_file(), 'r') as file:
+                    lines = [json.loads(line) for line in file]
+                self.assertEqual(len(lines), 1)
+                self.assertEqual((lines[0]["category"], lines[0]["action"], lines[0]["value"]),
+                                 ("model", "convert", 3))
+                self.assertTrue(lines[0]["label"].startswith("count=3,min_ms="))
+
     def test_opt_out_with_no_consent_file(self):
         from .backend.backend_ga4 import GA4Backend
 
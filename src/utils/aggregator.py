@@ -0,0 +1,79 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+import weakref
+
+
+class EventAggregator:
+    """
+    Sums values of the events with the same category, action and label in memory and emits one event per key
+    when the flush window expires, when the number of keys reaches max_keys or when flush() is called.
+
+    :param emit: the function called as emit(category, action, label, value, app_name, app_version) for every
+    aggregated event.
+    :param window: the flush window in seconds.
+    :param max_keys: the maximum number of keys aggregated at once.
+    """
+    def __init__(self, emit: callable, window: float = 60.0, max_keys: int = 1000):
+        self.emit = emit
+        self.window = window
+        self.max_keys = max_keys
+        self._values = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        _aggregators.add(self)
+
+    def _reset_after_fork(self):
+        """
+        Makes the aggregator usable in the child process. The aggregated values are dropped, because they are emitted
+        by the parent process, and the timer thread is not copied by fork.
+        """
+        self._values = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, category: str, action: str, label: str, value: int = 1, app_name=None, app_version=None):
+        """
+        Adds the value to the aggregated event.
+        :return: None
+        """
+        key = (category, action, label, app_name, app_version)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+            if len(self._values) < self.max_keys:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """
+        Emits the aggregated events and starts a new flush window.
+        :return: the number of emitted events
+        """
+        with self._lock:
+            values = self._values
+            self._values = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for (category, action, label, app_name, app_version), value in values.items():
+            self.emit(category, action, label, value, app_name, app_version)
+        return len(values)
+
+
+# the aggregators existing in the process, they are reset in the child process after fork
+_aggregators = weakref.WeakSet()
+
+
+def _reset_aggregators_after_fork():
+    for aggregator in list(_aggregators):
+        aggregator._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_aggregators_after_fork)
@@ -0,0 +1,52 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import unittest
+
+from .aggregator import EventAggregator
+
+
+class EventAggregatorTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+
+    def emit(self, *args):
+        self.events.append(args)
+
+    def test_values_are_summed(self):
+        """
+        Checks that events with the same key are emitted once with the sum of the values.
+        """
+        aggregator = EventAggregator(self.emit, window=100)
+        for _ in range(1000):
+            aggregator.add("mo", "convert", "layer")
+        aggregator.add("mo", "convert", "layer", 5)
+        aggregator.add("mo", "convert", "model", 2)
+        self.assertEqual(self.events, [])
+        self.assertEqual(aggregator.flush(), 2)
+        self.assertEqual(sorted(self.events), [("mo", "convert", "layer", 1005, None, None),
+                                               ("mo", "convert", "model", 2, None, None)])
+        self.assertEqual(aggregator.flush(), 0)
+
+    def test_window_expiration(self):
+        """
+        Checks that aggregated events are emitted when the flush window expires.
+        """
+        aggregator = EventAggregator(self.emit, window=0.1)
+        aggregator.add("mo", "convert", "layer", 3)
+        start_time = time.time()
+        while not self.events and time.time() - start_time < 5:
+            time.sleep(0.01)
+        self.assertEqual(self.events, [("mo", "convert", "layer", 3, None, None)])
+
+    def test_max_keys(self):
+        """
+        Checks that aggregated events are emitted when the number of keys reaches the limit.
+        """
+        aggregator = EventAggregator(self.emit, window=100, max_keys=10)
+        for i in range(25):
+            aggregator.add("mo", "convert", str(i))
+        self.assertEqual(len(self.events), 20)
+        aggregator.flush()
+        self.assertEqual(len(self.events), 25)
@@ -0,0 +1,194 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import ssl
+import time
+from collections import namedtuple
+from urllib import parse
+
+from .http_pool import default_headers, send_request, uses_proxy
+
+AsyncResponse = namedtuple('AsyncResponse', ['status', 'headers'])
+
+
+class AsyncConnectionPool:
+    """
+    The pool of persistent HTTP connections driven by the asyncio event loop. The requests are sent with non-blocking
+    sockets, so many requests can be in flight without threads or child processes. No more than
+    max_connections_per_host connections to the host are opened at once, other requests wait for a free connection.
+    The pool is bound to the event loop it is used from the first time, the connections are dropped when the pool is
+    used from another event loop.
+
+    :param max_connections_per_host: the maximum number of connections to every host.
+    :param idle_timeout: the time in seconds after which the idle connection is closed.
+    """
+    def __init__(self, max_connections_per_host: int = 4, idle_timeout: float = 30.0):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._semaphores = {}
+        self._loop = None
+        self._ssl_context = None
+
+    def _check_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # the connections of another event loop can't be used or closed from this one
+            self._idle = {}
+            self._semaphores = {}
+            self._loop = loop
+
+    def _get_idle_connection(self, key: tuple):
+        now = time.monotonic()
+        connections = self._idle.get(key, [])
+        while connections:
+            reader, writer, last_used = connections.pop()
+            if now - last_used < self.idle_timeout and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    def _release_connection(self, key: tuple, reader, writer):
+        connections = self._idle.setdefault(key, [])
+        if len(connections) < self.max_connections_per_host:
+            connections.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    async def _open_connection(self, scheme: str, host: str, port: int):
+        ssl_context = None
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        if port is None:
+            port = 443 if scheme == 'https' else 80
+        return await asyncio.open_connection(host, port, ssl=ssl_context)
+
+    @staticmethod
+    async def _read_response(reader):
+        """
+        Reads the response and its body.
+        :return: the tuple of the response and the flag showing that the connection should be closed
+        """
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the server')
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        will_close = connection == 'close' or (version == 'HTTP/1.0' and connection != 'keep-alive')
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await reader.readexactly(int(headers['content-length']))
+        else:
+            await reader.read()
+            will_close = True
+        return AsyncResponse(int(status), headers), will_close
+
+    async def request(self, url: str, data: bytes, headers: dict = None, timeout: float = None):
+        """
+        Sends POST request using the persistent connection to the host.
+        :param url: the url to send the request to
+        :param data: the body of the request
+        :param headers: the headers of the request
+        :param timeout: the deadline of the whole request in seconds
+        :return: AsyncResponse object
+        """
+        return await asyncio.wait_for(self._request(url, data, headers or {}), timeout)
+
+    async def _request(self, url: str, data: bytes, headers: dict):
+        self._check_loop()
+        parsed_url = parse.urlsplit(url)
+        scheme = parsed_url.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError('Unsupported url scheme: {}'.format(scheme))
+        key = (scheme, parsed_url.hostname, parsed_url.port)
+        path = parsed_url.path or '/'
+        if parsed_url.query:
+            path += '?' + parsed_url.query
+        host = parsed_url.hostname if parsed_url.port is None else '{}:{}'.format(parsed_url.hostname, parsed_url.port)
+        head = 'POST {} HTTP/1.1\r\nHost: {}\r\nContent-Length: {}\r\n'.format(path, host, len(data))
+        head += ''.join('{}: {}\r\n'.format(name, value) for name, value in headers.items())
+        request_data = head.encode('latin-1') + b'\r\n' + data
+
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.max_connections_per_host)
+        async with semaphore:
+            return await self._send(key, scheme, parsed_url, request_data)
+
+    async def _send(self, key: tuple, scheme: str, parsed_url, request_data: bytes):
+        connection = self._get_idle_connection(key)
+        reused = connection is not None
+        while True:
+            if connection is None:
+                connection = await self._open_connection(scheme, parsed_url.hostname, parsed_url.port)
+            reader, writer = connection
+            try:
+                writer.write(request_data)
+                await writer.drain()
+                response, will_close = await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+                # the server closed the idle connection, repeat the request using a new one
+                connection = None
+                reused = False
+                continue
+            except BaseException:
+                # the connection state is unknown if the request failed or was cancelled by the deadline
+                writer.close()
+                raise
+            break
+
+        if will_close:
+            writer.close()
+        else:
+            self._release_connection(key, reader, writer)
+        return response
+
+    def close(self):
+        """
+        Closes all idle connections.
+        :return: None
+        """
+        idle = self._idle
+        self._idle = {}
+        for connections in idle.values():
+            for _, writer, _ in connections:
+                writer.close()
+
+
+async def send_request_async(pool: AsyncConnectionPool, url: str, data: bytes, timeout: float = None):
+    """
+    Sends POST request with the data to the url using the connection pool. If the proxy is configured for the url the
+    request is sent with urllib from the default executor of the event loop.
+    :param pool: the connection pool to send the request with
+    :param url: the url to send the request to
+    :param data: the body of the request
+    :param timeout: the deadline of the request in seconds
+    :return: True if the request is sent successfully, otherwise False
+    """
+    try:
+        if uses_proxy(url):
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(None, send_request, url, data, timeout), timeout)
+        response = await pool.request(url, data, default_headers, timeout)
+    except Exception as err:
+        return False
+    return 200 <= response.status < 300
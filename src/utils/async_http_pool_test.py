@@ -0,0 +1,81 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .async_http_pool import AsyncConnectionPool, send_request_async
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path == '/hang':
+            time.sleep(3)
+        elif self.path == '/slow':
+            time.sleep(0.5)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AsyncConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_connection_is_reused(self):
+        """
+        Checks that sequential requests to the same host use one connection.
+        """
+        pool = AsyncConnectionPool()
+        for _ in range(10):
+            response = await pool.request(self.url + '/collect', b'data', timeout=3.0)
+            self.assertEqual(response.status, 200)
+        pool.close()
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_deadline(self):
+        """
+        Checks that the hanging request is interrupted after the deadline.
+        """
+        pool = AsyncConnectionPool()
+        start_time = time.time()
+        self.assertFalse(await send_request_async(pool, self.url + '/hang', b'data', 0.3))
+        self.assertTrue(time.time() - start_time < 2)
+        self.assertTrue(await send_request_async(pool, self.url + '/collect', b'data', 3.0))
+        pool.close()
+
+    async def test_concurrent_requests(self):
+        """
+        Checks that requests are in flight concurrently.
+        """
+        pool = AsyncConnectionPool()
+        start_time = time.time()
+        results = await asyncio.gather(*[send_request_async(pool, self.url + '/slow', b'data', 3.0)
+                                         for _ in range(10)])
+        self.assertTrue(all(results))
+        self.assertTrue(time.time() - start_time < 2.5)
+        pool.close()
@@ -0,0 +1,98 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from time import time
+
+from .async_http_pool import AsyncConnectionPool
+from .sender import MAX_QUEUE_SIZE, FlushResult
+from ..backend.backend import TelemetryBackend
+from ..utils.message import Message
+
+
+class AsyncTelemetrySender:
+    """
+    Sends messages to the backends as tasks of the running asyncio event loop.
+
+    :param spool: the EventSpool object storing undelivered messages.
+    """
+    def __init__(self, spool=None):
+        self.pool = AsyncConnectionPool()
+        self.spool = spool
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        self._tasks = set()
+
+    @property
+    def queue_size(self):
+        return len(self._tasks)
+
+    def send(self, backend: TelemetryBackend, message: Message):
+        """
+        Schedules sending of the message in the running event loop.
+        :param backend: the backend to send the message with
+        :param message: the message to send
+        :return: None
+        """
+        if len(self._tasks) >= MAX_QUEUE_SIZE:
+            self.dropped += 1
+            self._spool(backend, message, time())
+            return  # dropping a message because the queue is full
+        task = asyncio.get_running_loop().create_task(self._send(backend, message, time()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, backend: TelemetryBackend, message: Message, timestamp: float):
+        try:
+            delivered = await backend.send_async(message, self.pool)
+        except asyncio.CancelledError:
+            self.failed += 1
+            self._spool(backend, message, timestamp)
+            raise
+        except Exception as err:
+            delivered = False
+        if delivered is False:
+            self.failed += 1
+            self._spool(backend, message, timestamp)
+        else:
+            self.delivered += 1
+
+    def _spool(self, backend: TelemetryBackend, message: Message, timestamp: float):
+        if self.spool is None:
+            return
+        try:
+            # the spool's thread writes the records, so the event loop does not wait for the file I/O
+            self.spool.append_later([{"ts": timestamp, "backend": backend.id,
+                                      "data": backend.serialize_message(message)}])
+        except Exception as err:
+            pass  # nosec
+
+    async def flush(self, timeout: float = None):
+        """
+        Waits until all scheduled messages are sent or the timeout is expired.
+        :param timeout: the maximum time to wait in seconds
+        :return: FlushResult with the numbers of messages delivered and abandoned while waiting and the number of
+        messages which are still pending
+        """
+        delivered, abandoned = self.delivered, self.failed + self.dropped
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+        return FlushResult(self.delivered - delivered, len(self._tasks), self.failed + self.dropped - abandoned)
+
+    async def close(self, timeout: float = 1.0):
+        """
+        Waits for the scheduled messages for at most timeout seconds, cancels the messages which are not sent and
+        closes the connections.
+        :param timeout: the maximum time to wait in seconds
+        :return: None
+        """
+        await self.flush(timeout)
+        tasks = set(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        if self.spool is not None:
+            self.spool.flush()
+        self.pool.close()
@@ -0,0 +1,80 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import unittest
+
+from .async_sender import AsyncTelemetrySender
+
+
+class FakeAsyncTelemetryBackend:
+    id = 'fake'
+
+    def __init__(self, delay=0.0, result=True):
+        self.delay = delay
+        self.result = result
+        self.sent = []
+        self.threads = set()
+
+    async def send_async(self, message, pool):
+        self.threads.add(threading.get_ident())
+        await asyncio.sleep(self.delay)
+        self.sent.append(message)
+        return self.result
+
+    def serialize_message(self, message):
+        return message
+
+
+class FakeSpool:
+    def __init__(self):
+        self.records = []
+
+    def append(self, records):
+        self.records.extend(records)
+
+    def append_later(self, records):
+        self.records.extend(records)
+
+    def flush(self):
+        return True
+
+
+class AsyncTelemetrySenderTest(unittest.IsolatedAsyncioTestCase):
+    async def test_flush(self):
+        """
+        Checks that flush waits for all messages sent in the event loop thread.
+        """
+        tm = AsyncTelemetrySender()
+        fake_backend = FakeAsyncTelemetryBackend(delay=0.1)
+        for i in range(100):
+            tm.send(fake_backend, i)
+        self.assertEqual(await tm.flush(3.0), (100, 0, 0))
+        self.assertEqual(sorted(fake_backend.sent), list(range(100)))
+        self.assertEqual(fake_backend.threads, {threading.get_ident()})
+        await tm.close()
+
+    async def test_close_cancels_pending(self):
+        """
+        Checks that close cancels messages which are not sent in time and stores them to the spool.
+        """
+        spool = FakeSpool()
+        tm = AsyncTelemetrySender(spool=spool)
+        fake_backend = FakeAsyncTelemetryBackend(delay=10)
+        for i in range(5):
+            tm.send(fake_backend, i)
+        self.assertEqual(await tm.flush(0.1), (0, 5, 0))
+        await tm.close(0.1)
+        self.assertEqual(tm.queue_size, 0)
+        self.assertEqual(sorted(record["data"] for record in spool.records), list(range(5)))
+
+    async def test_failed_messages_are_spooled(self):
+        """
+        Checks that undelivered messages are stored to the spool.
+        """
+        spool = FakeSpool()
+        tm = AsyncTelemetrySender(spool=spool)
+        tm.send(FakeAsyncTelemetryBackend(result=False), 1)
+        await tm.flush(1.0)
+        self.assertEqual([record["data"] for record in spool.records], [1])
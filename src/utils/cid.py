@@ -39,15 +39,29 @@ def get_cid(file_name: str, validator: [callable, None]):
     return cid
 
 
-def get_or_generate_cid(file_name: str, generator: callable, validator: [callable, None], old_name=None):
+def get_or_generate_cid(file_name: str, generator: callable, validator: [callable, None], old_name=None,
+                        state=None):
     """
     Get existing Client ID or generate a new one.
     :param file_name: name of the file with the client ID
     :param generator: the function to generate the client ID
     :param validator: the function to validate the client ID
     :param old_name: legacy name of the file with the client ID
+    :param state: the TelemetryState object, the client ID is taken from the state if it is stored there,
+    otherwise it is taken from the file or generated and stored to the state
     :return: existing or a new client ID file
     """
+    if state is not None:
+        cid = state.get_cid(file_name)
+        if cid is not None and (validator is None or validator(cid)):
+            return cid
+    cid = _get_or_generate_cid_file(file_name, generator, validator, old_name)
+    if state is not None:
+        state.set_cid(file_name, cid)
+    return cid
+
+
+def _get_or_generate_cid_file(file_name: str, generator: callable, validator: [callable, None], old_name=None):
     cid = get_cid(file_name, validator)
     if cid is not None:
         return cid
@@ -0,0 +1,60 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+from collections import namedtuple
+from platform import system
+
+Environment = namedtuple('Environment', ['os', 'docker'])
+
+
+def is_docker():
+    def file_has_text(text, filename):
+        try:
+            with open(filename, encoding='utf-8') as lines:
+                for line in lines:
+                    if text in line:
+                        return True
+            return False
+        except:
+            return False
+
+    return os.path.exists('/.dockerenv') or \
+           file_has_text('docker', '/proc/self/cgroup') or \
+           file_has_text('docker', '/proc/self/mountinfo')
+
+
+_environment = None
+_environment_lock = threading.Lock()
+
+
+def get_environment():
+    """
+    Returns the snapshot of the environment the process runs in. The snapshot is computed on the first call and
+    reused afterwards, so the callers don't need to access the file system.
+    :return: Environment tuple
+    """
+    global _environment
+    environment = _environment
+    if environment is None:
+        with _environment_lock:
+            if _environment is None:
+                _environment = Environment(os=system(), docker=is_docker())
+            environment = _environment
+    return environment
+
+
+def reset_environment():
+    """
+    Drops the environment snapshot, so it is computed again on the next get_environment() call.
+    :return: None
+    """
+    global _environment, _environment_lock
+    _environment = None
+    # the lock may be held by another thread of the parent process at the moment of fork
+    _environment_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_environment)
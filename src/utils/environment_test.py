@@ -0,0 +1,51 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import unittest
+from platform import system
+from unittest.mock import patch
+
+from . import environment
+from .environment import get_environment, reset_environment
+
+
+class EnvironmentTest(unittest.TestCase):
+    def tearDown(self):
+        reset_environment()
+
+    def test_environment_is_computed_once(self):
+        """
+        Checks that the file system is accessed only on the first request of the environment.
+        """
+        reset_environment()
+        with patch.object(environment, 'is_docker', return_value=True) as is_docker_mock:
+            for _ in range(10):
+                env = get_environment()
+            self.assertEqual(is_docker_mock.call_count, 1)
+        self.assertTrue(env.docker)
+        self.assertEqual(env.os, system())
+
+    def test_reset_environment(self):
+        """
+        Checks that the environment is computed again after reset.
+        """
+        with patch.object(environment, 'is_docker', return_value=True):
+            reset_environment()
+            self.assertTrue(get_environment().docker)
+        with patch.object(environment, 'is_docker', return_value=False):
+            self.assertTrue(get_environment().docker)
+            reset_environment()
+            self.assertFalse(get_environment().docker)
+
+    @unittest.skipIf(not hasattr(os, 'fork'), "fork() is not available")
+    def test_environment_is_reset_after_fork(self):
+        """
+        Checks that the forked child process does not reuse the parent's snapshot.
+        """
+        get_environment()
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if environment._environment is None else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
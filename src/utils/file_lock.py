@@ -0,0 +1,96 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import time
+from platform import system
+
+
+class FileLock:
+    """
+    Advisory lock shared between processes, which is held on the separate lock file, so the locked data file can be
+    replaced with rename while the lock is held. If the file system does not support locking, the lock is treated as
+    acquired.
+
+    with FileLock(stats_file + ".lock") as locked:
+        if locked:
+            ...
+
+    :param lock_file: the path to the lock file, the file is created if it does not exist.
+    :param timeout: the maximum time in seconds to wait for the lock.
+    """
+    poll_interval = 0.005
+
+    def __init__(self, lock_file: str, timeout: float = 5.0):
+        self.lock_file = lock_file
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        """
+        Waits for the lock for at most timeout seconds.
+        :return: True if the lock is acquired, otherwise False
+        """
+        try:
+            self._fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return False
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if _try_lock(self._fd):
+                    return True
+            except OSError:
+                # locking is not supported by the file system
+                return True
+            if time.monotonic() >= deadline:
+                self.release()
+                return False
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        """
+        Releases the lock.
+        :return: None
+        """
+        if self._fd is None:
+            return
+        try:
+            _unlock(self._fd)
+        except OSError:
+            pass  # nosec
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+if system() == 'Windows':
+    import msvcrt
+
+    def _try_lock(fd: int):
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd: int):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
@@ -0,0 +1,113 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+
+
+class Histogram:
+    """
+    The histogram of non-negative values with the log-linear buckets. The range from min_value to max_value is split
+    into powers of two and every power of two is split into sub_buckets linear buckets, so the memory is bounded by
+    the number of buckets and the relative error of the quantiles is at most 1 / sub_buckets. The values below
+    min_value and above max_value are counted in the first and the last bucket. The histogram is not thread-safe.
+
+    :param min_value: the lower bound of the second bucket
+    :param max_value: the upper bound of the tracked values
+    :param sub_buckets: the number of buckets per power of two
+    """
+    def __init__(self, min_value: float = 1e-6, max_value: float = 3600.0, sub_buckets: int = 8):
+        self.min_value = min_value
+        self.sub_buckets = sub_buckets
+        # the index of the last bucket of the power of two containing max_value
+        self.max_index = math.frexp(max_value / min_value)[1] * sub_buckets
+        self.reset()
+
+    def reset(self):
+        # the counts of the non-empty buckets by their indices
+        self.buckets = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def bucket_index(self, value: float):
+        """
+        Returns the index of the bucket the value belongs to.
+        """
+        if value < self.min_value:
+            return 0
+        mantissa, exponent = math.frexp(value / self.min_value)
+        # value / min_value = mantissa * 2 ** exponent, where 0.5 <= mantissa < 1
+        index = 1 + (exponent - 1) * self.sub_buckets + int((mantissa * 2 - 1) * self.sub_buckets)
+        return min(index, self.max_index)
+
+    def bucket_bounds(self, index: int):
+        """
+        Returns the lower and the upper bound of the bucket with the given index.
+        """
+        if index == 0:
+            return 0.0, self.min_value
+        exponent, sub_bucket = divmod(index - 1, self.sub_buckets)
+        lower = self.min_value * 2 ** exponent
+        step = lower / self.sub_buckets
+        return lower + sub_bucket * step, lower + (sub_bucket + 1) * step
+
+    def record(self, value: float, count: int = 1):
+        """
+        Adds the value to the histogram.
+        :param value: the value to add, the negative values are counted as 0
+        :param count: the number of times the value is added
+        :return: None
+        """
+        value = max(0.0, value)
+        index = self.bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram'):
+        """
+        Adds the values of the other histogram with the same buckets to this histogram.
+        """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q: float):
+        """
+        Returns the estimate of the quantile, the middle of the bucket containing it limited by the minimum and the
+        maximum of the values. The quantile in the last bucket, which is not bounded, is estimated by the maximum.
+        :param q: the quantile from 0 to 1
+        :return: the estimate or None if the histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                if index == self.max_index:
+                    return self.max
+                lower, upper = self.bucket_bounds(index)
+                return min(max((lower + upper) / 2, self.min), self.max)
+        return self.max
+
+    def summary(self, quantiles: tuple = (0.5, 0.9, 0.99)):
+        """
+        Returns the dictionary with the count, the sum, the minimum, the maximum and the quantiles of the values, the
+        quantiles are named as p50, p90, p99.
+        """
+        result = {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max}
+        for q in quantiles:
+            result["p{:g}".format(q * 100)] = self.quantile(q)
+        return result
@@ -0,0 +1,49 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+import unittest
+
+from .histogram import Histogram
+
+
+class HistogramTest(unittest.TestCase):
+    def test_quantiles(self):
+        """
+        Checks that the quantiles are estimated with the relative error of the bucket width.
+        """
+        histogram = Histogram(sub_buckets=8)
+        rand = random.Random(0)
+        values = sorted(rand.lognormvariate(-5, 1) for _ in range(10000))
+        for value in values:
+            histogram.record(value)
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, values[0])
+        self.assertEqual(histogram.max, values[-1])
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            self.assertAlmostEqual(histogram.quantile(q) / exact, 1.0, delta=1 / 8)
+        summary = histogram.summary()
+        self.assertEqual(sorted(summary), ["count", "max", "min", "p50", "p90", "p99", "sum"])
+
+    def test_bounded_buckets(self):
+        """
+        Checks that the values out of the range are kept in the first and the last buckets.
+        """
+        histogram = Histogram(min_value=0.001, max_value=10.0)
+        for value in (0.0, -1.0, 0.0005, 1e6, 1e9):
+            histogram.record(value)
+        self.assertEqual(histogram.buckets, {0: 3, histogram.max_index: 2})
+        self.assertEqual(histogram.min, 0.0)
+        self.assertEqual(histogram.quantile(1.0), 1e9)
+
+    def test_merge(self):
+        first = Histogram()
+        second = Histogram()
+        for i in range(1, 101):
+            (first if i % 2 else second).record(i / 1000)
+        first.merge(second)
+        self.assertEqual(first.count, 100)
+        self.assertAlmostEqual(first.sum, 5.05)
+        self.assertEqual((first.min, first.max), (0.001, 0.1))
+        self.assertAlmostEqual(first.quantile(0.5), 0.05, delta=0.05 / 8)
@@ -0,0 +1,196 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import http.client
+import os
+import ssl
+import threading
+import time
+from urllib import error, parse, request
+
+default_headers = {
+    'Content-Type': 'application/x-www-form-urlencoded',
+    'User-Agent': 'openvino-telemetry',
+}
+
+
+class ConnectionPool:
+    """
+    The pool of persistent HTTP connections. Connections are kept alive between the requests to the same host, so the
+    requests don't pay for DNS resolution, TCP and TLS handshakes every time.
+
+    :param max_connections_per_host: the maximum number of idle connections kept for every host.
+    :param idle_timeout: the time in seconds after which the idle connection is closed.
+    """
+    def __init__(self, max_connections_per_host: int = 4, idle_timeout: float = 30.0):
+        self.max_connections_per_host = max_connections_per_host
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._ssl_context = None
+        self._lock = threading.Lock()
+
+    def _new_connection(self, scheme: str, host: str, port: int, timeout: float):
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _get_idle_connection(self, key: tuple):
+        """
+        Returns the most recently used idle connection to the host, closes connections which have been idle for too
+        long.
+        """
+        now = time.monotonic()
+        with self._lock:
+            connections = self._idle.get(key, [])
+            while connections:
+                connection, last_used = connections.pop()
+                if now - last_used < self.idle_timeout:
+                    return connection
+                connection.close()
+        return None
+
+    def _release_connection(self, key: tuple, connection):
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_connections_per_host:
+                connections.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def request(self, url: str, data: bytes, headers: dict = None, timeout: float = None):
+        """
+        Sends POST request using the persistent connection to the host.
+        :param url: the url to send the request to
+        :param data: the body of the request
+        :param headers: the headers of the request
+        :param timeout: the timeout of the blocking operations
+        :return: the response with the already read body
+        """
+        parsed_url = parse.urlsplit(url)
+        scheme = parsed_url.scheme.lower()
+        if scheme not in ('http', 'https'):
+            raise ValueError('Unsupported url scheme: {}'.format(scheme))
+        key = (scheme, parsed_url.hostname, parsed_url.port, timeout)
+        path = parsed_url.path or '/'
+        if parsed_url.query:
+            path += '?' + parsed_url.query
+
+        connection = self._get_idle_connection(key)
+        reused = connection is not None
+        while True:
+            if connection is None:
+                connection = self._new_connection(scheme, parsed_url.hostname, parsed_url.port, timeout)
+            try:
+                connection.request('POST', path, body=data, headers=headers or {})
+                response = connection.getresponse()
+                response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+                # the server closed the idle connection, repeat the request using a new one
+                connection = None
+                reused = False
+                continue
+            except Exception:
+                connection.close()
+                raise
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release_connection(key, connection)
+        return response
+
+    def close(self):
+        """
+        Closes all idle connections.
+        :return: None
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+
+_connection_pool = None
+_connection_pool_pid = None
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool():
+    """
+    Returns the connection pool shared by the backends. The connections are not shared with the forked processes.
+    """
+    global _connection_pool, _connection_pool_pid
+    with _connection_pool_lock:
+        if _connection_pool is None or _connection_pool_pid != os.getpid():
+            _connection_pool = ConnectionPool()
+            _connection_pool_pid = os.getpid()
+        return _connection_pool
+
+
+def _reset_after_fork():
+    global _connection_pool_lock
+    # the lock may be held by a thread of the parent process at the moment of fork
+    _connection_pool_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def uses_proxy(url: str):
+    """
+    Checks if the request to the url should go through the proxy configured by the environment.
+    """
+    parsed_url = parse.urlsplit(url)
+    proxies = request.getproxies()
+    if parsed_url.scheme.lower() not in proxies:
+        return False
+    return not request.proxy_bypass(parsed_url.hostname or '')
+
+
+def send_request(url: str, data: bytes, timeout: float = None):
+    """
+    Sends POST request with the data to the url. The request is sent using the persistent connection from the shared
+    connection pool, unless the proxy is configured for the url.
+    :param url: the url to send the request to
+    :param data: the body of the request
+    :param timeout: the timeout of the blocking operations
+    :return: True if the request is sent successfully, otherwise False
+    """
+    try:
+        if uses_proxy(url):
+            request.urlopen(request.Request(url, data=data, headers=default_headers), timeout=timeout)  # nosec
+            return True
+        response = get_connection_pool().request(url, data, default_headers, timeout)
+    except Exception as err:
+        return False
+    return 200 <= response.status < 300
+
+
+def post_request(url: str, data: bytes, headers: dict = None, timeout: float = None):
+    """
+    Sends POST request with the data to the url in the same way as send_request(), but returns the response status
+    and headers, so the caller is able to handle the errors of the server. The network errors are raised.
+    :param url: the url to send the request to
+    :param data: the body of the request
+    :param headers: the headers added to the default ones
+    :param timeout: the timeout of the blocking operations
+    :return: the tuple of the status code and the headers of the response
+    """
+    headers = {**default_headers, **(headers or {})}
+    if uses_proxy(url):
+        try:
+            response = request.urlopen(request.Request(url, data=data, headers=headers), timeout=timeout)  # nosec
+        except error.HTTPError as err:
+            return err.code, err.headers
+        return response.status, response.headers
+    response = get_connection_pool().request(url, data, headers, timeout)
+    return response.status, response.headers
@@ -0,0 +1,85 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .http_pool import ConnectionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.lock:
+            self.server.requests += 1
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = 0
+        self.server.requests = 0
+        self.url = 'http://127.0.0.1:{}/collect?id=1'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connection_is_reused(self):
+        """
+        Checks that sequential requests to the same host use one connection.
+        """
+        pool = ConnectionPool()
+        for _ in range(20):
+            self.assertEqual(pool.request(self.url, b'data', timeout=3.0).status, 204)
+        pool.close()
+        self.assertEqual(self.server.requests, 20)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_idle_connection_is_evicted(self):
+        """
+        Checks that connection idle for longer than idle_timeout is not reused.
+        """
+        pool = ConnectionPool(idle_timeout=0.1)
+        pool.request(self.url, b'data', timeout=3.0)
+        time.sleep(0.2)
+        pool.request(self.url, b'data', timeout=3.0)
+        pool.close()
+        self.assertEqual(self.server.connections, 2)
+
+    def test_pool_size_is_bounded(self):
+        """
+        Checks that no more than max_connections_per_host idle connections are kept.
+        """
+        pool = ConnectionPool(max_connections_per_host=2)
+        barrier = threading.Barrier(5)
+
+        def send():
+            barrier.wait()
+            pool.request(self.url, b'data', timeout=3.0)
+
+        threads = [threading.Thread(target=send) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(len(connections) <= 2 for connections in pool._idle.values()))
+        pool.close()
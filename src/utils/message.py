@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from enum import Enum
+from types import MappingProxyType
 
 
 class MessageType(Enum):
@@ -12,7 +13,47 @@ class MessageType(Enum):
     SESSION_END = 4
 
 
+def freeze(attrs: dict):
+    """
+    Returns the read-only copy of the attributes, which can be shared by the messages as their default attributes.
+    """
+    return MappingProxyType(dict(attrs))
+
+
+_no_defaults = freeze({})
+
+
 class Message:
-    def __init__(self, type: MessageType, attrs: dict):
-        self.type = type
-        self.attrs = attrs.copy()
+    """
+    The immutable message. The message keeps the reference to the default attributes shared by many messages and
+    only its own attributes, which override the default ones, so the queued messages do not duplicate the defaults.
+
+    :param type: the type of the message
+    :param attrs: the attributes of the message
+    :param defaults: the default attributes returned by freeze()
+    """
+    __slots__ = ('type', 'defaults', 'deltas')
+
+    def __init__(self, type: MessageType, attrs: dict, defaults: MappingProxyType = _no_defaults):
+        object.__setattr__(self, 'type', type)
+        object.__setattr__(self, 'defaults', defaults)
+        object.__setattr__(self, 'deltas', dict(attrs))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Message is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Message is immutable")
+
+    @property
+    def attrs(self):
+        """
+        Returns the new dictionary with all attributes of the message.
+        """
+        return {**self.defaults, **self.deltas}
+
+    def replace(self, **attrs):
+        """
+        Returns the copy of the message with the attributes updated.
+        """
+        return Message(self.type, {**self.deltas, **attrs}, self.defaults)
@@ -0,0 +1,43 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+
+from .message import Message, MessageType, freeze
+
+
+class MessageTest(unittest.TestCase):
+    def test_shared_defaults(self):
+        """
+        Checks that the messages reference the same defaults and keep only their own attributes.
+        """
+        defaults = freeze({"v": "1", "tid": "test", "ea": "default"})
+        first = Message(MessageType.EVENT, {"ea": "first"}, defaults)
+        second = Message(MessageType.EVENT, {"ea": "second"}, defaults)
+        self.assertIs(first.defaults, second.defaults)
+        self.assertEqual(first.deltas, {"ea": "first"})
+        self.assertEqual(first.attrs, {"v": "1", "tid": "test", "ea": "first"})
+        self.assertEqual(second.attrs["ea"], "second")
+        self.assertFalse(hasattr(first, '__dict__'))
+
+    def test_immutable(self):
+        """
+        Checks that the message and its defaults can not be modified and replace() returns the new message.
+        """
+        defaults = freeze({"v": "1"})
+        attrs = {"ea": "action"}
+        message = Message(MessageType.EVENT, attrs, defaults)
+        attrs["ea"] = "changed"
+        self.assertEqual(message.attrs["ea"], "action")
+        with self.assertRaises(AttributeError):
+            message.type = MessageType.ERROR
+        with self.assertRaises(TypeError):
+            message.defaults["v"] = "2"
+
+        message.attrs["ea"] = "changed"
+        self.assertEqual(message.attrs["ea"], "action")
+
+        replaced = message.replace(qt=100)
+        self.assertEqual(replaced.attrs, {"v": "1", "ea": "action", "qt": 100})
+        self.assertNotIn("qt", message.attrs)
+        self.assertIs(replaced.defaults, message.defaults)
@@ -3,6 +3,7 @@
 
 import logging as log
 import os
+import threading
 import time
 from enum import Enum
 from pathlib import Path
@@ -121,12 +122,18 @@ class OptInChecker:
         log.info('Failed to find location of the openvino_telemetry file.')
         return None
 
-    def consent_file(self):
+    def consent_file(self, base_dir: str = None, subdirectory: str = None):
         """
         Returns the consent file path.
+        :param base_dir: the base directory of the consent file if it is already known
+        :param subdirectory: the subdirectory of the consent file if it is already known
         :return: consent file path.
         """
-        return os.path.join(self.consent_file_base_dir(), self.consent_file_subdirectory(), "openvino_telemetry")
+        if base_dir is None:
+            base_dir = self.consent_file_base_dir()
+        if subdirectory is None:
+            subdirectory = self.consent_file_subdirectory()
+        return os.path.join(base_dir, subdirectory, "openvino_telemetry")
 
     def create_new_consent_file(self):
         """
@@ -197,17 +204,20 @@ class OptInChecker:
         :param result: opt-in dialog result.
         :return: False if the consent file is not writable, otherwise True
         """
-        if self.consent_file_base_dir() is None or self.consent_file_subdirectory() is None:
+        base_dir = self.consent_file_base_dir()
+        subdirectory = self.consent_file_subdirectory()
+        if base_dir is None or subdirectory is None:
             return False
-        if not os.path.exists(self.consent_file()):
+        consent_file = self.consent_file(base_dir, subdirectory)
+        if not os.path.exists(consent_file):
             if not self.create_new_consent_file():
                 return False
-        if not os.access(self.consent_file(), os.W_OK):
+        if not os.access(consent_file, os.W_OK):
             log.warning("Failed to update opt-in status. "
-                        "Please allow write access to the following file: {}".format(self.consent_file()))
+                        "Please allow write access to the following file: {}".format(consent_file))
             return False
         try:
-            with open(self.consent_file(), 'w') as file:
+            with open(consent_file, 'w') as file:
                 if result == ConsentCheckResult.ACCEPTED:
                     file.write("1")
                 else:
@@ -300,31 +310,98 @@ class OptInChecker:
 
         return False
 
-    def check(self, enable_opt_in_dialog, disable_in_ci=False):
+    def check(self, enable_opt_in_dialog, disable_in_ci=False, consent_result: ConsentCheckResult = None):
         """
         Checks if user has accepted the collection of the information by checking the consent file.
+        :param consent_result: the content of the consent file if it is already read, for example, from the
+        telemetry state file
         :return: consent check result
         """
-        if self.consent_file_base_dir() is None or self.consent_file_subdirectory() is None:
+        base_dir = self.consent_file_base_dir()
+        subdirectory = self.consent_file_subdirectory()
+        if base_dir is None or subdirectory is None:
             return ConsentCheckResult.DECLINED
 
         if disable_in_ci and self._run_in_ci():
             return ConsentCheckResult.DECLINED
 
-        if not os.path.exists(self.consent_file()):
-            if enable_opt_in_dialog:
-                if not self._check_main_process():
-                    return ConsentCheckResult.DECLINED
-
-                if not self._check_input_is_terminal() or self._check_run_in_notebook():
-                    return ConsentCheckResult.DECLINED
-            return ConsentCheckResult.NO_FILE
+        result = consent_result
+        if result is None:
+            result = read_consent_file(self.consent_file(base_dir, subdirectory))
+        if result == ConsentCheckResult.NO_FILE and enable_opt_in_dialog:
+            if not self._check_main_process():
+                return ConsentCheckResult.DECLINED
 
-        if not self.consent_file_is_empty():
-            _, content = self.get_info_from_consent_file()
-            if content == "1":
-                return ConsentCheckResult.ACCEPTED
-            elif content == "0":
+            if not self._check_input_is_terminal() or self._check_run_in_notebook():
                 return ConsentCheckResult.DECLINED
-        log.warning("Incorrect format of the file with opt-in status.")
+        return result
+
+
+def read_consent_file(consent_file: str):
+    """
+    Reads the opt-in status from the consent file.
+    :param consent_file: the path to the consent file
+    :return: consent check result
+    """
+    try:
+        with open(consent_file, 'r') as file:
+            content = file.readline().strip()
+    except (FileNotFoundError, NotADirectoryError):
+        return ConsentCheckResult.NO_FILE
+    except Exception:
+        content = None
+    if content == "1":
+        return ConsentCheckResult.ACCEPTED
+    elif content == "0":
         return ConsentCheckResult.DECLINED
+    log.warning("Incorrect format of the file with opt-in status.")
+    return ConsentCheckResult.DECLINED
+
+
+def file_signature(file_name: str):
+    """
+    Returns the tuple of the modification time, inode and size of the file which changes when the file is modified.
+    :param file_name: the path to the file
+    :return: the signature of the file or None if the file does not exist
+    """
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+
+class ConsentWatcher:
+    """
+    Keeps the result of reading the consent file and re-reads the file only when its modification time, inode or
+    size are changed. The file is checked with a single stat() call at most once per check_interval seconds, so the
+    change of the opt-in status made by another process is noticed within check_interval seconds.
+
+    :param consent_file: the path to the consent file.
+    :param check_interval: the minimum time in seconds between the checks of the file.
+    :param result: the opt-in status which is already known, the file is read only after it is changed if it is set.
+    """
+    def __init__(self, consent_file: str, check_interval: float = 1.0, result: ConsentCheckResult = None):
+        self.consent_file = consent_file
+        self.check_interval = check_interval
+        self._result = result
+        self._signature = file_signature(consent_file) if result is not None else None
+        self._next_check = time.monotonic() + check_interval if result is not None else 0.0
+        self._lock = threading.Lock()
+
+    def result(self):
+        """
+        Returns the opt-in status from the consent file.
+        :return: consent check result
+        """
+        now = time.monotonic()
+        if self._result is not None and now < self._next_check:
+            return self._result
+        with self._lock:
+            self._next_check = now + self.check_interval
+            signature = file_signature(self.consent_file)
+            if self._result is None or signature != self._signature:
+                self._result = read_consent_file(self.consent_file) if signature is not None \
+                    else ConsentCheckResult.NO_FILE
+                self._signature = signature
+            return self._result
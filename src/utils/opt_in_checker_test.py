@@ -7,9 +7,9 @@ import stat
 import unittest
 from platform import system
 from tempfile import TemporaryDirectory
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from .opt_in_checker import OptInChecker, ConsentCheckResult
+from .opt_in_checker import OptInChecker, ConsentCheckResult, ConsentWatcher
 
 
 class OptInCheckerTest(unittest.TestCase):
@@ -103,6 +103,41 @@ class OptInCheckerTest(unittest.TestCase):
         self.init_opt_in_checker(self.test_directory)
         self.assertTrue(self.opt_in_checker.create_or_check_consent_dir() is False)
 
+    def test_consent_watcher(self):
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            self.init_opt_in_checker(test_dir)
+            os.mkdir(os.path.join(test_dir, self.test_subdir))
+            consent_file = self.opt_in_checker.consent_file()
+            watcher = ConsentWatcher(consent_file, check_interval=0)
+            self.assertTrue(watcher.result() == ConsentCheckResult.NO_FILE)
+            with open(consent_file, 'w') as file:
+                file.write("1")
+            self.assertTrue(watcher.result() == ConsentCheckResult.ACCEPTED)
+
+            # the file is read again only if it is changed
+            with patch('builtins.open', side_effect=AssertionError('the file should not be read')):
+                self.assertTrue(watcher.result() == ConsentCheckResult.ACCEPTED)
+
+            with open(consent_file, 'w') as file:
+                file.write("00")
+            self.assertTrue(watcher.result() == ConsentCheckResult.DECLINED)
+
+    def test_consent_watcher_check_interval(self):
+        with TemporaryDirectory(prefix=self.test_directory) as test_dir:
+            self.init_opt_in_checker(test_dir)
+            os.mkdir(os.path.join(test_dir, self.test_subdir))
+            consent_file = self.opt_in_checker.consent_file()
+            with open(consent_file, 'w') as file:
+                file.write("1")
+            watcher = ConsentWatcher(consent_file, check_interval=100, result=ConsentCheckResult.ACCEPTED)
+            with open(consent_file, 'w') as file:
+                file.write("0")
+            # the file is not checked until the interval is expired
+            self.assertTrue(watcher.result() == ConsentCheckResult.ACCEPTED)
+            watcher.check_interval = 0
+            watcher._next_check = 0
+            self.assertTrue(watcher.result() == ConsentCheckResult.DECLINED)
+
     def test_send_telemetry_from_non_cmd_tool(self):
         with TemporaryDirectory(prefix=self.test_directory) as test_dir:
             self.init_opt_in_checker(test_dir)
@@ -0,0 +1,16 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from enum import Enum
+
+MAX_QUEUE_SIZE = 1000
+
+
+class QueuePolicy(Enum):
+    """
+    Defines what happens with the new message when the sender's queue is full.
+    """
+    DROP_NEWEST = "drop_newest"  # the new message is dropped
+    DROP_OLDEST = "drop_oldest"  # the oldest queued messages are dropped to free space for the new one
+    BLOCK = "block"  # the caller waits for free space for at most block_timeout seconds
+    SHED = "shed"  # the new message is dropped with the probability growing as the queue fills up
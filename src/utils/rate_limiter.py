@@ -0,0 +1,105 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import random
+import threading
+import weakref
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Token bucket refilled with rate tokens per second up to burst tokens.
+    Should be used under the lock of the owner.
+    """
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_update = monotonic()
+
+    def consume(self):
+        """
+        Takes one token from the bucket.
+        :return: True if the token is taken, False if the bucket is empty
+        """
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_update) * self.rate)
+        self.last_update = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RateLimiter:
+    """
+    Limits the rate of messages per category with token buckets and samples the messages per category.
+    The settings of the category '*' are applied to the categories which are not listed explicitly.
+
+    :param rate_limits: the dictionary mapping the category to the (rate, burst) tuple, where rate is the number of
+    messages allowed per second and burst is the maximum number of messages allowed at once.
+    :param sample_rates: the dictionary mapping the category to the ratio from 0 to 1 of messages which are sent.
+    """
+    default_category = '*'
+
+    def __init__(self, rate_limits: dict = None, sample_rates: dict = None):
+        self.rate_limits = rate_limits or {}
+        self.sample_rates = sample_rates or {}
+        self.rate_limited = {}
+        self.sampled_out = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+        _rate_limiters.add(self)
+
+    def _get_setting(self, settings: dict, category: str):
+        if category in settings:
+            return settings[category]
+        return settings.get(self.default_category)
+
+    def allow(self, category: str, sample: bool = True):
+        """
+        Checks if the message of the category should be sent and counts the messages which should not.
+        :param category: the category of the message
+        :param sample: if False, only the rate limit is checked, for example, for the messages summarizing many
+        measurements
+        :return: True if the message should be sent, otherwise False
+        """
+        sample_rate = self._get_setting(self.sample_rates, category) if sample else None
+        rate_limit = self._get_setting(self.rate_limits, category)
+        if sample_rate is None and rate_limit is None:
+            return True
+        with self._lock:
+            if sample_rate is not None and random.random() >= sample_rate:  # nosec
+                self.sampled_out[category] = self.sampled_out.get(category, 0) + 1
+                return False
+            if rate_limit is not None:
+                bucket = self._buckets.get(category)
+                if bucket is None:
+                    bucket = self._buckets[category] = TokenBucket(*rate_limit)
+                if not bucket.consume():
+                    self.rate_limited[category] = self.rate_limited.get(category, 0) + 1
+                    return False
+        return True
+
+    def get_stats(self):
+        """
+        Returns the numbers of messages rejected by the rate limits and by sampling per category.
+        """
+        with self._lock:
+            return {"rate_limited": dict(self.rate_limited), "sampled_out": dict(self.sampled_out)}
+
+
+# the rate limiters existing in the process, their locks are recreated in the child process after fork, because the
+# lock may be held by a thread of the parent process
+_rate_limiters = weakref.WeakSet()
+
+
+def _reset_rate_limiters_after_fork():
+    for rate_limiter in list(_rate_limiters):
+        rate_limiter._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_rate_limiters_after_fork)
@@ -0,0 +1,50 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import patch
+
+from . import rate_limiter
+from .rate_limiter import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    def test_burst_and_refill(self):
+        """
+        Checks that only burst messages are allowed at once and the tokens are refilled with time.
+        """
+        with patch.object(rate_limiter, 'monotonic', return_value=100.0) as monotonic:
+            limiter = RateLimiter(rate_limits={"mo": (2, 3)})
+            self.assertEqual([limiter.allow("mo") for _ in range(5)], [True, True, True, False, False])
+            monotonic.return_value = 101.0
+            self.assertEqual([limiter.allow("mo") for _ in range(3)], [True, True, False])
+        self.assertEqual(limiter.get_stats(), {"rate_limited": {"mo": 3}, "sampled_out": {}})
+
+    def test_default_category(self):
+        """
+        Checks that the '*' settings are applied per category to the categories which are not listed.
+        """
+        limiter = RateLimiter(rate_limits={"*": (0, 1), "pot": (0, 2)})
+        self.assertEqual([limiter.allow("mo") for _ in range(2)], [True, False])
+        self.assertEqual([limiter.allow("ovc") for _ in range(2)], [True, False])
+        self.assertEqual([limiter.allow("pot") for _ in range(3)], [True, True, False])
+        self.assertEqual(limiter.get_stats()["rate_limited"], {"mo": 1, "ovc": 1, "pot": 1})
+
+    def test_sampling(self):
+        """
+        Checks that the messages are sampled according to the ratio and the sampled out messages are counted.
+        """
+        limiter = RateLimiter(sample_rates={"mo": 0.5, "pot": 0})
+        with patch.object(rate_limiter.random, 'random', side_effect=[0.1, 0.7, 0.4, 0.9]):
+            self.assertEqual([limiter.allow("mo") for _ in range(4)], [True, False, True, False])
+        self.assertFalse(limiter.allow("pot"))
+        self.assertTrue(limiter.allow("ovc"))
+        self.assertEqual(limiter.get_stats(), {"rate_limited": {}, "sampled_out": {"mo": 2, "pot": 1}})
+
+    def test_rate_limit_without_sampling(self):
+        """
+        Checks that only the rate limit is applied if sampling is not requested.
+        """
+        limiter = RateLimiter(rate_limits={"mo": (0, 2)}, sample_rates={"mo": 0})
+        self.assertEqual([limiter.allow("mo", sample=False) for _ in range(3)], [True, True, False])
+        self.assertEqual(limiter.get_stats(), {"rate_limited": {"mo": 1}, "sampled_out": {}})
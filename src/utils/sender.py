@@ -1,63 +1,453 @@
 # Copyright (C) 2018-2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import json
 import logging as log
+import os
+import random
 import threading
+import weakref
+from collections import deque, namedtuple
 from concurrent import futures
-from time import sleep
+from time import monotonic, time
 
 from ..backend.backend import TelemetryBackend
+from ..utils.histogram import Histogram
 from ..utils.message import Message
+from ..utils.queue_policy import MAX_QUEUE_SIZE, QueuePolicy
 
-MAX_QUEUE_SIZE = 1000
+# delivered - the number of messages sent successfully, pending - the number of messages which are still queued or
+# being sent, abandoned - the number of messages which were dropped or failed to be sent
+FlushResult = namedtuple('FlushResult', ['delivered', 'pending', 'abandoned'])
 
 
-class TelemetrySender:
+def message_size(message: Message):
+    """
+    Returns the size of the serialized message in bytes.
+    """
+    attrs = message.attrs if isinstance(message, Message) else message
+    try:
+        return len(json.dumps(attrs))
+    except Exception:
+        return 0
+
+
+class BackendQueue:
+    """
+    The queue of the messages of one backend together with the worker threads sending them, so a slow backend does
+    not delay the messages of other backends. Should be used under the lock of the sender.
+    """
     def __init__(self, max_workers=None):
+        # the items are (backend, entries, batched) tuples, where entries is the list of (message, timestamp, size)
+        # tuples
+        self.items = deque()
+        # the number and the total size of messages which are queued, accumulated in batches or being sent
+        self.size = 0
+        self.bytes = 0
+        # the number of submitted tasks which have no corresponding item in the queue
+        self.spare_tasks = 0
         self.executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+
+
+class TelemetrySender:
+    """
+    Sends messages to the backends asynchronously.
+
+    The messages of every backend are kept in the separate bounded queue until a worker thread sends them, every
+    backend has its own worker threads. The queue is bounded by the number of messages and, if max_queue_bytes is set,
+    by the total size of the serialized messages. When the queue is full the new message is handled according to
+    queue_policy, the number of dropped messages is available as 'dropped'.
+
+    If batch_size is greater than 1 the messages are accumulated per backend and passed to the backend's send_batch()
+    method when batch_size messages are collected, when the oldest accumulated message is older than batch_timeout
+    seconds or when the sender is shut down.
+
+    If spool is set, the messages which are dropped, failed to be sent or cancelled by force_shutdown() are stored to
+    the spool together with the time they were sent at.
+
+    The counters of the queued, dropped, delivered and failed messages, the number of exceptions raised by the
+    backends and the histogram of the send latency are updated under the lock the sender takes anyway and are
+    returned by get_stats().
+
+    :param max_workers: the maximum number of threads sending the messages of one backend.
+    :param batch_size: the maximum number of messages passed to the backend at once.
+    :param batch_sizes: the dictionary mapping the backends to their batch sizes overriding batch_size.
+    :param batch_timeout: the maximum time in seconds a message waits for the batch to be filled.
+    :param spool: the EventSpool object storing undelivered messages.
+    :param queue_policy: QueuePolicy applied when the queue is full.
+    :param max_queue_size: the maximum number of queued messages of one backend.
+    :param max_queue_bytes: the maximum total size of queued messages of one backend in bytes, not limited if None.
+    :param block_timeout: the maximum time in seconds send() waits for free space with QueuePolicy.BLOCK.
+    :param shed_threshold: the queue occupancy from 0 to 1 after which QueuePolicy.SHED starts dropping messages.
+    """
+    def __init__(self, max_workers=None, batch_size: int = 1, batch_timeout: float = 1.0, spool=None,
+                 queue_policy: QueuePolicy = QueuePolicy.DROP_NEWEST, max_queue_size: int = MAX_QUEUE_SIZE,
+                 max_queue_bytes: int = None, block_timeout: float = 1.0, shed_threshold: float = 0.5,
+                 batch_sizes: dict = None):
+        self.max_workers = max_workers
+        self.queue_policy = queue_policy
+        self.max_queue_size = max_queue_size
+        self.max_queue_bytes = max_queue_bytes
+        self.block_timeout = block_timeout
+        self.shed_threshold = shed_threshold
+        # the number and the total size of messages of all backends which are queued, accumulated in batches or
+        # being sent
         self.queue_size = 0
+        self.queue_bytes = 0
+        self.queued = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        # the number of calls of send() or send_batch() of the backends which raised an exception
+        self.errors = 0
+        # the time in seconds the backends take to send a message or a batch
+        self.send_latency = Histogram()
+        self.batch_size = batch_size
+        self.batch_sizes = batch_sizes or {}
+        self.batch_timeout = batch_timeout
+        self.spool = spool
+        self._queues = {}
+        self._shutdown = False
+        self._batches = {}
+        self._batch_timers = {}
         self._lock = threading.Lock()
+        self._space_available = threading.Condition(self._lock)
+        _senders.add(self)
 
-    def send(self, backend: TelemetryBackend, message: Message):
-        def _future_callback(future):
-            with self._lock:
-                self.queue_size -= 1
+    def _reset_after_fork(self):
+        """
+        Makes the sender usable in the child process. The threads of the executor are not copied by fork and the
+        lock may be held by a thread of the parent process. The queued messages are dropped, because they are sent
+        by the parent process.
+        """
+        self.queue_size = 0
+        self.queue_bytes = 0
+        self.queued = 0
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+        self.errors = 0
+        self.send_latency = Histogram()
+        self._queues = {}
+        self._batches = {}
+        self._batch_timers = {}
+        self._lock = threading.Lock()
+        self._space_available = threading.Condition(self._lock)
 
-        free_space = False
+    def send(self, backend: TelemetryBackend, message: Message, timestamp: float = None):
+        """
+        Schedules sending of the message.
+        :param backend: the backend to send the message with
+        :param message: the message to send
+        :param timestamp: the time the message was originally sent at, the current time by default
+        :return: None
+        """
+        if timestamp is None and self.spool is not None:
+            timestamp = time()
+        size = message_size(message) if self.max_queue_bytes is not None else 0
+        entry = (message, timestamp, size)
+        dropped_items = []
+        need_task = False
         with self._lock:
-            if self.queue_size < MAX_QUEUE_SIZE:
-                free_space = True
+            queue = self._get_queue(backend)
+            if self._make_room(queue, size, dropped_items):
+                queue.size += 1
+                queue.bytes += size
                 self.queue_size += 1
+                self.queue_bytes += size
+                self.queued += 1
+                if self.batch_sizes.get(backend, self.batch_size) <= 1:
+                    need_task = self._enqueue(queue, backend, [entry], False)
+                else:
+                    batch = self._add_to_batch(backend, entry)
+                    if batch is not None:
+                        need_task = self._enqueue(queue, backend, batch, True)
             else:
-                pass  # dropping a message because the queue is full
-        # to avoid dead lock we should not add callback inside the "with self._lock" block because it will be executed
-        # immediately if the fut is available
-        if free_space:
+                # dropping a message because the queue is full
+                self.dropped += 1
+                dropped_items.append((backend, [entry], False))
+        # the dropped messages are written by the spool's thread, so the caller does not wait for the file I/O
+        self._spool_items(dropped_items, later=True)
+        if need_task:
+            self._submit_task(queue)
+
+    def _get_queue(self, backend: TelemetryBackend):
+        """
+        Returns the queue of the backend, the queue is created on the first message. Should be called under the lock.
+        """
+        queue = self._queues.get(backend)
+        if queue is None:
+            queue = self._queues[backend] = BackendQueue(self.max_workers)
+            if self._shutdown:
+                queue.executor.shutdown(wait=False)
+        return queue
+
+    def _has_room(self, queue: BackendQueue, size: int):
+        """
+        Checks if the message of the given size fits into the queue. Should be called under the lock.
+        """
+        if queue.size >= self.max_queue_size:
+            return False
+        return self.max_queue_bytes is None or queue.bytes + size <= self.max_queue_bytes
+
+    def _make_room(self, queue: BackendQueue, size: int, dropped_items: list):
+        """
+        Applies the queue policy to find place for the new message. Should be called under the lock.
+        :param queue: the queue of the backend the message is sent with
+        :param size: the size of the new message
+        :param dropped_items: the list the queue items dropped to free space are added to
+        :return: True if the new message should be queued, otherwise False
+        """
+        if self.queue_policy == QueuePolicy.SHED:
+            occupancy = queue.size / self.max_queue_size
+            if self.max_queue_bytes:
+                occupancy = max(occupancy, (queue.bytes + size) / self.max_queue_bytes)
+            if occupancy > self.shed_threshold and self.shed_threshold < 1.0:
+                drop_probability = (occupancy - self.shed_threshold) / (1.0 - self.shed_threshold)
+                if random.random() < drop_probability:  # nosec
+                    return False
+            return self._has_room(queue, size)
+
+        if self._has_room(queue, size):
+            return True
+
+        if self.queue_policy == QueuePolicy.DROP_OLDEST:
+            while queue.items and not self._has_room(queue, size):
+                item = queue.items.popleft()
+                # the task submitted for the dropped item will take the next one
+                queue.spare_tasks += 1
+                self._release(queue, item[1])
+                self.dropped += len(item[1])
+                dropped_items.append(item)
+        elif self.queue_policy == QueuePolicy.BLOCK:
+            deadline = monotonic() + self.block_timeout
+            while not self._has_room(queue, size):
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._space_available.wait(remaining)
+        return self._has_room(queue, size)
+
+    def _release(self, queue: BackendQueue, entries: list):
+        """
+        Removes the entries from the queue occupancy. Should be called under the lock.
+        """
+        size = sum(size for _, _, size in entries)
+        queue.size -= len(entries)
+        queue.bytes -= size
+        self.queue_size -= len(entries)
+        self.queue_bytes -= size
+        self._space_available.notify_all()
+
+    def _enqueue(self, queue: BackendQueue, backend: TelemetryBackend, entries: list, batched: bool):
+        """
+        Adds the item to the queue. Should be called under the lock.
+        :return: True if a new task should be submitted to process the item
+        """
+        queue.items.append((backend, entries, batched))
+        if queue.spare_tasks > 0:
+            queue.spare_tasks -= 1
+            return False
+        return True
+
+    def _submit_task(self, queue: BackendQueue):
+        try:
+            queue.executor.submit(self._process_item, queue)
+        except Exception as err:
+            # the executor is shut down, nothing will process the queue anymore
+            self._spool_items(self._drain_queue())
+
+    def _drain_queue(self):
+        """
+        Removes all items from the queues.
+        :return: the list of removed items
+        """
+        items = []
+        with self._lock:
+            for queue in self._queues.values():
+                queue_items = list(queue.items)
+                queue.items.clear()
+                queue.spare_tasks = 0
+                for item in queue_items:
+                    self._release(queue, item[1])
+                items.extend(queue_items)
+        return items
+
+    def _process_item(self, queue: BackendQueue):
+        with self._lock:
+            if not queue.items:
+                if queue.spare_tasks > 0:
+                    queue.spare_tasks -= 1
+                return
+            backend, entries, batched = queue.items.popleft()
+        undelivered = entries
+        raised = True
+        start = monotonic()
+        try:
+            if batched:
+                result = backend.send_batch([message for message, _, _ in entries])
+                undelivered_ids = set(id(message) for message in result or [])
+                undelivered = [entry for entry in entries if id(entry[0]) in undelivered_ids]
+            elif backend.send(entries[0][0]) is not False:
+                undelivered = []
+            raised = False
+        finally:
+            elapsed = monotonic() - start
+            with self._lock:
+                self.delivered += len(entries) - len(undelivered)
+                self.failed += len(undelivered)
+                self.errors += raised
+                self.send_latency.record(elapsed)
+                self._release(queue, entries)
+            self._spool_items([(backend, undelivered, batched)])
+
+    def _spool_items(self, items: list, later: bool = False):
+        """
+        Stores the messages of the queue items to the spool, from the spool's background thread if later is True.
+        """
+        if self.spool is None:
+            return
+        records = []
+        for backend, entries, _ in items:
             try:
-                fut = self.executor.submit(backend.send, message)
-                fut.add_done_callback(_future_callback)
+                records.extend({"ts": timestamp, "backend": backend.id, "data": backend.serialize_message(message)}
+                               for message, timestamp, _ in entries)
             except Exception as err:
                 pass  # nosec
+        if records and later:
+            self.spool.append_later(records)
+        elif records:
+            self.spool.append(records)
+
+    def _add_to_batch(self, backend: TelemetryBackend, entry: tuple):
+        """
+        Adds the entry to the backend's batch. Should be called under the lock.
+        :return: the batch to submit if it is full, otherwise None
+        """
+        batch = self._batches.setdefault(backend, [])
+        batch.append(entry)
+        if len(batch) >= self.batch_sizes.get(backend, self.batch_size):
+            return self._pop_batch(backend)
+        if len(batch) == 1:
+            timer = threading.Timer(self.batch_timeout, self._flush_batch, args=(backend, batch))
+            timer.daemon = True
+            self._batch_timers[backend] = timer
+            timer.start()
+        return None
+
+    def _pop_batch(self, backend: TelemetryBackend):
+        """
+        Removes the backend's batch and cancels its timer. Should be called under the lock.
+        """
+        timer = self._batch_timers.pop(backend, None)
+        if timer is not None:
+            timer.cancel()
+        return self._batches.pop(backend, None)
+
+    def _flush_batch(self, backend: TelemetryBackend, batch: list = None):
+        need_task = False
+        with self._lock:
+            # the batch may be already sent because it was filled up while the timer was expiring
+            if batch is not None and self._batches.get(backend) is not batch:
+                return
+            batch = self._pop_batch(backend)
+            queue = self._get_queue(backend)
+            if batch:
+                need_task = self._enqueue(queue, backend, batch, True)
+        if need_task:
+            self._submit_task(queue)
+
+    def flush_batches(self):
+        """
+        Submits all accumulated batches for sending without waiting for them to be filled.
+        :return: None
+        """
+        with self._lock:
+            backends = list(self._batches.keys())
+        for backend in backends:
+            self._flush_batch(backend)
+
+    def flush(self, timeout: float):
+        """
+        Sends the accumulated batches and waits until all queued messages are sent or the timeout is expired.
+
+        :param timeout: the maximum time to wait in seconds
+        :return: FlushResult with the numbers of messages delivered and abandoned while waiting and the number of
+        messages which are still pending
+        """
+        self.flush_batches()
+        deadline = monotonic() + timeout
+        with self._lock:
+            delivered, abandoned = self.delivered, self.failed + self.dropped
+            while self.queue_size > 0:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._space_available.wait(remaining)
+            result = FlushResult(self.delivered - delivered, self.queue_size, self.failed + self.dropped - abandoned)
+        if self.spool is not None:
+            self.spool.flush()
+        return result
+
+    def get_stats(self):
+        """
+        Returns the counters of the sender.
+
+        :return: the dictionary with the numbers of "queued", "dropped", "delivered" and "failed" messages, the number
+        of "errors" raised by the backends, the current "queue_size" and "queue_bytes", the "queue_sizes" of the
+        backends by their ids and the summary of the "send_latency" in seconds
+        """
+        with self._lock:
+            return {
+                "queued": self.queued,
+                "dropped": self.dropped,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "errors": self.errors,
+                "queue_size": self.queue_size,
+                "queue_bytes": self.queue_bytes,
+                "queue_sizes": {backend.id: queue.size for backend, queue in self._queues.items()},
+                "send_latency": self.send_latency.summary(),
+            }
 
     def force_shutdown(self, timeout: float):
         """
-        Forces all threads to be stopped after timeout. The "shutdown" method of the ThreadPoolExecutor removes only not
-        yet scheduled threads and keep running the existing one. In order to stop the already running use some low-level
-        attribute. The operation with low-level attributes is wrapped with the try/except to avoid potential crash if
-        these attributes will removed or renamed.
+        Waits for the queued messages for at most timeout seconds and forces all threads to be stopped. The "shutdown"
+        method of the ThreadPoolExecutor removes only not yet scheduled threads and keep running the existing one.
+        In order to stop the already running use some low-level attribute. The operation with low-level attributes is
+        wrapped with the try/except to avoid potential crash if these attributes will removed or renamed.
 
         :param timeout: timeout to wait before the shutdown
-        :return: None
+        :return: FlushResult, where the messages which were not sent before the timeout are counted as abandoned,
+        except for the messages which are still being sent
         """
-        need_sleep = False
+        result = self.flush(timeout)
         with self._lock:
-            if self.queue_size > 0:
-                need_sleep = True
-        if need_sleep:
-            sleep(timeout)
-        self.executor.shutdown(wait=False, cancel_futures=True)
+            self._shutdown = True
+            executors = [queue.executor for queue in self._queues.values()]
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        # the messages of the cancelled tasks are left in the queue
+        cancelled_items = self._drain_queue()
+        self._spool_items(cancelled_items)
+        cancelled = sum(len(entries) for _, entries, _ in cancelled_items)
 
-        try:
-            self.executor._threads.clear()
-        except Exception as err:
-            pass  # nosec
+        for executor in executors:
+            try:
+                executor._threads.clear()
+            except Exception as err:
+                pass  # nosec
+        return FlushResult(result.delivered, result.pending - cancelled, result.abandoned + cancelled)
+
+
+# the senders existing in the process, they are reset in the child process after fork
+_senders = weakref.WeakSet()
+
+
+def _reset_senders_after_fork():
+    for sender in list(_senders):
+        sender._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_senders_after_fork)
@@ -0,0 +1,212 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import multiprocessing
+import os
+import threading
+
+from .http_pool import send_request
+
+
+def _serve(conn):
+    """
+    The main loop of the helper process. Receives (url, data) requests from the pipe, sends them and replies with the
+    result of sending.
+    """
+    while True:
+        try:
+            item = conn.recv()
+        except (EOFError, OSError):
+            return
+        if item is None:
+            return
+        url, data = item
+        try:
+            conn.send(send_request(url, data))
+        except (EOFError, OSError):
+            return
+
+
+# the thread starting the helper process, the flag is inherited by the only thread of the forked helper process
+_starting_helper = threading.local()
+
+
+def is_helper_process():
+    """
+    Returns True in the helper process while the at-fork handlers are called, so the handlers of the client do not
+    run in the process which only sends the requests.
+    """
+    return getattr(_starting_helper, 'active', False)
+
+
+class SenderProcess:
+    """
+    Long-living helper process which sends the requests.
+
+    request.urlopen() may hang on Linux if there's no internet connection, so the requests are sent from a separate
+    process, which is terminated if the request is not finished in time. The process is started on the first request
+    and restarted only after it was terminated because of the timeout.
+    """
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._owner_pid = None
+        self._lock = threading.Lock()
+        # the numbers of started processes, of requests which were not finished in time and of terminated processes
+        self.started = 0
+        self.timeouts = 0
+        self.terminated = 0
+
+    def _start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_serve, args=(child_conn,))
+        process.daemon = True
+        _starting_helper.active = True
+        try:
+            process.start()
+        finally:
+            _starting_helper.active = False
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        self._owner_pid = os.getpid()
+        self.started += 1
+
+    def _is_running(self):
+        # the process handle inherited by the forked child process can't be used to communicate with the helper
+        return self._process is not None and self._owner_pid == os.getpid() and self._process.is_alive()
+
+    def _terminate(self):
+        if self._process is not None and self._owner_pid == os.getpid():
+            try:
+                if self._process.is_alive():
+                    self.terminated += 1
+                self._process.terminate()
+                self._conn.close()
+            except Exception as err:
+                pass  # nosec
+        self._process = None
+        self._conn = None
+
+    def request(self, url: str, data: bytes, timeout: float):
+        """
+        Sends the request using the helper process.
+        :param url: the url to send the request to
+        :param data: the body of the request
+        :param timeout: the maximum time to wait for the request to be sent
+        :return: True if the request is sent successfully, otherwise False
+        """
+        with self._lock:
+            try:
+                if not self._is_running():
+                    self._terminate()
+                    self._start()
+                self._conn.send((url, data))
+                if self._conn.poll(timeout):
+                    return self._conn.recv()
+                self.timeouts += 1
+            except Exception as err:
+                pass  # nosec
+            self._terminate()
+            return False
+
+    def get_stats(self):
+        """
+        Returns the numbers of "started" processes, of "timeouts" of the requests and of "terminated" processes.
+        The lock is not taken, because it is held while the request is being sent.
+        """
+        return {"started": self.started, "timeouts": self.timeouts, "terminated": self.terminated}
+
+    def stop(self):
+        """
+        Stops the helper process.
+        :return: None
+        """
+        with self._lock:
+            if self._is_running():
+                try:
+                    self._conn.send(None)
+                    self._process.join(1.0)
+                except Exception as err:
+                    pass  # nosec
+            self._terminate()
+
+
+class SenderProcessPool:
+    """
+    The bounded pool of the helper processes, so the requests of several worker threads are sent in parallel and
+    the hanging request delays only the requests waiting for its process. The request is sent by the idle process,
+    which sent the previous request most recently, so the number of running processes grows only when the requests
+    are sent concurrently. If all processes are busy, the request waits for the first one to become idle.
+
+    :param max_processes: the maximum number of helper processes.
+    """
+    def __init__(self, max_processes: int = 4):
+        self.max_processes = max_processes
+        self._processes = [SenderProcess() for _ in range(max_processes)]
+        self._idle = list(reversed(self._processes))
+        self._idle_available = threading.Condition()
+
+    def request(self, url: str, data: bytes, timeout: float):
+        """
+        Sends the request using the idle helper process.
+        :param url: the url to send the request to
+        :param data: the body of the request
+        :param timeout: the maximum time to wait for the request to be sent by the helper process
+        :return: True if the request is sent successfully, otherwise False
+        """
+        with self._idle_available:
+            while not self._idle:
+                self._idle_available.wait()
+            process = self._idle.pop()
+        try:
+            return process.request(url, data, timeout)
+        finally:
+            with self._idle_available:
+                self._idle.append(process)
+                self._idle_available.notify()
+
+    def get_stats(self):
+        """
+        Returns the numbers of "started" processes, of "timeouts" of the requests and of "terminated" processes
+        summed over the helper processes.
+        """
+        stats = {"started": 0, "timeouts": 0, "terminated": 0}
+        for process in self._processes:
+            for key, value in process.get_stats().items():
+                stats[key] += value
+        return stats
+
+    def stop(self):
+        """
+        Stops the helper processes.
+        :return: None
+        """
+        for process in self._processes:
+            process.stop()
+
+
+_sender_process = None
+_sender_process_lock = threading.Lock()
+
+
+def get_sender_process():
+    """
+    Returns the pool of the sender helper processes shared by the backends.
+    """
+    global _sender_process
+    with _sender_process_lock:
+        if _sender_process is None:
+            _sender_process = SenderProcessPool()
+        return _sender_process
+
+
+def _reset_after_fork():
+    global _sender_process, _sender_process_lock
+    # the locks may be held by a thread of the parent process at the moment of fork, the child starts its own helper
+    _sender_process = None
+    _sender_process_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,81 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from platform import system
+
+from .sender_process import SenderProcess, SenderProcessPool
+
+
+class FakeCollectorHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path == '/hang':
+            time.sleep(5)
+        self.send_response(204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipIf(system() == 'Windows', "Helper process is not used on Windows")
+class SenderProcessTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeCollectorHandler)
+        self.server.daemon_threads = True
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.sender_process = SenderProcess()
+
+    def tearDown(self):
+        self.sender_process.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_process_is_reused(self):
+        """
+        Checks that several requests are sent by the same helper process.
+        """
+        self.assertTrue(self.sender_process.request(self.url + '/collect', b'data', 3.0))
+        pid = self.sender_process._process.pid
+        for _ in range(10):
+            self.assertTrue(self.sender_process.request(self.url + '/collect', b'data', 3.0))
+        self.assertEqual(pid, self.sender_process._process.pid)
+
+    def test_process_restarted_after_timeout(self):
+        """
+        Checks that hanging request is terminated after timeout and the next request starts a new helper process.
+        """
+        self.assertTrue(self.sender_process.request(self.url + '/collect', b'data', 3.0))
+        pid = self.sender_process._process.pid
+
+        start_time = time.time()
+        self.assertFalse(self.sender_process.request(self.url + '/hang', b'data', 0.5))
+        self.assertTrue(time.time() - start_time < 3)
+
+        self.assertTrue(self.sender_process.request(self.url + '/collect', b'data', 3.0))
+        self.assertNotEqual(pid, self.sender_process._process.pid)
+        self.assertEqual(self.sender_process.get_stats(), {"started": 2, "timeouts": 1, "terminated": 1})
+
+    def test_pool_sends_in_parallel(self):
+        """
+        Checks that the hanging request occupies only one helper process of the pool and does not delay the others.
+        """
+        pool = SenderProcessPool(max_processes=2)
+        try:
+            hanging = threading.Thread(target=pool.request, args=(self.url + '/hang', b'data', 3.0))
+            hanging.start()
+            time.sleep(0.2)
+            start_time = time.time()
+            for _ in range(5):
+                self.assertTrue(pool.request(self.url + '/collect', b'data', 3.0))
+            self.assertTrue(time.time() - start_time < 2)
+            hanging.join()
+            self.assertEqual(pool.get_stats(), {"started": 2, "timeouts": 1, "terminated": 1})
+        finally:
+            pool.stop()
@@ -1,10 +1,12 @@
 # Copyright (C) 2018-2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import os
+import threading
 import time
 import unittest
 
-from .sender import TelemetrySender
+from .sender import QueuePolicy, TelemetrySender
 
 
 class FakeTelemetryBackend:
@@ -17,6 +19,59 @@ class FakeTelemetryBackendWithSleep:
         time.sleep(1)
 
 
+class FakeTelemetryBackendWithBatches:
+    def __init__(self):
+        self.batches = []
+
+    def send(self, param):
+        self.batches.append([param])
+
+    def send_batch(self, params):
+        self.batches.append(params)
+
+
+class FakeBlockedTelemetryBackend:
+    def __init__(self):
+        self.sent = []
+        self.event = threading.Event()
+
+    def send(self, param):
+        self.event.wait()
+        self.sent.append(param)
+
+
+class FakeFailingTelemetryBackend:
+    id = 'fake'
+
+    def send(self, param):
+        return False
+
+    def serialize_message(self, param):
+        return param
+
+
+class FakeRaisingTelemetryBackend:
+    id = 'raising'
+
+    def send(self, param):
+        if param % 2:
+            raise RuntimeError("send failed")
+
+
+class FakeSpool:
+    def __init__(self):
+        self.records = []
+
+    def append(self, records):
+        self.records.extend(records)
+
+    def append_later(self, records):
+        self.records.extend(records)
+
+    def flush(self):
+        return True
+
+
 class TelemetrySenderStress(unittest.TestCase):
     def test_stress(self):
         """
@@ -41,7 +96,7 @@ class TelemetrySenderStress(unittest.TestCase):
         start_time = time.time()
         # ask to shutdown with timeout of 1 second
         tm.force_shutdown(1)
-        while len(tm.executor._threads):
+        while len(tm._queues[fake_backend].executor._threads):
             pass
         # check that no more than 3 seconds spent
         self.assertTrue(time.time() - start_time < 3)
@@ -61,7 +116,7 @@ class TelemetrySenderStress(unittest.TestCase):
             # wait until all threads finish their work. We use internal ThreadPoolExecutor attribute _work_queue to make
             # sure that all workers completed their work, so the whole code is wrapped to try/except to avoid exceptions
             # if internal implementation is changed in the future
-            while tm.executor._work_queue.qsize():
+            while tm._queues[fake_backend].executor._work_queue.qsize():
                 pass
             self.assertTrue(time.time() - start_time > 4.0)
         except Exception as err:
@@ -77,4 +132,319 @@ class TelemetrySenderStress(unittest.TestCase):
 
         # ask to shutdown with timeout of 1 second
         tm.force_shutdown(1)
-        tm.send(fake_backend, None)
\ No newline at end of file
+        tm.send(fake_backend, None)
+
+
+class TelemetrySenderBatchTest(unittest.TestCase):
+    def wait_for_queue(self, tm):
+        while tm.queue_size:
+            time.sleep(0.01)
+
+    def test_batch_flushed_on_size(self):
+        """
+        Checks that the batch is sent as soon as it is filled.
+        """
+        tm = TelemetrySender(batch_size=10, batch_timeout=100)
+        fake_backend = FakeTelemetryBackendWithBatches()
+        for i in range(25):
+            tm.send(fake_backend, i)
+        while tm.queue_size > 5:
+            time.sleep(0.01)
+        self.assertEqual(fake_backend.batches, [list(range(10)), list(range(10, 20))])
+
+    def test_batch_flushed_on_timeout(self):
+        """
+        Checks that the incomplete batch is sent after batch_timeout.
+        """
+        tm = TelemetrySender(batch_size=10, batch_timeout=0.1)
+        fake_backend = FakeTelemetryBackendWithBatches()
+        for i in range(3):
+            tm.send(fake_backend, i)
+        self.wait_for_queue(tm)
+        self.assertEqual(fake_backend.batches, [[0, 1, 2]])
+
+    def test_batch_flushed_on_shutdown(self):
+        """
+        Checks that the incomplete batch is sent on shutdown.
+        """
+        tm = TelemetrySender(batch_size=10, batch_timeout=100)
+        fake_backend = FakeTelemetryBackendWithBatches()
+        for i in range(3):
+            tm.send(fake_backend, i)
+        tm.force_shutdown(1)
+        self.assertEqual(fake_backend.batches, [[0, 1, 2]])
+
+
+class TelemetrySenderSpoolTest(unittest.TestCase):
+    def test_failed_messages_are_spooled(self):
+        """
+        Checks that messages which failed to be sent are stored to the spool with the time they were sent at.
+        """
+        spool = FakeSpool()
+        tm = TelemetrySender(spool=spool)
+        start_time = time.time()
+        for i in range(5):
+            tm.send(FakeFailingTelemetryBackend(), i)
+        while tm.queue_size:
+            time.sleep(0.01)
+        self.assertEqual(sorted(record["data"] for record in spool.records), list(range(5)))
+        self.assertTrue(all(record["backend"] == 'fake' for record in spool.records))
+        self.assertTrue(all(start_time <= record["ts"] <= time.time() for record in spool.records))
+
+    def test_cancelled_messages_are_spooled(self):
+        """
+        Checks that messages cancelled by force_shutdown are stored to the spool.
+        """
+        spool = FakeSpool()
+        tm = TelemetrySender(max_workers=1, spool=spool)
+        fake_backend = FakeTelemetryBackendWithSleep()
+        fake_backend.id = 'fake'
+        fake_backend.serialize_message = lambda param: param
+        for i in range(5):
+            tm.send(fake_backend, i)
+        tm.force_shutdown(0.1)
+        self.assertEqual(sorted(record["data"] for record in spool.records), [1, 2, 3, 4])
+
+
+class TelemetrySenderQueuePolicyTest(unittest.TestCase):
+    def fill_queue(self, tm, fake_backend, count):
+        for i in range(count):
+            tm.send(fake_backend, i)
+
+    def wait_for_queue(self, tm):
+        while tm.queue_size:
+            time.sleep(0.01)
+
+    def test_drop_newest(self):
+        """
+        Checks that new messages are dropped when the queue is full.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=5, queue_policy=QueuePolicy.DROP_NEWEST)
+        fake_backend = FakeBlockedTelemetryBackend()
+        self.fill_queue(tm, fake_backend, 10)
+        self.assertEqual(tm.dropped, 5)
+        fake_backend.event.set()
+        self.wait_for_queue(tm)
+        self.assertEqual(fake_backend.sent, [0, 1, 2, 3, 4])
+
+    def test_drop_oldest(self):
+        """
+        Checks that the oldest queued messages are dropped to free space for the new ones.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=5, queue_policy=QueuePolicy.DROP_OLDEST)
+        fake_backend = FakeBlockedTelemetryBackend()
+        tm.send(fake_backend, 0)
+        # wait until the first message is taken by the worker thread
+        while tm._queues[fake_backend].items:
+            time.sleep(0.01)
+        self.fill_queue(tm, fake_backend, 10)
+        self.assertEqual(tm.dropped, 6)
+        fake_backend.event.set()
+        self.wait_for_queue(tm)
+        self.assertEqual(fake_backend.sent, [0, 6, 7, 8, 9])
+        self.assertEqual(tm._queues[fake_backend].spare_tasks, 0)
+
+    def test_block(self):
+        """
+        Checks that send() waits for free space no longer than block_timeout.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=2, queue_policy=QueuePolicy.BLOCK, block_timeout=0.2)
+        fake_backend = FakeBlockedTelemetryBackend()
+        self.fill_queue(tm, fake_backend, 2)
+
+        start_time = time.time()
+        tm.send(fake_backend, 2)
+        self.assertTrue(time.time() - start_time >= 0.2)
+        self.assertEqual(tm.dropped, 1)
+
+        threading.Timer(0.1, fake_backend.event.set).start()
+        tm.send(fake_backend, 3)
+        self.assertEqual(tm.dropped, 1)
+        self.wait_for_queue(tm)
+        self.assertEqual(fake_backend.sent, [0, 1, 3])
+
+    def test_shed(self):
+        """
+        Checks that messages are dropped with growing probability after the queue occupancy threshold.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=100, queue_policy=QueuePolicy.SHED, shed_threshold=0.5)
+        fake_backend = FakeBlockedTelemetryBackend()
+        self.fill_queue(tm, fake_backend, 1000)
+        # no messages are dropped before the threshold and the queue never overflows
+        self.assertTrue(50 < tm.queue_size <= 100)
+        self.assertEqual(tm.dropped, 1000 - tm.queue_size)
+        fake_backend.event.set()
+        self.wait_for_queue(tm)
+        self.assertEqual(fake_backend.sent[:50], list(range(50)))
+
+    def test_max_queue_bytes(self):
+        """
+        Checks that the queue is bounded by the total size of messages.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_bytes=100)
+        fake_backend = FakeBlockedTelemetryBackend()
+        for _ in range(10):
+            tm.send(fake_backend, {"data": "a" * 20})
+        # every message is 32 bytes long
+        self.assertEqual(tm.queue_size, 3)
+        self.assertEqual(tm.queue_bytes, 96)
+        self.assertEqual(tm.dropped, 7)
+        fake_backend.event.set()
+        self.wait_for_queue(tm)
+        self.assertEqual(tm.queue_bytes, 0)
+
+
+class TelemetrySenderFlushTest(unittest.TestCase):
+    def test_flush_returns_when_sent(self):
+        """
+        Checks that flush returns as soon as all messages are sent.
+        """
+        tm = TelemetrySender()
+        fake_backend = FakeBlockedTelemetryBackend()
+        for i in range(10):
+            tm.send(fake_backend, i)
+        threading.Timer(0.1, fake_backend.event.set).start()
+        start_time = time.time()
+        self.assertEqual(tm.flush(10), (10, 0, 0))
+        self.assertTrue(time.time() - start_time < 5)
+
+    def test_flush_timeout(self):
+        """
+        Checks that flush reports pending and abandoned messages after the timeout.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=5)
+        fake_backend = FakeBlockedTelemetryBackend()
+        try:
+            tm.send(fake_backend, 0)
+            # wait until the first message is taken by the worker thread
+            while tm._queues[fake_backend].items:
+                time.sleep(0.01)
+            for i in range(10):
+                tm.send(fake_backend, i)
+            self.assertEqual(tm.dropped, 6)
+            self.assertEqual(tm.flush(0.2), (0, 5, 0))
+        finally:
+            fake_backend.event.set()
+        self.assertEqual(tm.flush(10), (5, 0, 0))
+
+    def test_force_shutdown_abandons_queued(self):
+        """
+        Checks that force_shutdown does not wait when the queue is empty and reports cancelled messages.
+        """
+        tm = TelemetrySender()
+        start_time = time.time()
+        self.assertEqual(tm.force_shutdown(1), (0, 0, 0))
+        self.assertTrue(time.time() - start_time < 0.5)
+
+        tm = TelemetrySender(max_workers=1)
+        fake_backend = FakeBlockedTelemetryBackend()
+        try:
+            for i in range(5):
+                tm.send(fake_backend, i)
+            self.assertEqual(tm.force_shutdown(0.1), (0, 1, 4))
+        finally:
+            fake_backend.event.set()
+
+
+class TelemetrySenderStatsTest(unittest.TestCase):
+    def test_stats(self):
+        """
+        Checks the counters of queued, dropped, delivered and failed messages and of exceptions raised by the backend.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=10)
+        blocked_backend = FakeBlockedTelemetryBackend()
+        blocked_backend.id = 'blocked'
+        for i in range(15):
+            tm.send(blocked_backend, i)
+        stats = tm.get_stats()
+        self.assertEqual((stats["queued"], stats["dropped"], stats["queue_size"]), (10, 5, 10))
+        self.assertEqual(stats["queue_sizes"], {'blocked': 10})
+        blocked_backend.event.set()
+        tm.flush(10)
+
+        raising_backend = FakeRaisingTelemetryBackend()
+        for i in range(10):
+            tm.send(raising_backend, i)
+        tm.flush(10)
+        stats = tm.get_stats()
+        self.assertEqual(stats["queued"], 20)
+        self.assertEqual(stats["delivered"], 15)
+        self.assertEqual(stats["failed"], 5)
+        self.assertEqual(stats["errors"], 5)
+        self.assertEqual(stats["queue_size"], 0)
+        self.assertEqual(stats["send_latency"]["count"], 20)
+        self.assertLessEqual(stats["send_latency"]["p50"], stats["send_latency"]["max"])
+
+
+class TelemetrySenderMultiBackendTest(unittest.TestCase):
+    def test_slow_backend_does_not_stall_fast_one(self):
+        """
+        Checks that every backend has its own queue and worker threads.
+        """
+        tm = TelemetrySender(max_workers=1, max_queue_size=5)
+        slow_backend = FakeBlockedTelemetryBackend()
+        fast_backend = FakeTelemetryBackendWithBatches()
+        try:
+            for i in range(10):
+                tm.send(slow_backend, i)
+            # the messages exceeding the queue of the slow backend are dropped, the fast backend has its own queue
+            for i in range(5):
+                tm.send(fast_backend, i)
+            self.assertEqual(tm.dropped, 5)
+            deadline = time.time() + 10
+            while len(fast_backend.batches) < 5 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(fast_backend.batches, [[i] for i in range(5)])
+            self.assertEqual(tm.queue_size, 5)
+        finally:
+            slow_backend.event.set()
+        self.assertEqual(tm.flush(10).pending, 0)
+        self.assertEqual(slow_backend.sent, list(range(5)))
+
+    def test_batch_size_per_backend(self):
+        """
+        Checks that the batch size of the backend overrides the default one.
+        """
+        batched_backend = FakeTelemetryBackendWithBatches()
+        backend = FakeTelemetryBackendWithBatches()
+        tm = TelemetrySender(batch_timeout=100, batch_sizes={batched_backend: 3})
+        for i in range(3):
+            tm.send(batched_backend, i)
+            tm.send(backend, i)
+        tm.flush(10)
+        self.assertEqual(batched_backend.batches, [[0, 1, 2]])
+        self.assertEqual(backend.batches, [[0], [1], [2]])
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'fork() is not available')
+class TelemetrySenderForkTest(unittest.TestCase):
+    def test_send_after_fork(self):
+        """
+        Checks that the child process sends its own messages without deadlocks and does not send the messages queued
+        by the parent process.
+        """
+        tm = TelemetrySender(max_workers=1)
+        fake_backend = FakeBlockedTelemetryBackend()
+        try:
+            for i in range(5):
+                tm.send(fake_backend, i)
+            # the lock is held by the parent process at the moment of fork
+            with tm._lock:
+                pid = os.fork()
+                if pid == 0:
+                    exit_code = 1
+                    try:
+                        child_backend = FakeTelemetryBackendWithBatches()
+                        tm.send(child_backend, 'child')
+                        tm.flush(5)
+                        if tm.delivered == 1 and child_backend.batches == [['child']] and not fake_backend.sent:
+                            exit_code = 0
+                    finally:
+                        os._exit(exit_code)
+        finally:
+            fake_backend.event.set()
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        tm.flush(10)
+        self.assertEqual(tm.delivered, 5)
+        self.assertEqual(fake_backend.sent, list(range(5)))
@@ -0,0 +1,267 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+
+from .opt_in_checker import OptInChecker
+
+
+def _read_byte(fd: int, offset: int):
+    if hasattr(os, 'pread'):
+        return os.pread(fd, 1, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, 1)
+
+
+class EventSpool:
+    """
+    The append-only file storing the messages which could not be delivered, so they can be sent during the next run.
+    Every record is written as a separate JSON line, so the records written before a crash remain readable.
+    The class is used by main Telemetry class, for example:
+
+    spool = EventSpool()
+
+    # store undelivered messages
+    spool.append([{"ts": 1700000000.0, "backend": "ga4", "data": {...}}])
+
+    # store undelivered messages from the background thread and write them at exit the latest
+    spool.append_later([{"ts": 1700000000.0, "backend": "ga4", "data": {...}}])
+
+    # read and remove stored messages
+    for records in spool.drain(batch_size=100):
+        ...
+
+    :param max_size: the maximum size of the spool file in bytes, the records exceeding it are dropped.
+    :param max_pending: the maximum number of records collected by append_later() and not yet written.
+    """
+    spool_filename = "openvino_telemetry_spool"
+    # the drained file which is not removed for this time in seconds is left by the interrupted drain
+    stale_drain_age = 60.0
+
+    def __init__(self, max_size: int = 1024 * 1024, max_pending: int = 1000):
+        self.opt_in_checker = OptInChecker()
+        self.max_size = max_size
+        self.max_pending = max_pending
+        # the number of drained records which could not be read
+        self.damaged = 0
+        # the file is not opened anymore once it is full, until this process drains or removes it
+        self._full = False
+        self._pending = []
+        self._writer = None
+        # the lock of the file is always taken before the lock of the pending records
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        _event_spools.add(self)
+
+    def _reset_after_fork(self):
+        # the records collected by the parent process are written by the parent process
+        self._pending = []
+        self._writer = None
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+
+    def spool_file(self):
+        """
+        Returns the spool file path.
+        """
+        return os.path.join(self.opt_in_checker.consent_file_base_dir(), self.opt_in_checker.consent_file_subdirectory(),
+                            self.spool_filename)
+
+    def append(self, records: list):
+        """
+        Appends the records to the spool file. The records which don't fit into max_size are dropped, and the file is
+        not opened by the next calls until this spool drains or removes it.
+        :param records: the list of JSON serializable records
+        :return: True if all records are stored, otherwise False
+        """
+        with self._lock:
+            return self._append(records)
+
+    def append_later(self, records: list):
+        """
+        Collects the records in memory and appends them to the spool file from the background thread, so the caller
+        does not wait for the file I/O. The records which are not written yet are written by flush() and at exit.
+        :param records: the list of JSON serializable records
+        :return: True if all records are accepted, False if some of them are dropped because the spool file is full
+        or max_pending records are waiting to be written
+        """
+        if self._full:
+            return False
+        with self._pending_lock:
+            accepted = records[:max(self.max_pending - len(self._pending), 0)]
+            self._pending.extend(accepted)
+            if self._pending and self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, daemon=True)
+                self._writer.start()
+        return len(accepted) == len(records)
+
+    def flush(self):
+        """
+        Writes the records collected by append_later() and waits for the records which are being written.
+        :return: True if all records are stored, otherwise False
+        """
+        with self._lock:
+            with self._pending_lock:
+                records, self._pending = self._pending, []
+            return self._append(records)
+
+    def _write_pending(self):
+        while True:
+            with self._lock:
+                with self._pending_lock:
+                    records, self._pending = self._pending, []
+                    if not records:
+                        self._writer = None
+                        return
+                self._append(records)
+
+    def _append(self, records: list):
+        """
+        Appends the records to the spool file. Should be called under the lock.
+        """
+        if not records:
+            return True
+        if self._full:
+            return False
+        if self.opt_in_checker.consent_file_base_dir() is None or self.opt_in_checker.consent_file_subdirectory() is None:
+            return False
+        lines = []
+        for record in records:
+            try:
+                lines.append(json.dumps(record, separators=(',', ':')).encode() + b'\n')
+            except Exception:
+                pass  # nosec
+        try:
+            fd = os.open(self.spool_file(), os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0), 0o600)
+        except Exception:
+            return False
+        try:
+            size = os.fstat(fd).st_size
+            free_space = self.max_size - size
+            fitting_lines = []
+            # terminate the line partially written by a crashed process, so it does not damage the new record
+            if size > 0 and _read_byte(fd, size - 1) != b'\n':
+                fitting_lines.append(b'\n')
+                free_space -= 1
+            for line in lines:
+                free_space -= len(line)
+                if free_space < 0:
+                    self._full = True
+                    break
+                fitting_lines.append(line)
+            if fitting_lines:
+                # a single write() keeps the appended lines contiguous
+                os.write(fd, b''.join(fitting_lines))
+        except Exception:
+            return False
+        finally:
+            os.close(fd)
+        return len([line for line in fitting_lines if line != b'\n']) == len(records)
+
+    def drain(self, batch_size: int = 100):
+        """
+        Takes the spool file and the files left by the interrupted drains over and yields their records in batches.
+        The files are removed after all their records are read. The records of the lines damaged by a crash are
+        skipped and counted in damaged.
+        :param batch_size: the maximum number of records in a batch
+        :return: the generator of the lists of records
+        """
+        if self.opt_in_checker.consent_file_base_dir() is None or self.opt_in_checker.consent_file_subdirectory() is None:
+            return
+        spool_file = self.spool_file()
+        drained_files = []
+        for index, path in enumerate(self._stale_drain_files() + [spool_file]):
+            # renaming makes concurrently running processes append to a new file and prevents replaying the same
+            # records twice, the modification time of the drained file tells the other processes it is not stale
+            drained_file = "{}.{}.{}.drain".format(spool_file, os.getpid(), index)
+            try:
+                os.replace(path, drained_file)
+                os.utime(drained_file)
+            except Exception:
+                continue
+            drained_files.append(drained_file)
+        self._full = False
+        batch = []
+        try:
+            for drained_file in drained_files:
+                with open(drained_file, 'rb') as file:
+                    for line in file:
+                        try:
+                            batch.append(json.loads(line))
+                        except Exception:
+                            self.damaged += 1
+                            continue
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+            if batch:
+                yield batch
+        finally:
+            for drained_file in drained_files:
+                try:
+                    os.remove(drained_file)
+                except Exception:
+                    pass  # nosec
+
+    def _drain_files(self):
+        """
+        Returns the paths of the files taken over by the drains of this and other processes.
+        """
+        directory, name = os.path.split(self.spool_file())
+        try:
+            return [os.path.join(directory, file_name) for file_name in os.listdir(directory)
+                    if file_name.startswith(name + '.') and file_name.endswith('.drain')]
+        except Exception:
+            return []
+
+    def _stale_drain_files(self):
+        stale_files = []
+        now = time.time()
+        for path in self._drain_files():
+            try:
+                if now - os.path.getmtime(path) > self.stale_drain_age:
+                    stale_files.append(path)
+            except Exception:
+                pass  # nosec
+        return stale_files
+
+    def remove_spool_file(self):
+        """
+        Removes the spool file and the files taken over by the drains.
+        :return: None
+        """
+        spool_file = self.spool_file()
+        if os.path.exists(spool_file) and os.access(spool_file, os.W_OK):
+            os.remove(spool_file)
+            self._full = False
+        # the records taken over by the drains are removed too
+        for drained_file in self._drain_files():
+            try:
+                os.remove(drained_file)
+            except Exception:
+                pass  # nosec
+
+
+# the spools existing in the process, their pending records are written at exit and dropped in the child process
+# after fork
+_event_spools = weakref.WeakSet()
+
+
+def _flush_event_spools():
+    for spool in list(_event_spools):
+        spool.flush()
+
+
+def _reset_event_spools_after_fork():
+    for spool in list(_event_spools):
+        spool._reset_after_fork()
+
+
+atexit.register(_flush_event_spools)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_event_spools_after_fork)
@@ -0,0 +1,127 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from .opt_in_checker import OptInChecker
+from .spool import EventSpool
+
+
+class EventSpoolTest(unittest.TestCase):
+    test_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'test_spool')
+    test_subdir = 'test_spool_subdir'
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory(prefix=self.test_directory)
+        os.mkdir(os.path.join(self.temp_dir.name, self.test_subdir))
+        self.patchers = [patch.object(OptInChecker, 'consent_file_base_dir', return_value=self.temp_dir.name),
+                         patch.object(OptInChecker, 'consent_file_subdirectory', return_value=self.test_subdir)]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_append_and_drain(self):
+        """
+        Checks that records are read in batches in the order they were appended and the spool is empty afterwards.
+        """
+        spool = EventSpool()
+        records = [{"ts": float(i), "backend": "ga4", "data": {"value": i}} for i in range(25)]
+        self.assertTrue(spool.append(records[:10]))
+        self.assertTrue(spool.append(records[10:]))
+
+        batches = list(spool.drain(batch_size=10))
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(sum(batches, []), records)
+        self.assertFalse(os.path.exists(spool.spool_file()))
+        self.assertEqual(list(spool.drain()), [])
+
+    def test_size_cap(self):
+        """
+        Checks that records exceeding the maximum size of the spool are dropped.
+        """
+        spool = EventSpool(max_size=120)
+        self.assertTrue(spool.append([{"data": "a" * 40}]))
+        self.assertFalse(spool.append([{"data": "b" * 40}, {"data": "c" * 40}]))
+        self.assertTrue(os.path.getsize(spool.spool_file()) <= 120)
+        self.assertEqual(sum(spool.drain(), []), [{"data": "a" * 40}, {"data": "b" * 40}])
+
+    def test_damaged_record_is_skipped(self):
+        """
+        Checks that the line partially written before a crash does not prevent reading of other records.
+        """
+        spool = EventSpool()
+        spool.append([{"data": 1}])
+        with open(spool.spool_file(), 'ab') as file:
+            file.write(b'{"data": 2, "ba')
+        spool.append([{"data": 3}])
+        self.assertEqual(sum(spool.drain(), []), [{"data": 1}, {"data": 3}])
+
+    def test_append_later(self):
+        """
+        Checks that the records collected in memory are written by the background thread and by flush.
+        """
+        spool = EventSpool(max_pending=3)
+        self.assertTrue(spool.append_later([{"data": 1}, {"data": 2}]))
+        self.assertTrue(spool.flush())
+        self.assertEqual(sum(spool.drain(), []), [{"data": 1}, {"data": 2}])
+
+        with patch('os.open', side_effect=OSError()) as open_mock:
+            # the records exceeding max_pending are dropped without waiting for the file
+            self.assertFalse(spool.append_later([{"data": i} for i in range(5)]))
+            spool.flush()
+        self.assertEqual(open_mock.call_count, 1)
+
+        spool.append_later([{"data": 3}])
+        start_time = time.time()
+        while not os.path.exists(spool.spool_file()) and time.time() - start_time < 5:
+            time.sleep(0.01)
+        spool.flush()
+        self.assertEqual(sum(spool.drain(), []), [{"data": 3}])
+
+    def test_full_spool_is_not_opened(self):
+        """
+        Checks that the file is not opened anymore once the spool is full, until the spool is drained.
+        """
+        spool = EventSpool(max_size=60)
+        self.assertFalse(spool.append([{"data": "a" * 40}, {"data": "b" * 40}]))
+        with patch('os.open', wraps=os.open) as open_mock:
+            self.assertFalse(spool.append([{"data": "c"}]))
+            self.assertFalse(spool.append_later([{"data": "d"}]))
+            spool.flush()
+        self.assertEqual(open_mock.call_count, 0)
+
+        self.assertEqual(sum(spool.drain(), []), [{"data": "a" * 40}])
+        self.assertTrue(spool.append([{"data": "c"}]))
+
+    def test_stale_drain_files(self):
+        """
+        Checks that the files left by the interrupted drains are drained again, the files of the drains in progress
+        are not, and all of them are removed with the spool file.
+        """
+        spool = EventSpool()
+        spool.append([{"data": 1}])
+        stale_file = spool.spool_file() + ".1.0.drain"
+        with open(stale_file, 'w') as file:
+            file.write('{"data": 2}\n{"data"\n')
+        old_time = time.time() - spool.stale_drain_age - 10
+        os.utime(stale_file, (old_time, old_time))
+        active_file = spool.spool_file() + ".2.0.drain"
+        with open(active_file, 'w') as file:
+            file.write('{"data": 3}\n')
+
+        self.assertEqual(sorted(record["data"] for record in sum(spool.drain(), [])), [1, 2])
+        self.assertEqual(spool.damaged, 1)
+        self.assertFalse(os.path.exists(stale_file))
+        self.assertTrue(os.path.exists(active_file))
+
+        spool.append([{"data": 4}])
+        spool.remove_spool_file()
+        self.assertEqual(os.listdir(os.path.dirname(spool.spool_file())), [])
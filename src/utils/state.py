@@ -0,0 +1,222 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+
+from .cid import get_cid_path
+from .file_lock import FileLock
+from .opt_in_checker import OptInChecker, ConsentCheckResult, file_signature, read_consent_file
+
+
+class TelemetryState:
+    """
+    Stores the opt-in status, the client IDs of the backends and the usage statistics in a single versioned file,
+    which is read once during the initialization of the telemetry and written once atomically.
+
+    The consent file stays the source of the opt-in status, because it is changed by opt_in_out and by other versions
+    of the library. The state file keeps the signature of the consent file it was created with and the opt-in status
+    is read from the consent file again only if the signature is changed. The client IDs and the statistics are
+    migrated from the legacy files the first time they are requested. They are also migrated again when the
+    signature is changed, because opt_in_out of other versions removes and regenerates the legacy files without
+    knowing about the state file.
+
+    The usage count is incremented additively: the file is read again under the lock when the state is saved and the
+    increment is added to the usage count written by other processes in the meantime.
+
+    state = TelemetryState()
+    state.load()
+    cid = state.get_cid("openvino_ga_cid")
+    state.add_usage_count(1)
+    state.save()
+    """
+    state_filename = "openvino_telemetry_state"
+    version = 1
+
+    def __init__(self):
+        self.opt_in_checker = OptInChecker()
+        self.consent = None
+        self.cids = {}
+        self.stats = None
+        self._consent_signature = None
+        self._state_file = None
+        # True if the state file existed when the state was loaded
+        self._state_file_existed = False
+        self._modified = False
+        self._usage_increment = 0
+
+    def state_file(self):
+        """
+        Returns the state file path.
+        """
+        return os.path.join(get_cid_path(), self.state_filename)
+
+    def load(self):
+        """
+        Reads the state file. The opt-in status is read from the consent file if the state file is absent, corrupted,
+        has another version or the consent file is changed since the state file was written.
+        :return: False if the location of the state file is unknown, otherwise True
+        """
+        base_dir = self.opt_in_checker.consent_file_base_dir()
+        subdirectory = self.opt_in_checker.consent_file_subdirectory()
+        if base_dir is None or subdirectory is None:
+            return False
+        self._state_file = os.path.join(base_dir, subdirectory, self.state_filename)
+        self._state_file_existed = os.path.exists(self._state_file)
+        consent_file = self.opt_in_checker.consent_file(base_dir, subdirectory)
+        consent_signature = file_signature(consent_file)
+        consent_signature = list(consent_signature) if consent_signature is not None else None
+
+        data = self._read()
+        if data is not None and data["consent_signature"] == consent_signature:
+            self.cids = data["cids"]
+            self.stats = data["stats"]
+            self.consent = ConsentCheckResult[data["consent"]]
+            self._consent_signature = consent_signature
+            return True
+        # the client IDs and the statistics stored with the other consent may be reset by opt-out
+        self.cids = {}
+        self.stats = None
+        self.consent = read_consent_file(consent_file) if consent_signature is not None \
+            else ConsentCheckResult.NO_FILE
+        self._consent_signature = consent_signature
+        self._modified = True
+        return True
+
+    def _read(self):
+        """
+        Reads and validates the content of the state file.
+        :return: the content of the state file or None if the file is absent or invalid
+        """
+        try:
+            with open(self._state_file, 'r') as file:
+                data = json.load(file)
+            if not isinstance(data, dict) or data.get("version") != self.version:
+                return None
+            if data["consent"] not in ConsentCheckResult.__members__ or not isinstance(data["cids"], dict):
+                return None
+            if data["stats"] is not None and not isinstance(data["stats"], dict):
+                return None
+        except Exception:
+            return None
+        return data
+
+    def get_cid(self, file_name: str):
+        """
+        Returns the client ID stored with the name of the legacy client ID file.
+        """
+        return self.cids.get(file_name)
+
+    def set_cid(self, file_name: str, cid: str):
+        if self.cids.get(file_name) != cid:
+            self.cids[file_name] = cid
+            self._modified = True
+
+    def get_stats(self):
+        """
+        Returns the usage statistics, the statistics are migrated from the legacy statistics file if the state has
+        no statistics yet.
+        :return: the tuple, where the first element is True if the statistics exist, otherwise False and the second
+        element is the dictionary with statistics.
+        """
+        if self.stats is None:
+            from .stats_processor import StatsProcessor
+            file_exists, data = StatsProcessor().get_stats()
+            if not file_exists or not isinstance(data, dict):
+                return False, {}
+            self.stats = data
+            self._modified = True
+        return True, dict(self.stats)
+
+    def set_stats(self, stats: dict):
+        """
+        Replaces the statistics, the statistics written by other processes are overwritten.
+        """
+        if self.stats != stats:
+            self.stats = dict(stats)
+            self._usage_increment = 0
+            self._modified = True
+
+    def add_usage_count(self, value: int):
+        """
+        Adds the value to the usage count. The value is added to the usage count stored in the file when the state
+        is saved, so the increments made by concurrent processes are not lost.
+        """
+        if value == 0:
+            return
+        self.get_stats()
+        self.stats = dict(self.stats or {})
+        self.stats["usage_count"] = self.stats.get("usage_count", 0) + value
+        self._usage_increment += value
+        self._modified = True
+
+    def save(self):
+        """
+        Writes the state file atomically if the state is changed. The state file removed after the state was loaded,
+        for example, by opt-out, is not created again.
+        :return: True if the state is saved successfully or not changed, otherwise False
+        """
+        if not self._modified:
+            return True
+        if self._state_file is None:
+            return False
+        state_dir = os.path.dirname(self._state_file)
+        if not os.path.isdir(state_dir):
+            try:
+                # the base directory is not created, the same as for the consent file
+                os.mkdir(state_dir)
+            except OSError:
+                return False
+        with FileLock(self._state_file + ".lock") as locked:
+            if not locked:
+                return False
+            if self._state_file_existed and not os.path.exists(self._state_file):
+                return False
+            self._merge(self._read())
+            data = {
+                "version": self.version,
+                "consent": self.consent.name,
+                "consent_signature": self._consent_signature,
+                "cids": self.cids,
+                "stats": self.stats,
+            }
+            tmp_file = "{}.{}.tmp".format(self._state_file, os.getpid())
+            try:
+                with open(tmp_file, 'w') as file:
+                    json.dump(data, file)
+                os.replace(tmp_file, self._state_file)
+            except Exception:
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass  # nosec
+                return False
+        self._modified = False
+        self._usage_increment = 0
+        self._state_file_existed = True
+        return True
+
+    def _merge(self, data: dict):
+        """
+        Merges the state written by other processes since the state was loaded. Should be called under the lock.
+        The state written with the other signature of the consent file is replaced.
+        """
+        if data is None or data["consent_signature"] != self._consent_signature:
+            return
+        self.cids = {**data["cids"], **self.cids}
+        if self._usage_increment and data["stats"] is not None:
+            stats = dict(data["stats"])
+            usage_count = stats.get("usage_count", 0)
+            if isinstance(usage_count, int) and usage_count >= 0:
+                stats["usage_count"] = usage_count + self._usage_increment
+                self.stats = stats
+
+    def remove_state_file(self):
+        """
+        Removes the state file and its lock file.
+        :return: None
+        """
+        state_file = self.state_file()
+        for file_name in (state_file, state_file + ".lock"):
+            if os.path.exists(file_name) and os.access(file_name, os.W_OK):
+                os.remove(file_name)
@@ -0,0 +1,208 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import multiprocessing
+import os
+import unittest
+import uuid
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from .cid import get_or_generate_cid
+from .opt_in_checker import OptInChecker, ConsentCheckResult
+from .state import TelemetryState
+
+
+def increment_usage_count(base_dir: str, subdir: str, count: int):
+    """
+    Increments the usage count the same way as Telemetry.init(increment_stats=True) does and checks that the state
+    file is always readable.
+    :return: the number of failed updates and reads
+    """
+    failures = 0
+    with patch.object(OptInChecker, 'consent_file_base_dir', return_value=base_dir):
+        with patch.object(OptInChecker, 'consent_file_subdirectory', return_value=subdir):
+            for _ in range(count):
+                state = TelemetryState()
+                state.load()
+                state.add_usage_count(1)
+                reader = TelemetryState()
+                reader.load()
+                if not state.save() or reader._read() is None:
+                    failures += 1
+    return failures
+
+
+class TelemetryStateTest(unittest.TestCase):
+    test_directory = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'test_state')
+    test_subdir = 'test_state_subdir'
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory(prefix=self.test_directory)
+        self.subdir = os.path.join(self.temp_dir.name, self.test_subdir)
+        os.mkdir(self.subdir)
+        self.patchers = [patch.object(OptInChecker, 'consent_file_base_dir', return_value=self.temp_dir.name),
+                         patch.object(OptInChecker, 'consent_file_subdirectory', return_value=self.test_subdir)]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def write_file(self, name: str, content: str):
+        with open(os.path.join(self.subdir, name), 'w') as file:
+            file.write(content)
+
+    def test_migration_from_legacy_files(self):
+        """
+        Checks that the opt-in status, the client ID and the statistics are taken from the legacy files.
+        """
+        cid = str(uuid.uuid4())
+        self.write_file("openvino_telemetry", "1")
+        self.write_file("openvino_ga_cid", cid)
+        self.write_file("stats", json.dumps({"usage_count": 5}, indent=4))
+
+        state = TelemetryState()
+        self.assertTrue(state.load())
+        self.assertEqual(state.consent, ConsentCheckResult.ACCEPTED)
+        self.assertEqual(get_or_generate_cid("openvino_ga_cid", lambda: str(uuid.uuid4()), None, state=state), cid)
+        self.assertEqual(state.get_stats(), (True, {"usage_count": 5}))
+        state.set_stats({"usage_count": 6})
+        self.assertTrue(state.save())
+        self.assertEqual(sorted(os.listdir(self.subdir)),
+                         ["openvino_ga_cid", "openvino_telemetry", "openvino_telemetry_state",
+                          "openvino_telemetry_state.lock", "stats"])
+
+        # the legacy files are not read anymore
+        state = TelemetryState()
+        with patch('builtins.open', wraps=open) as open_mock:
+            self.assertTrue(state.load())
+            self.assertEqual(state.get_cid("openvino_ga_cid"), cid)
+            self.assertEqual(state.get_stats(), (True, {"usage_count": 6}))
+        self.assertEqual(open_mock.call_count, 1)
+        self.assertEqual(state.consent, ConsentCheckResult.ACCEPTED)
+        self.assertTrue(state.save())
+
+    def test_concurrent_usage_count_increments(self):
+        """
+        Checks that the usage count increments of the states loaded at the same time are added up.
+        """
+        self.write_file("openvino_telemetry", "1")
+        self.write_file("stats", json.dumps({"usage_count": 10}))
+        states = [TelemetryState() for _ in range(3)]
+        for state in states:
+            state.load()
+            state.add_usage_count(1)
+            self.assertEqual(state.get_stats(), (True, {"usage_count": 11}))
+        states[0].set_cid("openvino_ga_cid", "cid")
+        for state in states:
+            self.assertTrue(state.save())
+
+        state = TelemetryState()
+        state.load()
+        self.assertEqual(state.get_stats(), (True, {"usage_count": 13}))
+        self.assertEqual(state.get_cid("openvino_ga_cid"), "cid")
+
+    def test_concurrent_processes(self):
+        """
+        Checks that the usage count increments of many processes are not lost and the readers never see a partially
+        written state file.
+        """
+        processes, updates = 16, 25
+        self.write_file("openvino_telemetry", "1")
+        self.write_file("stats", json.dumps({"usage_count": 10}))
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes) as pool:
+            failures = pool.starmap(increment_usage_count, [(self.temp_dir.name, self.test_subdir, updates)] * processes)
+        self.assertEqual(failures, [0] * processes)
+        state = TelemetryState()
+        state.load()
+        self.assertEqual(state.get_stats(), (True, {"usage_count": 10 + processes * updates}))
+
+    def test_consent_file_change(self):
+        """
+        Checks that the opt-in status is read again when the consent file is changed.
+        """
+        self.write_file("openvino_telemetry", "1")
+        state = TelemetryState()
+        state.load()
+        state.save()
+
+        self.write_file("openvino_telemetry", "00")
+        state = TelemetryState()
+        state.load()
+        self.assertEqual(state.consent, ConsentCheckResult.DECLINED)
+
+        os.remove(os.path.join(self.subdir, "openvino_telemetry"))
+        state = TelemetryState()
+        state.load()
+        self.assertEqual(state.consent, ConsentCheckResult.NO_FILE)
+
+    def test_legacy_opt_out_resets_cid(self):
+        """
+        Checks that the client ID and the statistics are migrated again after opt-out and opt-in made by the version
+        of the library which does not know about the state file.
+        """
+        consent_file = os.path.join(self.subdir, "openvino_telemetry")
+        old_cid, new_cid = str(uuid.uuid4()), str(uuid.uuid4())
+        self.write_file("openvino_telemetry", "1")
+        self.write_file("openvino_ga_cid", old_cid)
+        self.write_file("stats", json.dumps({"usage_count": 5}))
+        state = TelemetryState()
+        state.load()
+        self.assertEqual(get_or_generate_cid("openvino_ga_cid", lambda: str(uuid.uuid4()), None, state=state), old_cid)
+        state.add_usage_count(1)
+        self.assertTrue(state.save())
+
+        # legacy opt-out and opt-in
+        self.write_file("openvino_telemetry", "0")
+        os.remove(os.path.join(self.subdir, "openvino_ga_cid"))
+        os.remove(os.path.join(self.subdir, "stats"))
+        self.write_file("openvino_telemetry", "1")
+        self.write_file("openvino_ga_cid", new_cid)
+        stat = os.stat(consent_file)
+        os.utime(consent_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        state = TelemetryState()
+        state.load()
+        self.assertEqual(state.consent, ConsentCheckResult.ACCEPTED)
+        self.assertEqual(get_or_generate_cid("openvino_ga_cid", lambda: str(uuid.uuid4()), None, state=state), new_cid)
+        self.assertEqual(state.get_stats(), (False, {}))
+        self.assertTrue(state.save())
+        with open(os.path.join(self.subdir, "openvino_telemetry_state")) as file:
+            self.assertEqual(json.load(file)["cids"], {"openvino_ga_cid": new_cid})
+
+    def test_removed_state_file_is_not_created(self):
+        """
+        Checks that the state file removed after the state was loaded is not created again with the old state.
+        """
+        self.write_file("openvino_telemetry", "1")
+        state = TelemetryState()
+        state.load()
+        self.assertTrue(state.save())
+
+        state = TelemetryState()
+        state.load()
+        state.set_cid("openvino_ga_cid", "cid")
+        state.add_usage_count(1)
+        os.remove(state.state_file())
+        self.assertFalse(state.save())
+        self.assertFalse(os.path.exists(state.state_file()))
+
+    def test_invalid_state_file(self):
+        """
+        Checks that the state is migrated again if the state file is corrupted or has another version.
+        """
+        self.write_file("openvino_telemetry", "0")
+        for content in ["{ abc", json.dumps({"version": 1000, "consent": "ACCEPTED", "cids": {}, "stats": None,
+                                             "consent_signature": None})]:
+            self.write_file("openvino_telemetry_state", content)
+            state = TelemetryState()
+            self.assertTrue(state.load())
+            self.assertEqual(state.consent, ConsentCheckResult.DECLINED)
+            self.assertTrue(state.save())
+            with open(os.path.join(self.subdir, "openvino_telemetry_state")) as file:
+                self.assertEqual(json.load(file)["version"], TelemetryState.version)
@@ -85,11 +85,10 @@ class StatsProcessor:
 
     def remove_stats_file(self):
         """
-        Removes statistics file.
+        Removes statistics file and the lock file left by the versions which locked it.
         :return: None
         """
         stats_file = self.stats_file()
-        if os.path.exists(stats_file):
-            if not os.access(stats_file, os.W_OK):
-                return
-            os.remove(stats_file)
+        for file_name in (stats_file, stats_file + ".lock"):
+            if os.path.exists(file_name) and os.access(file_name, os.W_OK):
+                os.remove(file_name)
@@ -0,0 +1,134 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import functools
+import os
+import threading
+import weakref
+from time import monotonic
+
+from .histogram import Histogram
+
+
+def format_summary(summary: dict):
+    """
+    Formats the summary of the durations in seconds returned by Histogram.summary() as the event label with the
+    durations in milliseconds, for example "count=3,min_ms=1.2,p50_ms=1.5,p90_ms=2,p99_ms=2,max_ms=2.1".
+    """
+    items = ["count={}".format(summary["count"])]
+    for key in ("min", "p50", "p90", "p99", "max"):
+        items.append("{}_ms={:.4g}".format(key, summary[key] * 1000))
+    return ",".join(items)
+
+
+class DurationAggregator:
+    """
+    Collects the durations with the same category and name into the histograms in memory and emits one summary per
+    key when the flush window expires, when the number of keys reaches max_keys or when flush() is called. The
+    memory of every histogram is bounded by the number of its buckets.
+
+    :param emit: the function called as emit(category, name, summary) for every key, where summary is the dictionary
+    returned by Histogram.summary() with the durations in seconds.
+    :param window: the flush window in seconds.
+    :param max_keys: the maximum number of keys aggregated at once.
+    """
+    def __init__(self, emit: callable, window: float = 60.0, max_keys: int = 1000):
+        self.emit = emit
+        self.window = window
+        self.max_keys = max_keys
+        self._histograms = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        _duration_aggregators.add(self)
+
+    def _reset_after_fork(self):
+        """
+        Makes the aggregator usable in the child process. The collected durations are dropped, because they are
+        emitted by the parent process, and the timer thread is not copied by fork.
+        """
+        self._histograms = {}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, category: str, name: str, duration: float):
+        """
+        Adds the duration in seconds to the histogram of the key.
+        :return: None
+        """
+        key = (category, name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.record(duration)
+            if len(self._histograms) < self.max_keys:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """
+        Emits the summaries of the collected durations and starts a new flush window.
+        :return: the number of emitted summaries
+        """
+        with self._lock:
+            histograms = self._histograms
+            self._histograms = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for (category, name), histogram in histograms.items():
+            self.emit(category, name, histogram.summary())
+        return len(histograms)
+
+
+class Timer:
+    """
+    Measures the duration of the code block or of the function calls with the monotonic clock and passes it to
+    record(category, name, duration). The timer is used as the context manager or as the decorator, the exceptions
+    are not suppressed and the duration is recorded anyway.
+
+    :param record: the function called with the category, the name and the duration in seconds.
+    :param category: the category of the measured operation.
+    :param name: the name of the measured operation.
+    """
+    def __init__(self, record: callable, category: str, name: str):
+        self.record = record
+        self.category = category
+        self.name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.record(self.category, self.name, monotonic() - self._start)
+        return False
+
+    def __call__(self, func: callable):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # the start is kept locally, so the decorated function may be called from several threads
+            start = monotonic()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(self.category, self.name, monotonic() - start)
+        return wrapper
+
+
+# the duration aggregators existing in the process, they are reset in the child process after fork
+_duration_aggregators = weakref.WeakSet()
+
+
+def _reset_duration_aggregators_after_fork():
+    for aggregator in list(_duration_aggregators):
+        aggregator._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_duration_aggregators_after_fork)
@@ -0,0 +1,97 @@
+# Copyright (C) 2018-2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import unittest
+
+from .timer import DurationAggregator, Timer, format_summary
+
+
+class DurationAggregatorTest(unittest.TestCase):
+    def setUp(self):
+        self.summaries = []
+
+    def emit(self, *args):
+        self.summaries.append(args)
+
+    def test_summaries_per_window(self):
+        """
+        Checks that the durations with the same key are emitted as one summary on flush.
+        """
+        aggregator = DurationAggregator(self.emit, window=100)
+        for i in range(1, 101):
+            aggregator.add("model", "compile", i / 1000)
+        aggregator.add("model", "infer", 0.5)
+        self.assertEqual(self.summaries, [])
+        self.assertEqual(aggregator.flush(), 2)
+
+        summaries = {(category, name): summary for category, name, summary in self.summaries}
+        compile_summary = summaries[("model", "compile")]
+        self.assertEqual(compile_summary["count"], 100)
+        self.assertEqual((compile_summary["min"], compile_summary["max"]), (0.001, 0.1))
+        self.assertAlmostEqual(compile_summary["p50"], 0.05, delta=0.05 / 8)
+        self.assertAlmostEqual(compile_summary["p99"], 0.099, delta=0.099 / 8)
+        self.assertEqual(summaries[("model", "infer")]["count"], 1)
+        self.assertEqual(aggregator.flush(), 0)
+
+    def test_window_expiration(self):
+        """
+        Checks that the summaries are emitted when the flush window expires.
+        """
+        aggregator = DurationAggregator(self.emit, window=0.1)
+        aggregator.add("model", "compile", 0.2)
+        start_time = time.time()
+        while not self.summaries and time.time() - start_time < 5:
+            time.sleep(0.01)
+        self.assertEqual(len(self.summaries), 1)
+        self.assertEqual(self.summaries[0][2]["max"], 0.2)
+
+    def test_max_keys(self):
+        """
+        Checks that the summaries are emitted when the number of keys reaches the limit.
+        """
+        aggregator = DurationAggregator(self.emit, window=100, max_keys=10)
+        for i in range(25):
+            aggregator.add("model", str(i), 0.1)
+        self.assertEqual(len(self.summaries), 20)
+        aggregator.flush()
+        self.assertEqual(len(self.summaries), 25)
+
+    def test_format_summary(self):
+        summary = {"count": 3, "min": 0.0012, "p50": 0.0015, "p90": 0.002, "p99": 0.002, "max": 0.0021}
+        self.assertEqual(format_summary(summary), "count=3,min_ms=1.2,p50_ms=1.5,p90_ms=2,p99_ms=2,max_ms=2.1")
+
+
+class TimerTest(unittest.TestCase):
+    def setUp(self):
+        self.durations = []
+
+    def record(self, *args):
+        self.durations.append(args)
+
+    def test_context_manager(self):
+        """
+        Checks that the duration of the block is recorded even if the block raises the exception.
+        """
+        with Timer(self.record, "model", "compile"):
+            time.sleep(0.05)
+        with self.assertRaises(ValueError):
+            with Timer(self.record, "model", "infer"):
+                raise ValueError()
+        self.assertEqual([(category, name) for category, name, _ in self.durations],
+                         [("model", "compile"), ("model", "infer")])
+        self.assertGreaterEqual(self.durations[0][2], 0.05)
+
+    def test_decorator(self):
+        """
+        Checks that the duration of every call of the decorated function is recorded.
+        """
+        @Timer(self.record, "model", "convert")
+        def convert(value):
+            return value * 2
+
+        self.assertEqual(convert(2), 4)
+        self.assertEqual(convert(3), 6)
+        self.assertEqual(convert.__name__, "convert")
+        self.assertEqual(len(self.durations), 2)
+        self.assertTrue(all(duration >= 0 for _, _, duration in self.durations))